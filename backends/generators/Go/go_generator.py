@@ -4,25 +4,15 @@ import logging
 import os
 import sys
 
-# Add parent directory to path to find generator.py
+# Add parent directory to path to find generator.py and emitter.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from generator import load_csrs, load_instructions, parse_match, signed
+from emitter import Emitter
+from generator import calculate_mask, load_csrs, load_instructions, parse_match, signed
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:: %(message)s")
 
 
-def make_go(instr_dict, csrs, output_file="inst.go"):
-    """
-    Generate a Go source file with the instruction encodings followed by
-    a map of CSR names and addresses.
-    """
-    args = " ".join(sys.argv)
-    prelude = f"// Code generated by {args}; DO NOT EDIT.\n"
-    prelude += """package riscv
-
-import "cmd/internal/obj"
-
-type inst struct {
+GO_INST_TYPE = """type inst struct {
 	opcode uint32
 	funct3 uint32
 	rs1    uint32
@@ -30,49 +20,354 @@ type inst struct {
 	csr    int64
 	funct7 uint32
 }
+"""
+
+# Constants of the 64-bit mixing function shared by build_decode_hash and the generated Go decodeHash
+HASH_MUL1 = 0xBF58476D1CE4E5B9
+HASH_MUL2 = 0x94D049BB133111EB
+HASH_MASK = (1 << 64) - 1
+
+
+def go_instr_case(name):
+    """Return the obj.As constant for an instruction. For example, "bclri" becomes "ABCLRI"."""
+    return f"A{name.upper().replace('.', '')}"
+
+
+def inst_fields(match_str):
+    """Split the fixed bits of an encoding into the Go inst struct fields."""
+    enc_match = parse_match(match_str)
+    opcode = (enc_match >> 0) & ((1 << 7) - 1)
+    funct3 = (enc_match >> 12) & ((1 << 3) - 1)
+    rs1 = (enc_match >> 15) & ((1 << 5) - 1)
+    rs2 = (enc_match >> 20) & ((1 << 5) - 1)
+    csr_val = (enc_match >> 20) & ((1 << 12) - 1)
+    funct7 = (enc_match >> 25) & ((1 << 7) - 1)
+    return f"{hex(opcode)}, {hex(funct3)}, {hex(rs1)}, {hex(rs2)}, {signed(csr_val, 12)}, {hex(funct7)}"
+
+
+def decode_hash(key, seed):
+    """64-bit mixing hash (splitmix64 finalizer); must match decodeHash in the generated Go."""
+    key = (key ^ seed) & HASH_MASK
+    key = ((key ^ (key >> 30)) * HASH_MUL1) & HASH_MASK
+    key = ((key ^ (key >> 27)) * HASH_MUL2) & HASH_MASK
+    return key ^ (key >> 31)
+
+
+def build_decode_hash(keys):
+    """
+    Build a hash-and-displace perfect hash over a list of distinct 64-bit keys.
+
+    Returns (displacements, slots) where displacements has one seed per bucket and
+    slots maps each table position to the index of its key in `keys` (or None).
+    A key k lives at slot decode_hash(k, displacements[decode_hash(k, 0) % len(displacements)]) % len(slots).
+    """
+    num_slots = max(1, len(keys) + len(keys) // 4)
+    num_buckets = max(1, (len(keys) + 3) // 4)
+
+    buckets = [[] for _ in range(num_buckets)]
+    for idx, key in enumerate(keys):
+        buckets[decode_hash(key, 0) % num_buckets].append(idx)
+
+    displacements = [0] * num_buckets
+    slots = [None] * num_slots
+    # Place the largest buckets first while the table is still mostly empty
+    for b in sorted(range(num_buckets), key=lambda b: len(buckets[b]), reverse=True):
+        members = buckets[b]
+        if not members:
+            continue
+        for seed in range(1, 1 << 16):
+            positions = {decode_hash(keys[idx], seed) % num_slots for idx in members}
+            if len(positions) == len(members) and all(slots[pos] is None for pos in positions):
+                break
+        else:
+            raise ValueError(f"Could not find a displacement for decode hash bucket {b}")
+        displacements[b] = seed
+        for idx in members:
+            slots[decode_hash(keys[idx], seed) % num_slots] = idx
+
+    return displacements, slots
+
 
+def decode_entries(instr_dict):
+    """
+    Return (mask, match, name) for every instruction, one entry per distinct mask/match pair.
+
+    When two instructions share the same fixed bits, the first one in sorted order is kept.
+    """
+    entries = {}
+    for name, info in sorted(instr_dict.items(), key=lambda x: x[0].upper()):
+        match_str = info["match"]
+        key = (calculate_mask(match_str), parse_match(match_str))
+        if key in entries:
+            logging.debug(
+                f"{name} has the same encoding as {entries[key]}; not added to decode table"
+            )
+            continue
+        entries[key] = name
+    return [(mask, match, name) for (mask, match), name in entries.items()]
+
+
+def write_switch_encode(out, instr_dict):
+    """Write encode() as a switch with one case per instruction."""
+    out.write(
+        """
 func encode(a obj.As) *inst {
 	switch a {
 """
+    )
 
-    instr_str = ""
     # Process instructions in sorted order (by name)
     for name, info in sorted(instr_dict.items(), key=lambda x: x[0].upper()):
-        match_str = info["match"]
-        enc_match = parse_match(match_str)
-        opcode = (enc_match >> 0) & ((1 << 7) - 1)
-        funct3 = (enc_match >> 12) & ((1 << 3) - 1)
-        rs1 = (enc_match >> 15) & ((1 << 5) - 1)
-        rs2 = (enc_match >> 20) & ((1 << 5) - 1)
-        csr_val = (enc_match >> 20) & ((1 << 12) - 1)
-        funct7 = (enc_match >> 25) & ((1 << 7) - 1)
-        # Create the instruction case name. For example, "bclri" becomes "ABCLRI"
-        instr_case = f"A{name.upper().replace('.', '')}"
-        instr_str += f"""  case {instr_case}:
-    return &inst{{ {hex(opcode)}, {hex(funct3)}, {hex(rs1)}, {hex(rs2)}, {signed(csr_val, 12)}, {hex(funct7)} }}
+        out.write(
+            f"""  case {go_instr_case(name)}:
+    return &inst{{ {inst_fields(info["match"])} }}
 """
-    instructions_end = """  }
+        )
+    out.write(
+        """  }
 	return nil
 }
 """
+    )
+
+
+def write_table_encode(out, instr_dict):
+    """Write encode() backed by a static array indexed by obj.As offset, plus a perfect-hash decode()."""
+    out.write(
+        """
+type encoding struct {
+	inst
+	valid bool
+}
+
+// encodings is indexed by the offset of an obj.As from obj.ABaseRISCV.
+var encodings = [...]encoding{
+"""
+    )
+    for name, info in sorted(instr_dict.items(), key=lambda x: x[0].upper()):
+        out.write(
+            f"\t{go_instr_case(name)} - obj.ABaseRISCV: {{inst{{{inst_fields(info['match'])}}}, true}},\n"
+        )
+    out.write(
+        """}
+
+func encode(a obj.As) *inst {
+	i := int(a - obj.ABaseRISCV)
+	if i < 0 || i >= len(encodings) || !encodings[i].valid {
+		return nil
+	}
+	return &encodings[i].inst
+}
+"""
+    )
+
+    entries = decode_entries(instr_dict)
+    keys = [(mask << 32) | match for mask, match, _ in entries]
+    displacements, slots = build_decode_hash(keys)
+
+    # Try the most specific masks first so that hints and special cases win over general forms
+    masks = sorted({mask for mask, _, _ in entries}, key=lambda m: (-m.bit_count(), m))
+
+    out.write(
+        """
+type decodeEntry struct {
+	mask  uint32
+	match uint32
+	as    obj.As
+}
+
+// decodeMasks lists every distinct instruction mask, most specific first.
+var decodeMasks = [...]uint32{
+"""
+    )
+    out.write_lines(f"\t{hex(mask)}," for mask in masks)
+    out.write("}\n\n// decodeDisp holds the perfect hash displacement for each bucket.\n")
+    out.write("var decodeDisp = [...]uint16{\n")
+    for i in range(0, len(displacements), 16):
+        out.write("\t" + " ".join(f"{d}," for d in displacements[i : i + 16]) + "\n")
+    out.write("}\n\n// decodeTable is indexed by the perfect hash of (mask << 32 | match).\n")
+    out.write("var decodeTable = [...]decodeEntry{\n")
+    for idx in slots:
+        if idx is None:
+            out.write("\t{},\n")
+        else:
+            mask, match, name = entries[idx]
+            out.write(f"\t{{{hex(mask)}, {hex(match)}, {go_instr_case(name)}}},\n")
+    out.write(
+        f"""}}
+
+func decodeHash(key, seed uint64) uint64 {{
+	key ^= seed
+	key = (key ^ (key >> 30)) * {hex(HASH_MUL1)}
+	key = (key ^ (key >> 27)) * {hex(HASH_MUL2)}
+	return key ^ (key >> 31)
+}}
+
+// decode returns the instruction whose fixed bits match word.
+func decode(word uint32) (obj.As, bool) {{
+	for _, mask := range decodeMasks {{
+		match := word & mask
+		key := uint64(mask)<<32 | uint64(match)
+		disp := decodeDisp[decodeHash(key, 0)%uint64(len(decodeDisp))]
+		e := &decodeTable[decodeHash(key, uint64(disp))%uint64(len(decodeTable))]
+		if e.mask == mask && e.match == match {{
+			return e.as, true
+		}}
+	}}
+	return obj.AXXX, false
+}}
+"""
+    )
+
+
+def make_go(instr_dict, csrs, output_file="inst.go", style="switch"):
+    """
+    Generate a Go source file with the instruction encodings followed by
+    a map of CSR names and addresses.
+
+    style "switch" emits encode() as a switch statement; style "table" emits
+    static encoding arrays and a perfect-hash decode() instead.
+    """
+    args = " ".join(sys.argv)
+    with Emitter(output_file) as out:
+        out.write(f"// Code generated by {args}; DO NOT EDIT.\n")
+        out.write('package riscv\n\nimport "cmd/internal/obj"\n\n')
+        out.write(GO_INST_TYPE)
 
-    # Build the CSR map block - now matching the second script's format
-    csrs_map_str = "var csrs = map[uint16]string {\n"
-    # Convert the dictionary to a list of tuples and sort by address
-    csr_items = [(int(addr), name.upper()) for addr, name in csrs.items()]
-    for addr, name in sorted(csr_items, key=lambda x: x[0]):
-        csrs_map_str += f'{hex(addr)} : "{name}",\n'
-    csrs_map_str += "}\n"
+        if style == "table":
+            write_table_encode(out, instr_dict)
+        else:
+            write_switch_encode(out, instr_dict)
 
-    go_code = prelude + instr_str + instructions_end + "\n" + csrs_map_str
+        # Build the CSR map block
+        out.write("\nvar csrs = map[uint16]string {\n")
+        # Convert the dictionary to a list of tuples and sort by address
+        csr_items = [(int(addr), name.upper()) for addr, name in csrs.items()]
+        for addr, name in sorted(csr_items, key=lambda x: x[0]):
+            out.write(f'{hex(addr)} : "{name}",\n')
+        out.write("}\n")
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(go_code)
     logging.info(
         f"Generated {output_file} with {len(instr_dict)} instructions and {len(csrs)} CSRs"
     )
 
 
+def make_go_bench(instr_dict, output_file, style="switch"):
+    """
+    Generate a Go benchmark file for the code written by make_go.
+
+    Run `go test -bench .` against the switch and table outputs to compare
+    encode() latency; the table style also benchmarks decode() against a linear
+    scan in the same priority order, and tests that both decode alike.
+    """
+    args = " ".join(sys.argv)
+    names = sorted(instr_dict.keys(), key=lambda x: x.upper())
+    with Emitter(output_file) as out:
+        out.write(f"// Code generated by {args}; DO NOT EDIT.\n")
+        imports = '\t"math/rand"\n\t"sort"\n\t"testing"' if style == "table" else '\t"testing"'
+        out.write(
+            f"""package riscv
+
+import (
+{imports}
+
+	"cmd/internal/obj"
+)
+
+var benchAs = [...]obj.As{{
+"""
+        )
+        out.write_lines(f"\t{go_instr_case(name)}," for name in names)
+        out.write(
+            """}
+
+func BenchmarkEncode(b *testing.B) {
+	for i := 0; i < b.N; i++ {
+		for _, a := range benchAs {
+			if encode(a) == nil {
+				b.Fatalf("no encoding for %d", a)
+			}
+		}
+	}
+}
+"""
+        )
+        if style != "table":
+            return
+
+        out.write("\nvar benchWords = [...]uint32{\n")
+        out.write_lines(f"\t{hex(parse_match(instr_dict[name]['match']))}," for name in names)
+        out.write(
+            """}
+
+func BenchmarkDecode(b *testing.B) {
+	for i := 0; i < b.N; i++ {
+		for _, w := range benchWords {
+			if _, ok := decode(w); !ok {
+				b.Fatalf("no instruction decodes %#x", w)
+			}
+		}
+	}
+}
+
+// decodeLinearEntries holds the entries of decodeTable in decodeMasks order,
+// the order in which decode tries them, so overlapping encodings resolve alike.
+var decodeLinearEntries = func() []decodeEntry {
+	rank := make(map[uint32]int, len(decodeMasks))
+	for i, mask := range decodeMasks {
+		rank[mask] = i
+	}
+	var entries []decodeEntry
+	for _, e := range decodeTable {
+		if e.mask != 0 {
+			entries = append(entries, e)
+		}
+	}
+	sort.SliceStable(entries, func(i, j int) bool {
+		return rank[entries[i].mask] < rank[entries[j].mask]
+	})
+	return entries
+}()
+
+func decodeLinear(word uint32) (obj.As, bool) {
+	for i := range decodeLinearEntries {
+		e := &decodeLinearEntries[i]
+		if word&e.mask == e.match {
+			return e.as, true
+		}
+	}
+	return obj.AXXX, false
+}
+
+func TestDecodeMatchesLinear(t *testing.T) {
+	rng := rand.New(rand.NewSource(1))
+	words := append([]uint32(nil), benchWords[:]...)
+	for _, e := range decodeLinearEntries {
+		// The fixed bits of each entry with random variable bits, and a random word
+		words = append(words, e.match|rng.Uint32()&^e.mask, rng.Uint32())
+	}
+	for _, w := range words {
+		as, ok := decode(w)
+		linearAs, linearOK := decodeLinear(w)
+		if as != linearAs || ok != linearOK {
+			t.Fatalf("%#x: decode gives (%d, %v), decodeLinear (%d, %v)", w, as, ok, linearAs, linearOK)
+		}
+	}
+}
+
+func BenchmarkDecodeLinear(b *testing.B) {
+	for i := 0; i < b.N; i++ {
+		for _, w := range benchWords {
+			if _, ok := decodeLinear(w); !ok {
+				b.Fatalf("no instruction decodes %#x", w)
+			}
+		}
+	}
+}
+"""
+        )
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Generate Go code for RISC-V instructions and CSRs filtered by extensions"
@@ -99,6 +394,18 @@ def parse_args():
         choices=["RV32", "RV64", "BOTH"],
         help="Target architecture (RV32, RV64, or BOTH). Default is RV64.",
     )
+    parser.add_argument(
+        "--style",
+        default="switch",
+        choices=["switch", "table"],
+        help="switch: encode() is a switch statement (default). "
+        "table: static encoding arrays indexed by obj.As plus a perfect-hash decode().",
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Also write a <output>_bench_test.go benchmark file next to the output",
+    )
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     parser.add_argument(
         "--include-all",
@@ -153,7 +460,9 @@ def main():
         logging.info(f"Loaded {len(csrs)} CSRs")
 
     # Generate the Go code
-    make_go(instr_dict, csrs, args.output)
+    make_go(instr_dict, csrs, args.output, args.style)
+    if args.bench:
+        make_go_bench(instr_dict, f"{os.path.splitext(args.output)[0]}_bench_test.go", args.style)
 
 
 if __name__ == "__main__":
@@ -9,25 +9,24 @@ import logging
 import os
 import sys
 
-# Add parent directory to path to import generator.py
+# Add parent directory to path to import generator.py and emitter.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import functions from generator.py
+# Import shared generator helpers
+from emitter import Emitter
 from generator import (
+    calculate_mask,
     load_csrs,
     load_exception_codes,
     load_instructions,
+    load_interrupt_codes,
     parse_match,
 )
+from insn_fields import InsnField, c_field_accessors, compile_field
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:: %(message)s")
 
 
-def calculate_mask(match_str):
-    """Convert the bit pattern string to a mask (1 for fixed bits, 0 for variable bits)."""
-    return int("".join("0" if c == "-" else "1" for c in match_str), 2)
-
-
 def extract_instruction_fields(instructions):
     """Extract field names and their positions from instruction definitions."""
     field_dict = {}
@@ -84,17 +83,18 @@ def extract_instruction_fields(instructions):
 
     # First add all common fields
     for name, (high, low) in common_fields.items():
-        mask = ((1 << (high - low + 1)) - 1) << low
+        field = InsnField(name, ((high, low),))
         field_dict[name] = {
-            "location": f"{high}-{low}",
-            "mask": f"0x{mask:x}",
+            "location": field.location,
+            "mask": f"0x{field.mask:x}",
             "source": "common",
+            "field": field,
         }
 
-    # Then process fields from actual instructions
-    for _name, instr_data in instructions.items():
+    # Then process fields from actual instructions, in name order so the output is stable
+    for _name, instr_data in sorted(instructions.items()):
         # Get variables from the instruction structure
-        variables = []
+        variables = instr_data.get("variables") or []
         if "encoding" in instr_data:
             encoding = instr_data["encoding"]
 
@@ -118,57 +118,119 @@ def extract_instruction_fields(instructions):
             orig_field_name = var.get("name")
             location = var.get("location")
 
-            if not orig_field_name or not location:
+            if not orig_field_name or location is None:
                 continue
 
             # Map to standard field name if possible
             std_field_name = field_name_map.get(orig_field_name, orig_field_name)
 
-            # Skip if we already have this field from common definitions
-            if (
-                std_field_name in field_dict
-                and field_dict[std_field_name].get("source") == "common"
-            ):
+            try:
+                field = compile_field(std_field_name, location)
+            except ValueError:
+                logging.warning(f"Invalid location format: {location} for field {orig_field_name}")
                 continue
 
-            # Process location format
-            if isinstance(location, str) and "-" in location:
-                try:
-                    high, low = map(int, location.split("-"))
-                    mask = ((1 << (high - low + 1)) - 1) << low
-                    field_dict[std_field_name] = {
-                        "location": f"{high}-{low}",
-                        "mask": f"0x{mask:x}",
-                        "source": "instruction",
-                        "original_name": (
-                            orig_field_name if orig_field_name != std_field_name else None
-                        ),
-                    }
-                except ValueError:
-                    logging.warning(
-                        f"Invalid location format: {location} for field {orig_field_name}"
-                    )
-            elif isinstance(location, (int, str)):
-                try:
-                    pos = int(location)
-                    mask = 1 << pos
-                    field_dict[std_field_name] = {
-                        "location": str(pos),
-                        "mask": f"0x{mask:x}",
-                        "source": "instruction",
-                        "original_name": (
-                            orig_field_name if orig_field_name != std_field_name else None
-                        ),
-                    }
-                except ValueError:
-                    logging.warning(
-                        f"Invalid location format: {location} for field {orig_field_name}"
-                    )
+            # The same name at another location (e.g. compressed register fields, the
+            # many immediate layouts) gets the location appended to keep both
+            existing = field_dict.get(std_field_name)
+            if existing is not None:
+                if existing["field"].segments == field.segments:
+                    continue
+                std_field_name = (
+                    f"{std_field_name}_{field.location.replace('|', '_').replace('-', '_')}"
+                )
+                if std_field_name in field_dict:
+                    continue
+                field = InsnField(std_field_name, field.segments)
+
+            field_dict[std_field_name] = {
+                "location": field.location,
+                "mask": f"0x{field.mask:x}",
+                "source": "instruction",
+                "original_name": (orig_field_name if orig_field_name != std_field_name else None),
+                "field": field,
+            }
 
     logging.info(f"Extracted {len(field_dict)} unique instruction field names")
     return field_dict
 
 
+def write_encoding_header(out, instr_dict, csrs, causes, field_dict, interrupts=()):
+    """Write the encoding.h sections to an Emitter."""
+    out.write(
+        """/* SPDX-License-Identifier: BSD-3-Clause-Clear */
+/* Copyright (c) 2023 RISC-V International */
+/*
+ * This file is auto-generated by riscv-unified-db
+ */
+
+#ifndef RISCV_ENCODING_H
+#define RISCV_ENCODING_H
+"""
+    )
+
+    for i in sorted(instr_dict.keys()):
+        macro_name = i.upper().replace(".", "_")
+        out.write(f"#define MATCH_{macro_name} {instr_dict[i]['match']}\n")
+        out.write(f"#define MASK_{macro_name} {instr_dict[i]['mask']}\n")
+    out.write("\n")
+
+    sorted_csrs = sorted(csrs.items())
+    for addr, name in sorted_csrs:
+        out.write(f"#define CSR_{name.upper().replace('.', '_')} 0x{addr:x}\n")
+    out.write("\n")
+
+    for num, name in causes:
+        out.write(f"#define CAUSE_{name.upper()} 0x{num:x}\n")
+    out.write("\n")
+
+    for num, name in interrupts:
+        out.write(f"#define IRQ_{name.upper()} 0x{num:x}\n")
+    if interrupts:
+        out.write("\n")
+
+    for field_name, details in sorted(field_dict.items()):
+        sanitized_name = field_name.replace(" ", "_").replace("=", "_eq_")
+        comment = f"{details['location']}"
+        if details.get("original_name"):
+            comment += f" (from {details['original_name']})"
+        out.write(
+            f"#define INSN_FIELD_{sanitized_name.upper()} {details['mask']}  /* {comment} */\n"
+        )
+
+    # Extract/insert helpers; the field value is the concatenation of its segments, MSB first
+    out.write("\n#ifndef __ASSEMBLER__\n#include <stdint.h>\n")
+    for field_name, details in sorted(field_dict.items()):
+        sanitized_name = field_name.replace(" ", "_").replace("=", "_eq_")
+        out.write(c_field_accessors(details["field"], sanitized_name.lower()))
+    out.write("#endif /* __ASSEMBLER__ */\n")
+    out.write("#endif\n")
+
+    out.write("#ifdef DECLARE_INSN\n")
+    for i in sorted(instr_dict.keys()):
+        macro_name = i.upper().replace(".", "_")
+        out.write(f"DECLARE_INSN({i.replace('.', '_')}, MATCH_{macro_name}, MASK_{macro_name})\n")
+    out.write("#endif\n")
+
+    out.write("#ifdef DECLARE_CSR\n")
+    for _addr, name in sorted_csrs:
+        out.write(
+            f"DECLARE_CSR({name.lower().replace('.', '_')}, CSR_{name.upper().replace('.', '_')})\n"
+        )
+    out.write("#endif\n")
+
+    out.write("#ifdef DECLARE_CAUSE\n")
+    for _num, name in causes:
+        out.write(f'DECLARE_CAUSE("{name}", CAUSE_{name.upper()})\n')
+    out.write("#endif\n")
+
+    if interrupts:
+        out.write("#ifdef DECLARE_IRQ\n")
+        for _num, name in interrupts:
+            out.write(f'DECLARE_IRQ("{name}", IRQ_{name.upper()})\n')
+        out.write("#endif\n")
+
+
 def main():
     """Main function to generate encoding.h."""
     parser = argparse.ArgumentParser(description="Generate RISC-V C encoding header")
@@ -214,7 +276,8 @@ def main():
     )
     parser.add_argument(
         "--resolved-codes",
-        help="JSON file containing pre-resolved exception codes",
+        help="JSON file containing pre-resolved exception codes "
+        "(default: load them from the exception_code/ directory next to --ext-dir)",
     )
 
     args = parser.parse_args()
@@ -245,6 +308,9 @@ def main():
         resolved_codes_file=args.resolved_codes,
     )
 
+    # Load interrupt codes from the interrupt_code/ directory next to --ext-dir
+    interrupts = load_interrupt_codes(args.ext_dir, args.extensions, include_all=args.include_all)
+
     # Process instructions and calculate masks
     instr_dict = {}
     for name, instr_data in instructions.items():
@@ -268,65 +334,9 @@ def main():
     # Extract field information
     field_dict = extract_instruction_fields(instructions)
 
-    # Generate output strings
-    mask_match_str = ""
-    for i in sorted(instr_dict.keys()):
-        mask_match_str += f"#define MATCH_{i.upper().replace('.', '_')} {instr_dict[i]['match']}\n"
-        mask_match_str += f"#define MASK_{i.upper().replace('.', '_')} {instr_dict[i]['mask']}\n"
-
-    declare_insn_str = ""
-    for i in sorted(instr_dict.keys()):
-        declare_insn_str += f"DECLARE_INSN({i.replace('.', '_')}, MATCH_{i.upper().replace('.', '_')}, MASK_{i.upper().replace('.', '_')})\n"
-
-    csr_names_str = ""
-    declare_csr_str = ""
-    for addr, name in sorted(csrs.items()):
-        csr_names_str += f"#define CSR_{name.upper().replace('.', '_')} 0x{addr:x}\n"
-        declare_csr_str += (
-            f"DECLARE_CSR({name.lower().replace('.', '_')}, CSR_{name.upper().replace('.', '_')})\n"
-        )
-
-    causes_str = ""
-    declare_cause_str = ""
-    for num, name in causes:
-        sanitized_name = name.upper()
-        causes_str += f"#define CAUSE_{sanitized_name} 0x{num:x}\n"
-        declare_cause_str += f'DECLARE_CAUSE("{name}", CAUSE_{sanitized_name})\n'
-
-    field_str = ""
-    for field_name, details in sorted(field_dict.items()):
-        sanitized_name = field_name.replace(" ", "_").replace("=", "_eq_")
-        comment = f"{details['location']}"
-        if details.get("original_name"):
-            comment += f" (from {details['original_name']})"
-        field_str += (
-            f"#define INSN_FIELD_{sanitized_name.upper()} {details['mask']}  /* {comment} */\n"
-        )
-
-    # Assemble final output
-    output_str = f"""/* SPDX-License-Identifier: BSD-3-Clause-Clear */
-/* Copyright (c) 2023 RISC-V International */
-/*
- * This file is auto-generated by riscv-unified-db
- */
-
-#ifndef RISCV_ENCODING_H
-#define RISCV_ENCODING_H
-{mask_match_str}
-{csr_names_str}
-{causes_str}
-{field_str}#endif
-#ifdef DECLARE_INSN
-{declare_insn_str}#endif
-#ifdef DECLARE_CSR
-{declare_csr_str}#endif
-#ifdef DECLARE_CAUSE
-{declare_cause_str}#endif
-"""
-
-    # Write output file
-    with open(output_file, "w", encoding="utf-8") as enc_file:
-        enc_file.write(output_str)
+    # Stream the header to disk section by section
+    with Emitter(output_file) as out:
+        write_encoding_header(out, instr_dict, csrs, causes, field_dict, interrupts)
 
     logging.info(f"Generated encoding header file: {output_file}")
 
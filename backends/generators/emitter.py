@@ -0,0 +1,107 @@
+"""
+Streaming output writer shared by the C, Go and SystemVerilog generators.
+
+Generated text is written section by section to a buffered temporary file in
+the destination directory. When the emitter is closed the temporary file is
+renamed over the destination, unless the destination already holds identical
+content, in which case it is left untouched so that make/ninja do not see a
+new timestamp and rebuild everything that includes it.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+# Size of the write buffer and of the chunks used when hashing an existing file
+BUFFER_SIZE = 1 << 16
+
+
+def file_digest(path):
+    """Return the SHA-256 digest of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(BUFFER_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.digest()
+
+
+class Emitter:
+    """
+    Context manager that streams generated text to output_file.
+
+    Usage:
+        with Emitter("encoding.out.h") as out:
+            out.write("...")
+            out.write_lines(f"#define X_{n} {v}" for n, v in items)
+
+    After the block exits, `changed` tells whether the destination was rewritten.
+    If the block raises, the temporary file is discarded and the destination is
+    not modified.
+    """
+
+    def __init__(self, output_file, encoding="utf-8"):
+        self.output_file = os.path.abspath(output_file)
+        self.encoding = encoding
+        self.changed = False
+        self._digest = hashlib.sha256()
+        self._size = 0
+        self._fh = None
+        self._tmp_path = None
+
+    def __enter__(self):
+        out_dir = os.path.dirname(self.output_file)
+        os.makedirs(out_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.output_file)}.", suffix=".tmp", dir=out_dir
+        )
+        self._fh = os.fdopen(fd, "wb", buffering=BUFFER_SIZE)
+        return self
+
+    def write(self, text):
+        """Append a chunk of text to the output."""
+        data = text.encode(self.encoding)
+        self._digest.update(data)
+        self._size += len(data)
+        self._fh.write(data)
+
+    def write_lines(self, lines):
+        """Append each string from an iterable, terminated by a newline."""
+        for line in lines:
+            self.write(line)
+            self.write("\n")
+
+    def __exit__(self, exc_type, exc, tb):
+        self._fh.close()
+        if exc_type is not None:
+            os.unlink(self._tmp_path)
+            return False
+
+        if self._unchanged():
+            os.unlink(self._tmp_path)
+            logging.info(f"{self.output_file} is up to date")
+            return False
+
+        # mkstemp creates the file with mode 0600; keep the permissions a plain open() would give
+        try:
+            mode = os.stat(self.output_file).st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(self._tmp_path, mode)
+        os.replace(self._tmp_path, self.output_file)
+        self.changed = True
+        return False
+
+    def _unchanged(self):
+        """True if output_file already exists with exactly the content just written."""
+        try:
+            if os.path.getsize(self.output_file) != self._size:
+                return False
+        except OSError:
+            return False
+        return file_digest(self.output_file) == self._digest.digest()
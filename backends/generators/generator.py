@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
+import functools
 import json
 import logging
 import os
 import pprint
+import re
 
 import yaml
+from insn_fields import compile_location
 
 pp = pprint.PrettyPrinter(indent=2)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:: %(message)s")
@@ -59,12 +62,8 @@ def build_match_from_format(format_field):
             if isinstance(var_data, dict) and "location" in var_data:
                 if isinstance(var_data["location"], str):
                     try:
-                        location = var_data["location"]
-                        if "-" in location:
-                            high = int(location.split("-")[0])
-                        else:
-                            high = int(location)
-                        valid_locations.append(high)
+                        segments = compile_location(var_data["location"])
+                        valid_locations.append(max(high for high, _ in segments))
                     except (ValueError, IndexError):
                         raise ValueError(f"Invalid location format: {var_data['location']}")
                 elif isinstance(var_data["location"], int):
@@ -309,11 +308,18 @@ def load_instructions(root_dir, enabled_extensions, include_all=False, target_ar
                         rv32_match = rv32_encoding.get("match")
 
                         if rv64_match:
-                            instr_dict[name] = {"match": rv64_match}  # RV64 gets the default name
+                            # RV64 gets the default name
+                            instr_dict[name] = {
+                                "match": rv64_match,
+                                "variables": rv64_encoding.get("variables", []),
+                            }
 
                         if rv32_match and rv32_match != rv64_match:
                             # Process RV32 encoding with a _rv32 suffix
-                            instr_dict[f"{name}_rv32"] = {"match": rv32_match}
+                            instr_dict[f"{name}_rv32"] = {
+                                "match": rv32_match,
+                                "variables": rv32_encoding.get("variables", []),
+                            }
 
                         continue  # Skip the rest of the loop as we've already added the encodings
                 elif "RV64" in encoding:
@@ -356,7 +362,10 @@ def load_instructions(root_dir, enabled_extensions, include_all=False, target_ar
                 encoding_filtered += 1
                 continue
 
-            instr_dict[instr_key] = {"match": match_str}
+            instr_dict[instr_key] = {
+                "match": match_str,
+                "variables": encoding_to_use.get("variables", []),
+            }
 
     if found_instructions > 0:
         logging.info(f"Found {found_instructions} instruction definitions in {found_files} files")
@@ -483,18 +492,121 @@ def load_csrs(csr_root, enabled_extensions, include_all=False, target_arch="RV64
     return csrs
 
 
+# ERB template tags that may appear in code names; the generators render names without ERB
+ERB_TAG = re.compile(r"<%.*?%>", re.S)
+
+
+def render_code_name(name):
+    """
+    Render an exception/interrupt code name for use in generated identifiers.
+
+    ERB tags are dropped rather than evaluated, and the result is sanitized the
+    same way as names coming from a pre-resolved codes file.
+    """
+    if "<%" in name:
+        name = ERB_TAG.sub("", name)
+    name = " ".join(name.split())
+    return name.lower().replace(" ", "_").replace("/", "_").replace("-", "_")
+
+
+def condition_extensions(condition):
+    """Collect every extension name mentioned anywhere in a definedBy condition."""
+    names = set()
+    if isinstance(condition, str):
+        names.add(condition)
+    elif isinstance(condition, list):
+        for item in condition:
+            names |= condition_extensions(item)
+    elif isinstance(condition, dict):
+        if isinstance(condition.get("name"), str):
+            names.add(condition["name"])
+        for key, value in condition.items():
+            if key not in ("name", "version"):
+                names |= condition_extensions(value)
+    return names
+
+
+def code_dir_for(ext_dir, kind):
+    """Return the exception_code/interrupt_code directory that sits next to an ext/ directory."""
+    return os.path.join(os.path.dirname(os.path.normpath(ext_dir)), kind)
+
+
+@functools.cache
+def scan_codes(code_dir, kind):
+    """
+    Load every code of the given kind ("exception_code" or "interrupt_code") under code_dir.
+
+    Returns a tuple of (num, rendered name, extensions mentioned in definedBy).
+    Results are cached per directory, so loading both the C header and the
+    SystemVerilog package in one process parses each file once.
+    """
+    codes = []
+    for dirpath, _, filenames in os.walk(code_dir):
+        for fname in sorted(filenames):
+            if not fname.endswith(".yaml"):
+                continue
+            path = os.path.join(dirpath, fname)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = yaml.safe_load(f)
+            except Exception as e:
+                logging.error(f"Error parsing {path}: {e}")
+                continue
+
+            if not isinstance(data, dict) or data.get("kind") != kind:
+                continue
+            num = data.get("num")
+            name = data.get("name")
+            if not isinstance(num, int) or not isinstance(name, str):
+                logging.error(f"Missing 'num' or 'name' field in {path}")
+                continue
+            codes.append(
+                (
+                    num,
+                    render_code_name(name),
+                    frozenset(condition_extensions(data.get("definedBy"))),
+                )
+            )
+    return tuple(codes)
+
+
+def unique_codes(codes):
+    """Sort (num, name) pairs by code number, keeping the first name for each number."""
+    seen_nums = set()
+    unique = []
+    for num, name in sorted(codes, key=lambda x: x[0]):
+        if num not in seen_nums:
+            seen_nums.add(num)
+            unique.append((num, name))
+    return unique
+
+
+def load_codes(code_dir, kind, enabled_extensions=None, include_all=False):
+    """Load (num, name) pairs for exception or interrupt codes directly from YAML."""
+    if not os.path.isdir(code_dir):
+        logging.warning(f"No {kind} directory found at {code_dir}")
+        return []
+
+    enabled = set(enabled_extensions or [])
+    codes = [
+        (num, name)
+        for num, name, exts in scan_codes(os.path.abspath(code_dir), kind)
+        if include_all or not enabled or not exts.isdisjoint(enabled)
+    ]
+    logging.info(f"Loaded {len(codes)} {kind.replace('_', ' ')}s from {code_dir}")
+    return unique_codes(codes)
+
+
 def load_exception_codes(
     ext_dir, enabled_extensions=None, include_all=False, resolved_codes_file=None
 ):
-    """Load exception codes from extension YAML files or pre-resolved JSON file."""
-    exception_codes = []
-    found_extensions = 0
-    found_files = 0
-
-    if enabled_extensions is None:
-        enabled_extensions = []
+    """
+    Load exception codes from a pre-resolved JSON file, or directly from the
+    exception_code/ YAML directory next to ext_dir when no file is given.
+    """
     # If we have a resolved codes file, use it instead of processing YAML files
     if resolved_codes_file and os.path.exists(resolved_codes_file):
+        exception_codes = []
         try:
             with open(resolved_codes_file, encoding="utf-8") as f:
                 resolved_codes = json.load(f)
@@ -503,47 +615,28 @@ def load_exception_codes(
                 num = code.get("num")
                 name = code.get("name")
                 if num is not None and name is not None:
-                    sanitized_name = (
-                        name.lower().replace(" ", "_").replace("/", "_").replace("-", "_")
-                    )
-                    exception_codes.append((num, sanitized_name))
+                    exception_codes.append((num, render_code_name(name)))
 
             logging.info(
                 f"Loaded {len(exception_codes)} pre-resolved exception codes from {resolved_codes_file}"
             )
-
-            # Sort by exception code number and deduplicate
-            seen_nums = set()
-            unique_codes = []
-            for num, name in sorted(exception_codes, key=lambda x: x[0]):
-                if num not in seen_nums:
-                    seen_nums.add(num)
-                    unique_codes.append((num, name))
-
-            return unique_codes
+            return unique_codes(exception_codes)
 
         except Exception as e:
             logging.error(f"Error loading resolved codes file {resolved_codes_file}: {e}")
-    # Logging an error and skipping the exception cause generation if no resolved codes file found
-    else:
-        logging.error(f"Resolved codes file not found: {resolved_codes_file}")
-        return
+    elif resolved_codes_file:
+        logging.warning(f"Resolved codes file not found: {resolved_codes_file}")
 
-    if found_extensions > 0:
-        logging.info(f"Found {found_extensions} extension definitions in {found_files} files")
-        logging.info(f"Added {len(exception_codes)} exception codes to the output")
-    else:
-        logging.warning(f"No extension definitions found in {ext_dir}")
+    return load_codes(
+        code_dir_for(ext_dir, "exception_code"), "exception_code", enabled_extensions, include_all
+    )
 
-    # Sort by exception code number and deduplicate
-    seen_nums = set()
-    unique_codes = []
-    for num, name in sorted(exception_codes, key=lambda x: x[0]):
-        if num not in seen_nums:
-            seen_nums.add(num)
-            unique_codes.append((num, name))
 
-    return unique_codes
+def load_interrupt_codes(ext_dir, enabled_extensions=None, include_all=False):
+    """Load interrupt codes from the interrupt_code/ YAML directory next to ext_dir."""
+    return load_codes(
+        code_dir_for(ext_dir, "interrupt_code"), "interrupt_code", enabled_extensions, include_all
+    )
 
 
 def parse_match(match_str):
@@ -555,6 +648,11 @@ def parse_match(match_str):
     return int(binary_str, 2)
 
 
+def calculate_mask(match_str):
+    """Convert the bit pattern string to a mask (1 for fixed bits, 0 for variable bits)."""
+    return int("".join("0" if c == "-" else "1" for c in match_str), 2)
+
+
 # Returns signed interpretation of a value within a given width.
 def signed(value: int, width: int) -> int:
     return value if 0 <= value < (1 << (width - 1)) else value - (1 << width)
@@ -0,0 +1,166 @@
+"""
+Instruction field location compiler.
+
+Variable locations in the instruction YAML are strings such as "11-7" or
+"12|6-2": a list of bit ranges, most significant first, that are concatenated
+to form the field value. compile_location parses each location once into
+(high, low) segments, from which the scatter/gather masks, C accessor
+functions and vectorized NumPy extraction are all derived.
+"""
+
+import functools
+from dataclasses import dataclass
+
+
+@functools.cache
+def compile_location(location):
+    """
+    Parse a location ("12|6-2", "11-7", "26" or 26) into a tuple of (high, low)
+    segments, most significant segment first.
+
+    Raises ValueError for malformed locations.
+    """
+    if isinstance(location, int):
+        return ((location, location),)
+    if not isinstance(location, str) or not location.strip():
+        raise ValueError(f"Invalid location format: {location!r}")
+
+    segments = []
+    for part in location.split("|"):
+        part = part.strip()
+        high_str, dash, low_str = part.partition("-")
+        try:
+            high = int(high_str)
+            low = int(low_str) if dash else high
+        except ValueError:
+            raise ValueError(f"Invalid location format: {location!r}") from None
+        if high < low or low < 0:
+            raise ValueError(f"Invalid bit range {part!r} in location {location!r}")
+        segments.append((high, low))
+    return tuple(segments)
+
+
+def format_location(segments):
+    """Render segments back into canonical location syntax, e.g. ((12, 12), (6, 2)) -> "12|6-2"."""
+    return "|".join(str(high) if high == low else f"{high}-{low}" for high, low in segments)
+
+
+@dataclass(frozen=True)
+class InsnField:
+    """A compiled instruction field."""
+
+    name: str
+    segments: tuple[tuple[int, int], ...]
+
+    @property
+    def width(self):
+        return sum(high - low + 1 for high, low in self.segments)
+
+    @property
+    def mask(self):
+        """Mask of the instruction bits the field occupies (the gather mask)."""
+        mask = 0
+        for high, low in self.segments:
+            mask |= ((1 << (high - low + 1)) - 1) << low
+        return mask
+
+    @property
+    def location(self):
+        return format_location(self.segments)
+
+    def shifts(self):
+        """
+        Yield (low, width, value_shift) per segment: bits [low + width - 1:low] of the
+        instruction hold bits [value_shift + width - 1:value_shift] of the field value.
+        """
+        value_shift = self.width
+        for high, low in self.segments:
+            seg_width = high - low + 1
+            value_shift -= seg_width
+            yield low, seg_width, value_shift
+
+    def extract(self, insn):
+        """Gather the field value out of an instruction word."""
+        value = 0
+        for low, seg_width, value_shift in self.shifts():
+            value |= ((insn >> low) & ((1 << seg_width) - 1)) << value_shift
+        return value
+
+    def insert(self, insn, value):
+        """Scatter value into the field bits of an instruction word."""
+        insn &= ~self.mask
+        for low, seg_width, value_shift in self.shifts():
+            insn |= ((value >> value_shift) & ((1 << seg_width) - 1)) << low
+        return insn
+
+
+def compile_field(name, location):
+    """Compile one variable into an InsnField."""
+    return InsnField(name, compile_location(location))
+
+
+def c_field_accessors(field, c_name):
+    """Return C source for static inline extract/insert functions of a field."""
+    gather = []
+    scatter = []
+    for low, seg_width, value_shift in field.shifts():
+        seg_mask = (1 << seg_width) - 1
+        part = f"((insn >> {low}) & 0x{seg_mask:x})" if low else f"(insn & 0x{seg_mask:x})"
+        gather.append(f"{part} << {value_shift}" if value_shift else part)
+        val = f"(val >> {value_shift})" if value_shift else "val"
+        scatter.append(
+            f"(({val} & 0x{seg_mask:x}) << {low})" if low else f"({val} & 0x{seg_mask:x})"
+        )
+    return (
+        f"static inline uint32_t insn_extract_{c_name}(uint32_t insn) {{\n"
+        f"  return {' | '.join(gather)};\n"
+        f"}}\n"
+        f"static inline uint32_t insn_insert_{c_name}(uint32_t insn, uint32_t val) {{\n"
+        f"  return (insn & ~0x{field.mask:x}u) | {' | '.join(scatter)};\n"
+        f"}}\n"
+    )
+
+
+class FieldTable:
+    """
+    Segment table for extracting many fields from many instruction words at once.
+
+    Segment parameters are laid out as (fields x max segments) arrays so that
+    extract_all computes every field of every word with a few broadcast
+    NumPy operations. NumPy is only needed for extract_all.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.names = [f.name for f in self.fields]
+        max_segments = max((len(f.segments) for f in self.fields), default=0)
+        # Unused segment slots have a zero mask and contribute nothing
+        self.lows = [[0] * max_segments for _ in self.fields]
+        self.seg_masks = [[0] * max_segments for _ in self.fields]
+        self.value_shifts = [[0] * max_segments for _ in self.fields]
+        for i, f in enumerate(self.fields):
+            for j, (low, seg_width, value_shift) in enumerate(f.shifts()):
+                self.lows[i][j] = low
+                self.seg_masks[i][j] = (1 << seg_width) - 1
+                self.value_shifts[i][j] = value_shift
+
+    def extract_all(self, words):
+        """
+        Extract every field from an array of instruction words.
+
+        Returns a uint32 array of shape (len(words), len(fields)); column i
+        holds the values of self.names[i].
+        """
+        import numpy as np
+
+        w = np.asarray(words, dtype=np.uint32)[:, None, None]
+        lows = np.asarray(self.lows, dtype=np.uint32)[None]
+        seg_masks = np.asarray(self.seg_masks, dtype=np.uint32)[None]
+        value_shifts = np.asarray(self.value_shifts, dtype=np.uint32)[None]
+        # Segments of a field never overlap in the value, so OR-reducing equals summing
+        return np.bitwise_or.reduce(((w >> lows) & seg_masks) << value_shifts, axis=2)
+
+    def extract_dict(self, words):
+        """Like extract_all, but returns {field name: array of values}."""
+        values = self.extract_all(words)
+        return {name: values[:, i] for i, name in enumerate(self.names)}
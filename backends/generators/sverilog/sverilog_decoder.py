@@ -0,0 +1,380 @@
+"""
+SystemVerilog instruction decoder generation.
+
+Builds a synthesizable decode module from the same match/mask data used for the
+riscv_decode_package localparams, either as one flat `casez` or as a multi-level
+decode tree that switches on the bits shared by every remaining candidate.
+
+The module also carries a Python reference model: `reference_decode` is the
+priority scan that the RTL must implement. `check_decoder` parses the rendered
+module text back (ID localparams and the nested `case`/`casez` statements),
+evaluates it on random instruction words and compares it with the reference.
+"""
+
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+
+INSN_WIDTH = 32
+
+
+@dataclass(frozen=True)
+class DecodePattern:
+    """Fixed bits of one instruction, zero-extended to INSN_WIDTH bits."""
+
+    name: str
+    mask: int
+    match: int
+
+    def matches(self, word):
+        return (word & self.mask) == self.match
+
+
+@dataclass
+class DecodeNode:
+    """
+    One level of the decode tree.
+
+    Inner nodes switch on `bits` (MSB first) and route to `children` keyed by
+    the value of those bits. Leaves (no bits) hold the remaining `patterns`
+    in priority order.
+    """
+
+    bits: list[int] = field(default_factory=list)
+    children: dict[int, "DecodeNode"] = field(default_factory=dict)
+    patterns: list[DecodePattern] = field(default_factory=list)
+
+
+def decode_patterns(instructions):
+    """
+    Convert {name: {"match": str}} into DecodePatterns in priority order.
+
+    More specific encodings (more fixed bits) come first, so that hints and
+    special cases are decoded before the general forms they overlap with.
+    """
+    patterns = []
+    for name, encoding in instructions.items():
+        match_str = encoding.get("match") if isinstance(encoding, dict) else None
+        if not match_str:
+            logging.error(f"No match field for instruction {name}.")
+            continue
+        if len(match_str) > INSN_WIDTH:
+            logging.warning(f"Skipping {name}: {len(match_str)}-bit encodings are not decoded")
+            continue
+        mask = int("".join("0" if c == "-" else "1" for c in match_str), 2)
+        match = int("".join("0" if c == "-" else c for c in match_str), 2)
+        patterns.append(DecodePattern(name, mask, match))
+    patterns.sort(key=lambda p: (-p.mask.bit_count(), p.name))
+    return patterns
+
+
+def has_overlaps(patterns):
+    """True if any instruction word is matched by more than one pattern."""
+    for i, a in enumerate(patterns):
+        for b in patterns[i + 1 :]:
+            if ((a.match ^ b.match) & a.mask & b.mask) == 0:
+                logging.debug(f"{a.name} overlaps {b.name}")
+                return True
+    return False
+
+
+def _extract(word, bits):
+    value = 0
+    for b in bits:
+        value = (value << 1) | ((word >> b) & 1)
+    return value
+
+
+def build_decode_tree(patterns, max_bits=8, leaf_size=4):
+    """
+    Build a decode tree over patterns (already in priority order).
+
+    At each node the bits fixed in every remaining pattern are candidates to
+    switch on; up to max_bits of them (lowest first, so the major opcode is
+    decided at the root) are used to partition the patterns. Each pattern lands
+    in exactly one child and children keep the parent's order, so the tree
+    decodes every word to the same instruction as the flat priority scan.
+    """
+
+    def build(subset, decided):
+        common = ~decided & ((1 << INSN_WIDTH) - 1)
+        for p in subset:
+            common &= p.mask
+        if len(subset) <= leaf_size or common == 0:
+            return DecodeNode(patterns=subset)
+
+        low_bits = [b for b in range(INSN_WIDTH) if (common >> b) & 1][:max_bits]
+        bits = sorted(low_bits, reverse=True)
+        groups = {}
+        for p in subset:
+            groups.setdefault(_extract(p.match, bits), []).append(p)
+
+        now_decided = decided
+        for b in bits:
+            now_decided |= 1 << b
+        return DecodeNode(
+            bits=bits,
+            children={key: build(group, now_decided) for key, group in sorted(groups.items())},
+        )
+
+    return build(list(patterns), 0)
+
+
+def reference_decode(patterns, word):
+    """Reference model: the first pattern (in priority order) whose fixed bits match word."""
+    for p in patterns:
+        if p.matches(word):
+            return p
+    return None
+
+
+def random_words(patterns, count, seed=0):
+    """
+    Yield random instruction words.
+
+    Half are drawn from a random pattern with random variable bits (so they
+    decode to something), the other half are uniformly random.
+    """
+    rng = random.Random(seed)
+    full = (1 << INSN_WIDTH) - 1
+    for i in range(count):
+        if patterns and i % 2 == 0:
+            p = rng.choice(patterns)
+            yield p.match | (rng.getrandbits(INSN_WIDTH) & ~p.mask & full)
+        else:
+            yield rng.getrandbits(INSN_WIDTH)
+
+
+def _sv_pattern(p, width=INSN_WIDTH):
+    """Render a pattern as a SystemVerilog casez literal."""
+    bits = []
+    for b in range(width - 1, -1, -1):
+        if (p.mask >> b) & 1:
+            bits.append(str((p.match >> b) & 1))
+        else:
+            bits.append("?")
+    return f"{width}'b" + "".join(bits)
+
+
+def _sv_select(bits, signal="insn_i"):
+    """Render a list of bit positions (MSB first) as a concatenation of part-selects."""
+    ranges = []
+    for b in bits:
+        if ranges and ranges[-1][1] == b + 1:
+            ranges[-1][1] = b
+        else:
+            ranges.append([b, b])
+    parts = [f"{signal}[{hi}]" if hi == lo else f"{signal}[{hi}:{lo}]" for hi, lo in ranges]
+    return parts[0] if len(parts) == 1 else "{" + ", ".join(parts) + "}"
+
+
+def _id_name(name):
+    return "ID_" + name.replace(".", "_").upper()
+
+
+def _write_casez(out, patterns, indent, qualifier):
+    out.write(f"{indent}{qualifier}casez (insn_i)\n")
+    for p in patterns:
+        out.write(f"{indent}  {_sv_pattern(p)}: insn_id_o = {_id_name(p.name)};\n")
+    out.write(f"{indent}  default: illegal_o = 1'b1;\n")
+    out.write(f"{indent}endcase\n")
+
+
+def _write_tree(out, node, indent):
+    if not node.bits:
+        # Leaves are small; keep priority semantics for hints that overlap their base instruction
+        _write_casez(out, node.patterns, indent, "priority ")
+        return
+    width = len(node.bits)
+    out.write(f"{indent}case ({_sv_select(node.bits)})\n")
+    for key, child in node.children.items():
+        out.write(f"{indent}  {width}'b{key:0{width}b}: begin\n")
+        _write_tree(out, child, indent + "    ")
+        out.write(f"{indent}  end\n")
+    out.write(f"{indent}  default: illegal_o = 1'b1;\n")
+    out.write(f"{indent}endcase\n")
+
+
+def write_decoder(out, patterns, module_name, style="casez", tree=None):
+    """
+    Write a package of instruction IDs and a combinational decoder module.
+
+    The module outputs the decoded instruction ID, an illegal flag and a
+    one-hot instruction-valid vector indexed by ID (all zero when illegal).
+    """
+    names = sorted(p.name for p in patterns)
+    num_insts = len(names)
+    id_width = max(1, (num_insts - 1).bit_length())
+    max_len = max((len(_id_name(n)) for n in names), default=0)
+
+    out.write("/* Automatically generated by UDB */\n")
+    out.write(f"package {module_name}_pkg;\n")
+    out.write(f"  localparam int NUM_INSTS = {num_insts};\n")
+    out.write(f"  localparam int ID_WIDTH  = {id_width};\n\n")
+    out.write("  typedef logic [ID_WIDTH-1:0] insn_id_t;\n\n")
+    for idx, name in enumerate(names):
+        out.write(f"  localparam insn_id_t {_id_name(name).ljust(max_len)} = {id_width}'d{idx};\n")
+    out.write("\nendpackage\n\n")
+
+    out.write(
+        f"""module {module_name}
+  import {module_name}_pkg::*;
+(
+  input  logic [31:0]          insn_i,
+  output insn_id_t             insn_id_o,
+  output logic                 illegal_o,
+  output logic [NUM_INSTS-1:0] insn_valid_o
+);
+
+  always_comb begin
+    insn_id_o = '0;
+    illegal_o = 1'b0;
+"""
+    )
+    if style == "tree":
+        _write_tree(out, tree, "    ")
+    else:
+        qualifier = "priority " if has_overlaps(patterns) else "unique "
+        _write_casez(out, patterns, "    ", qualifier)
+    out.write(
+        """  end
+
+  always_comb begin
+    insn_valid_o = '0;
+    if (!illegal_o) insn_valid_o[insn_id_o] = 1'b1;
+  end
+
+endmodule
+"""
+    )
+
+
+def write_vectors(out, patterns, count=1000, seed=0):
+    """
+    Write random words and their reference decode as a $readmemh file.
+
+    Each line is {word[31:0], id[15:0]} with id 16'hffff for illegal words.
+    """
+    ids = {name: idx for idx, name in enumerate(sorted(p.name for p in patterns))}
+    out.write("// {insn[31:0]}_{id[15:0]}, id ffff = illegal\n")
+    for word in random_words(patterns, count, seed):
+        p = reference_decode(patterns, word)
+        out.write(f"{word:08x}_{0xFFFF if p is None else ids[p.name]:04x}\n")
+
+
+# ============================================================================
+# Checking the rendered module
+# ============================================================================
+
+ID_PARAM_RE = re.compile(r"localparam insn_id_t (\w+)\s*= \d+'d(\d+);")
+CASEZ_ITEM_RE = re.compile(r"(\d+'b[01?]+): insn_id_o = (\w+);")
+CASE_ITEM_RE = re.compile(r"\d+'b([01]+): begin")
+DEFAULT_ITEM = "default: illegal_o = 1'b1;"
+SELECT_RE = re.compile(r"insn_i\[(\d+)(?::(\d+))?\]")
+
+
+def parse_casez_literal(literal):
+    """Parse a casez literal such as 32'b01??...1 back into (mask, match)."""
+    digits = literal.split("'b", 1)[1]
+    mask = int("".join("0" if c == "?" else "1" for c in digits), 2)
+    match = int("".join("0" if c == "?" else c for c in digits), 2)
+    return mask, match
+
+
+def parse_select(select):
+    """Bit positions (MSB first) of a part-select or concatenation of part-selects."""
+    bits = []
+    for hi, lo in SELECT_RE.findall(select):
+        bits.extend(range(int(hi), int(lo or hi) - 1, -1))
+    return bits
+
+
+def parse_decoder(text):
+    """
+    Parse a module written by write_decoder.
+
+    Returns ({ID localparam: value}, statement), where a statement is
+    ("casez", [(mask, match, id name), ...]) or ("case", bits, {key: statement}).
+    Raises ValueError on text the writer does not produce.
+    """
+    ids = {name: int(value) for name, value in ID_PARAM_RE.findall(text)}
+    lines = [line.strip() for line in text.splitlines()]
+    try:
+        pos = lines.index("always_comb begin") + 1
+    except ValueError:
+        raise ValueError("no always_comb block") from None
+    while lines[pos] in ("insn_id_o = '0;", "illegal_o = 1'b0;"):
+        pos += 1
+
+    def statement(pos):
+        head = lines[pos]
+        if head.endswith("casez (insn_i)"):
+            items = []
+            pos += 1
+            while lines[pos] != DEFAULT_ITEM:
+                m = CASEZ_ITEM_RE.fullmatch(lines[pos])
+                if m is None:
+                    raise ValueError(f"unexpected casez item: {lines[pos]}")
+                items.append((*parse_casez_literal(m.group(1)), m.group(2)))
+                pos += 1
+            return ("casez", items), expect(pos + 1, "endcase")
+        if head.startswith("case (") and head.endswith(")"):
+            bits = parse_select(head[len("case (") : -1])
+            children = {}
+            pos += 1
+            while lines[pos] != DEFAULT_ITEM:
+                m = CASE_ITEM_RE.fullmatch(lines[pos])
+                if m is None:
+                    raise ValueError(f"unexpected case item: {lines[pos]}")
+                children[int(m.group(1), 2)], pos = statement(pos + 1)
+                pos = expect(pos, "end")
+            return ("case", bits, children), expect(pos + 1, "endcase")
+        raise ValueError(f"unexpected statement: {head}")
+
+    def expect(pos, line):
+        if lines[pos] != line:
+            raise ValueError(f"expected {line!r}, got {lines[pos]!r}")
+        return pos + 1
+
+    stmt, pos = statement(pos)
+    expect(pos, "end")
+    return ids, stmt
+
+
+def emitted_decode(stmt, word):
+    """Evaluate a parsed decoder statement on word; the ID name, or None if illegal."""
+    while stmt[0] == "case":
+        stmt = stmt[2].get(_extract(word, stmt[1]))
+        if stmt is None:
+            return None
+    for mask, match, id_name in stmt[1]:
+        if (word & mask) == match:
+            return id_name
+    return None
+
+
+def check_decoder(patterns, text, count=10000, seed=0):
+    """
+    Compare a rendered decoder module against reference_decode on random words.
+
+    Returns the mismatches as (word, expected pattern, decoded pattern) with
+    None for illegal; an ID that does not name a pattern is a mismatch too.
+    """
+    ids, stmt = parse_decoder(text)
+    by_value = {idx: name for idx, name in enumerate(sorted(p.name for p in patterns))}
+    by_name = {p.name: p for p in patterns}
+    mismatches = []
+    for word in random_words(patterns, count, seed):
+        expected = reference_decode(patterns, word)
+        id_name = emitted_decode(stmt, word)
+        actual = None
+        if id_name is not None:
+            name = by_value.get(ids.get(id_name))
+            actual = by_name[name] if name is not None and _id_name(name) == id_name else None
+            if actual is None:
+                # The ID does not decode to any instruction
+                actual = DecodePattern(f"<{id_name}>", 0, 0)
+        if expected != actual:
+            mismatches.append((word, expected, actual))
+    return mismatches
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import io
 import logging
 import os
 import sys
@@ -9,7 +10,15 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from emitter import Emitter
 from generator import load_csrs, load_exception_codes, load_instructions
+from sverilog_decoder import (
+    build_decode_tree,
+    check_decoder,
+    decode_patterns,
+    write_decoder,
+    write_vectors,
+)
 
 
 def parse_args():
@@ -57,7 +66,29 @@ def parse_args():
     )
     parser.add_argument(
         "--resolved-codes",
-        help="JSON file containing pre-resolved exception codes",
+        help="JSON file containing pre-resolved exception codes "
+        "(default: load them from the exception_code/ directory next to --ext-dir)",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=["casez", "tree"],
+        help="Also generate a decoder module: a flat casez, or a multi-level decode tree",
+    )
+    parser.add_argument(
+        "--decoder-output",
+        default=None,
+        help="Decoder module file name (default: riscv_decoder.sv next to --output)",
+    )
+    parser.add_argument(
+        "--decoder-check",
+        type=int,
+        default=10000,
+        help="Number of random words to check the decoder against the reference model (0 to skip)",
+    )
+    parser.add_argument(
+        "--decoder-vectors",
+        default=None,
+        help="Write random words with their reference decode to this $readmemh file",
     )
     return parser.parse_args()
 
@@ -100,7 +131,7 @@ def match_to_sverilog_bits(match_str):
 
 def generate_sverilog(instructions, csrs, causes, output_file):
     """Generate SystemVerilog package file."""
-    with open(output_file, "w") as f:
+    with Emitter(output_file) as f:
         # Write header
         f.write("/* Automatically generated by UDB */\n")
         f.write(f"package {Path(output_file).stem};\n")
@@ -151,6 +182,40 @@ def generate_sverilog(instructions, csrs, causes, output_file):
         f.write("\nendpackage\n")
 
 
+def generate_decoder(instructions, args):
+    """Generate the decoder module and check it against the Python reference model."""
+    output_file = args.decoder_output or os.path.join(
+        os.path.dirname(args.output), "riscv_decoder.sv"
+    )
+    patterns = decode_patterns(instructions)
+    tree = build_decode_tree(patterns) if args.decoder == "tree" else None
+
+    buf = io.StringIO()
+    write_decoder(buf, patterns, Path(output_file).stem, args.decoder, tree)
+    text = buf.getvalue()
+
+    if args.decoder_check:
+        # The rendered module itself is parsed and evaluated, not the Python tree it came from
+        mismatches = check_decoder(patterns, text, args.decoder_check)
+        for word, expected, actual in mismatches[:10]:
+            logging.error(
+                f"Decoder mismatch for 0x{word:08x}: expected "
+                f"{expected.name if expected else 'illegal'}, got {actual.name if actual else 'illegal'}"
+            )
+        if mismatches:
+            raise RuntimeError(f"{len(mismatches)} decoder mismatches against the reference model")
+        logging.info(f"Decoder matches the reference model on {args.decoder_check} random words")
+
+    with Emitter(output_file) as f:
+        f.write(text)
+    logging.info(f"Generated {output_file} ({args.decoder} decoder, {len(patterns)} instructions)")
+
+    if args.decoder_vectors:
+        with Emitter(args.decoder_vectors) as f:
+            write_vectors(f, patterns)
+        logging.info(f"Generated decoder test vectors {args.decoder_vectors}")
+
+
 def main():
     args = parse_args()
 
@@ -191,6 +256,9 @@ def main():
         f"Generated {args.output} with {len(instructions)} instructions and {len(csrs)} CSRs"
     )
 
+    if args.decoder:
+        generate_decoder(instructions, args)
+
 
 if __name__ == "__main__":
     main()
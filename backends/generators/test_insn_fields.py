@@ -0,0 +1,45 @@
+import random
+
+import pytest
+from insn_fields import FieldTable, compile_field, compile_location, format_location
+
+LOCATIONS = {
+    "31|7|30-25|11-8": ((31, 31), (7, 7), (30, 25), (11, 8)),
+    "12|6-2": ((12, 12), (6, 2)),
+    "31-12": ((31, 12),),
+    "26": ((26, 26),),
+    26: ((26, 26),),
+    0: ((0, 0),),
+}
+
+
+@pytest.mark.parametrize("location", LOCATIONS, ids=str)
+def test_compile_location(location):
+    segments = compile_location(location)
+    assert segments == LOCATIONS[location]
+    assert compile_location(format_location(segments)) == segments
+
+
+@pytest.mark.parametrize("location", ["", "7-11", "-1", "12-", "5-3-1", "rd", "12|", 2.5, None])
+def test_compile_location_rejects(location):
+    with pytest.raises(ValueError):
+        compile_location(location)
+
+
+def test_extract_all_matches_extract():
+    pytest.importorskip("numpy")
+    fields = [compile_field(str(loc), loc) for loc in LOCATIONS]
+    fields.append(compile_field("imm", "31|19-12|20|30-21"))
+    rng = random.Random(0)
+    words = [rng.getrandbits(32) for _ in range(500)] + [0, 0xFFFFFFFF]
+
+    table = FieldTable(fields)
+    values = table.extract_all(words)
+    assert values.shape == (len(words), len(fields))
+    by_name = table.extract_dict(words)
+    for i, field in enumerate(fields):
+        expected = [field.extract(w) for w in words]
+        assert values[:, i].tolist() == expected
+        assert by_name[field.name].tolist() == expected
+        # insert is the inverse of extract
+        assert all(field.extract(field.insert(0, v)) == v for v in expected)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Benchmark of the MCP tools
+
+Drives the server's tool dispatch (_call_tool) in-process, without a
+transport, over the repository's gen/ (default), another gen/ tree (--gen),
+or a generated tree of a given size (--synthetic N instructions). The mixed
+workload is drawn from the names in the tree: exact, regex, fuzzy and field
+searches, search_all and extension details.
+
+Every query runs once with an empty query cache (cold), then is answered
+again after the cache was filled (warm). Per tool and per query kind the
+report gives the call count, p50/p95/p99/mean/max latency in milliseconds and
+queries per second of one stream of calls; it is printed (or written with
+--output) as JSON for regression tracking.
+
+    python bench.py --synthetic 20000 --queries 50 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import server
+import yaml
+
+# Extensions, CSRs and opcodes of a generated tree
+SYNTHETIC_OPCODES = ("0001011", "0101011", "1011011", "1111011")
+SYNTHETIC_WORDS = ("add", "sub", "mul", "shift", "load", "store", "branch", "fence", "vector")
+
+
+# ============================================================================
+# Trees
+# ============================================================================
+
+
+def generate_tree(gen_dir: Path, instructions: int, seed: int = 0) -> None:
+    """
+    Write a resolved_spec tree shaped like gen/: `instructions` instructions
+    over one extension per 50 instructions, and one CSR per 10 instructions.
+    """
+    rng = random.Random(seed)
+    base = gen_dir / "resolved_spec" / "_"
+    n_ext = max(1, instructions // 50)
+    ext_names = [f"Xsyn{i}" for i in range(n_ext)]
+    for name in ext_names:
+        _dump(
+            base / "ext" / f"{name}.yaml",
+            {
+                "$schema": "ext_schema.json#",
+                "kind": "extension",
+                "name": name,
+                "type": "unprivileged",
+                "long_name": f"Synthetic extension {name}",
+                "versions": [{"version": "1.0.0", "state": "ratified"}],
+                "description": f"Generated {name} extension.",
+            },
+        )
+
+    for i in range(instructions):
+        word = SYNTHETIC_WORDS[i % len(SYNTHETIC_WORDS)]
+        name = f"{word}.s{i}"
+        ext = ext_names[i % n_ext]
+        # Distinct encodings: funct7, funct3 and a custom opcode
+        match = (
+            f"{(i >> 3) & 0x7F:07b}----------{i & 7:03b}-----"
+            f"{SYNTHETIC_OPCODES[(i >> 10) % len(SYNTHETIC_OPCODES)]}"
+        )
+        _dump(
+            base / "inst" / ext / f"{name}.yaml",
+            {
+                "$schema": "inst_schema.json#",
+                "kind": "instruction",
+                "name": name,
+                "long_name": f"Synthetic {word} {i}",
+                "description": (
+                    f"Performs a synthetic {word} of xs1 and xs2 and writes xd. "
+                    + " ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(20))
+                ),
+                "definedBy": {"extension": {"name": ext}},
+                "assembly": "xd, xs1, xs2",
+                "encoding": {
+                    "match": match,
+                    "variables": [
+                        {"name": "xs2", "location": "24-20"},
+                        {"name": "xs1", "location": "19-15"},
+                        {"name": "xd", "location": "11-7"},
+                    ],
+                },
+                "access": {"s": "always", "u": "always", "vs": "always", "vu": "always"},
+                "data_independent_timing": True,
+                "operation()": f"X[xd] = {word}(X[xs1], X[xs2]);",
+            },
+        )
+
+    for i in range(max(1, instructions // 10)):
+        name = f"csyn{i}"
+        fields = {
+            f"F{b}": {
+                "location": f"{b * 4 + 3}-{b * 4}",
+                "type": "RW",
+                "reset_value": 0,
+                "description": f"Synthetic field {b} of {name}.",
+            }
+            for b in range(8)
+        }
+        _dump(
+            base / "csr" / f"{name}.yaml",
+            {
+                "$schema": "csr_schema.json#",
+                "kind": "csr",
+                "name": name,
+                "long_name": f"Synthetic CSR {i}",
+                "address": 0x800 + i % 0x800,
+                "priv_mode": "M",
+                "length": "MXLEN",
+                "definedBy": {"extension": {"name": ext_names[i % n_ext]}},
+                "description": f"Generated CSR {i}.",
+                "fields": fields,
+            },
+        )
+
+
+def _dump(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        yaml.safe_dump(data, fh, sort_keys=False)
+
+
+def use_tree(gen_dir: Path) -> float:
+    """Point the server at gen_dir and build its catalog; returns the build time (s)."""
+    gen_dir = gen_dir.resolve()
+    server.REPO_ROOT = gen_dir.parent
+    server.GEN_DIR = gen_dir
+    server.CACHE_DIR = gen_dir / ".mcp_cache"
+    server._catalog = None
+    start = time.perf_counter()
+    server.get_catalog()
+    return time.perf_counter() - start
+
+
+# ============================================================================
+# Workload
+# ============================================================================
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    """Name with two neighbouring characters swapped, as a fuzzy query."""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+
+
+def build_workload(queries: int, seed: int = 0) -> list[tuple[str, str, dict[str, Any]]]:
+    """(kind, tool, arguments) calls drawn from the names of the current catalog."""
+    rng = random.Random(seed)
+    catalog = server.get_catalog()
+    insts = sorted({r.name for r in catalog.domains["instructions"] if r.name})
+    csrs = sorted({r.name for r in catalog.domains["csrs"] if r.name})
+    exts = sorted(catalog.extension_by_name)
+    assembly = sorted(
+        {
+            token
+            for r in catalog.domains["instructions"]
+            for token in str(r.data.get("assembly", "")).replace(",", " ").split()
+        }
+    )
+    if not insts or not csrs:
+        raise SystemExit(f"{server.GEN_DIR} has no instructions or CSRs to query")
+
+    calls: list[tuple[str, str, dict[str, Any]]] = []
+    for _ in range(queries):
+        inst = rng.choice(insts)
+        csr = rng.choice(csrs)
+        calls += [
+            ("exact", "search_instructions", {"term": inst}),
+            ("exact", "search_csrs", {"term": csr}),
+            (
+                "regex",
+                "search_instructions",
+                {"term": f"^{re.escape(inst[:2])}.*", "use_regex": True},
+            ),
+            ("fuzzy", "search_instructions", {"term": _typo(inst, rng), "fuzzy": True}),
+            ("fuzzy", "search_csrs", {"term": _typo(csr, rng), "fuzzy": True}),
+            ("search_all", "search_all", {"term": inst[:3]}),
+        ]
+        if assembly:
+            calls.append(
+                (
+                    "field",
+                    "search_instructions",
+                    {"term": rng.choice(assembly), "field": "assembly"},
+                )
+            )
+        if exts:
+            calls.append(
+                (
+                    "extension",
+                    "search_extensions",
+                    {"name": rng.choice(exts), "include_instructions": True, "include_csrs": True},
+                )
+            )
+    rng.shuffle(calls)
+    return calls
+
+
+async def run_calls(
+    calls: list[tuple[str, str, dict[str, Any]]], concurrency: int, clear_cache: bool
+) -> tuple[list[tuple[str, str, float]], float]:
+    """Run calls through _call_tool; returns ((kind, tool, ms) per call, wall seconds)."""
+    slots = asyncio.Semaphore(concurrency)
+    samples: list[tuple[str, str, float]] = []
+
+    async def one(kind: str, tool: str, args: dict[str, Any]) -> None:
+        async with slots:
+            if clear_cache:
+                server._query_cache.clear()
+            start = time.perf_counter()
+            await server._call_tool(tool, dict(args))
+            samples.append((kind, tool, (time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*call) for call in calls))
+    return samples, time.perf_counter() - start
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies_ms: list[float]) -> dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    total_s = sum(ordered) / 1000
+    return {
+        "count": len(ordered),
+        "p50_ms": round(_percentile(ordered, 50), 3),
+        "p95_ms": round(_percentile(ordered, 95), 3),
+        "p99_ms": round(_percentile(ordered, 99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "max_ms": round(ordered[-1], 3),
+        "qps": round(len(ordered) / total_s, 1) if total_s else None,
+    }
+
+
+def phase_report(samples: list[tuple[str, str, float]], wall_s: float) -> dict[str, Any]:
+    by_tool: dict[str, list[float]] = {}
+    by_query: dict[str, list[float]] = {}
+    for kind, tool, ms in samples:
+        by_tool.setdefault(tool, []).append(ms)
+        by_query.setdefault(f"{kind}:{tool}", []).append(ms)
+    return {
+        "calls": len(samples),
+        "wall_s": round(wall_s, 3),
+        "qps": round(len(samples) / wall_s, 1) if wall_s else None,
+        "tools": {tool: summarize(v) for tool, v in sorted(by_tool.items())},
+        "queries": {kind: summarize(v) for kind, v in sorted(by_query.items())},
+    }
+
+
+async def benchmark(queries: int, concurrency: int, seed: int) -> dict[str, Any]:
+    calls = build_workload(queries, seed)
+    cold, cold_s = await run_calls(calls, concurrency, clear_cache=True)
+    # Fill the cache once, then measure
+    await run_calls(calls, concurrency, clear_cache=False)
+    warm, warm_s = await run_calls(calls, concurrency, clear_cache=False)
+    return {"cold": phase_report(cold, cold_s), "warm": phase_report(warm, warm_s)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tools in-process")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--gen", type=Path, help="gen/ tree to query (default: the repo's)")
+    source.add_argument(
+        "--synthetic", type=int, metavar="N", help="generate a tree with N instructions"
+    )
+    parser.add_argument("--queries", type=int, default=20, help="rounds of the query mix")
+    parser.add_argument("--concurrency", type=int, default=1, help="calls in flight at once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    opts = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mcp-bench-") as tmp:
+        if opts.synthetic:
+            gen_dir = Path(tmp) / "gen"
+            start = time.perf_counter()
+            generate_tree(gen_dir, opts.synthetic, opts.seed)
+            print(
+                f"Generated {opts.synthetic} instructions in {time.perf_counter() - start:.1f}s",
+                file=sys.stderr,
+            )
+        else:
+            gen_dir = opts.gen or server.GEN_DIR
+        build_s = use_tree(gen_dir)
+        catalog = server.get_catalog()
+        phases = asyncio.run(benchmark(opts.queries, opts.concurrency, opts.seed))
+
+    report = {
+        "tree": {
+            "gen_dir": "<synthetic>" if opts.synthetic else str(gen_dir),
+            "synthetic_instructions": opts.synthetic,
+            "yaml_files": len(catalog.yaml_files),
+            "records": {d: len(recs) for d, recs in catalog.domains.items()},
+            "catalog_build_s": round(build_s, 3),
+        },
+        "workload": {"queries": opts.queries, "concurrency": opts.concurrency, "seed": opts.seed},
+        "python": platform.python_version(),
+        "query_cache_entries": server.QUERY_CACHE_ENTRIES,
+        **phases,
+    }
+    text = json.dumps(report, indent=2)
+    if opts.output:
+        opts.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Call graph of IDL functions
+
+Global functions are read from the isa/*.idl and isa/*.isa files of each
+resolved config (gen/resolved_spec/<config>/isa). Callers are the bodies of
+those functions, instruction operation() code and CSR code: sw_read() and the
+per-field sw_write(csr_value), type(), reset_value() and legal?(csr_value).
+
+Bodies are tokenized into identifiers followed by an argument list, e.g.
+`jump(...)`, `implemented?(...)` or `power_of_2?<N>(...)`, and only names of
+defined functions are kept, so `read` never matches `read_memory`.
+"""
+
+import re
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any
+
+from catalog import Catalog, Record
+
+FUNCTION_RE = re.compile(
+    r"^(?:(?:generated|builtin|external)\s+)*function\s+([A-Za-z_]\w*\??)\s*\{", re.M
+)
+BODY_RE = re.compile(r"^\s*body\s*\{", re.M)
+CALL_RE = re.compile(r"\b([A-Za-z_]\w*\??)\s*(?:<[^<>();{}]*>)?\s*\(")
+COMMENT_RE = re.compile(r"#.*$", re.M)
+
+# IDL code keys of CSRs and CSR fields
+CSR_CODE_KEYS = ("sw_read()",)
+FIELD_CODE_KEYS = ("sw_write(csr_value)", "type()", "reset_value()", "legal?(csr_value)")
+
+
+def _block(text: str, open_brace: int) -> str:
+    """Contents of the brace block starting at text[open_brace] == '{'."""
+    depth = 0
+    for i in range(open_brace, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[open_brace + 1 : i]
+    return text[open_brace + 1 :]
+
+
+def function_bodies(source: str) -> dict[str, str]:
+    """{function name: body code} for the function definitions in an IDL file."""
+    bodies: dict[str, str] = {}
+    defs = list(FUNCTION_RE.finditer(source))
+    for i, m in enumerate(defs):
+        # A definition runs until the next one; only its body block is code
+        end = defs[i + 1].start() if i + 1 < len(defs) else len(source)
+        chunk = source[m.end() : end]
+        body = BODY_RE.search(chunk)
+        code = _block(chunk, body.end() - 1) if body else ""
+        bodies[m.group(1)] = code
+    return bodies
+
+
+def code_bodies(rec: Record) -> list[tuple[str, str]]:
+    """(key, IDL code) pairs of an instruction or CSR record."""
+    data = rec.data
+    out: list[tuple[str, str]] = []
+    keys = ("operation()",) if rec.domain == "instructions" else CSR_CODE_KEYS
+    for key in keys:
+        if isinstance(data.get(key), str):
+            out.append((key, data[key]))
+    if rec.domain == "csrs" and isinstance(data.get("fields"), dict):
+        for name, fld in data["fields"].items():
+            if not isinstance(fld, dict):
+                continue
+            for key in FIELD_CODE_KEYS:
+                if isinstance(fld.get(key), str):
+                    out.append((f"fields.{name}.{key}", fld[key]))
+    return out
+
+
+def calls(code: str, known: set[str] | dict[str, Any]) -> Counter:
+    """Count the calls to known functions in a piece of IDL code."""
+    return Counter(m.group(1) for m in CALL_RE.finditer(code) if m.group(1) in known)
+
+
+def isa_files(catalog: Catalog) -> list[Path]:
+    files: list[Path] = []
+    resolved = catalog.gen_dir / "resolved_spec"
+    if resolved.is_dir():
+        for isa_dir in sorted(resolved.glob("*/isa")):
+            files.extend(sorted(p for p in isa_dir.iterdir() if p.suffix in {".idl", ".isa"}))
+    return files
+
+
+def isa_stamp(files: list[Path]) -> tuple:
+    """Identity of the isa files (path, mtime), to notice edits that are not YAML."""
+    return tuple((str(p), p.stat().st_mtime_ns) for p in files if p.exists())
+
+
+class CallGraph:
+    """
+    Caller/callee index over IDL code.
+
+    Nodes are "function:<name>" for global functions and "<path>#<key>" for
+    YAML code (e.g. "gen/.../add.yaml#operation()"); edges carry call counts.
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.generation = catalog.generation
+        files = isa_files(catalog)
+        self.stamp = isa_stamp(files)
+
+        # function name -> (defining file, body)
+        self.functions: dict[str, tuple[str, str]] = {}
+        for path in files:
+            rel = str(path.relative_to(catalog.repo_root))
+            for name, body in function_bodies(path.read_text(encoding="utf-8")).items():
+                self.functions.setdefault(name, (rel, body))
+
+        # node -> info / code, caller node -> Counter(callee function), callee -> {caller: count}
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.code: dict[str, str] = {}
+        self.callees: dict[str, Counter] = {}
+        self.callers: dict[str, dict[str, int]] = {name: {} for name in self.functions}
+
+        for name, (rel, body) in self.functions.items():
+            self._add(f"function:{name}", {"kind": "function", "name": name, "path": rel}, body)
+
+        resolved = catalog.gen_dir / "resolved_spec"
+        for domain in ("instructions", "csrs"):
+            for rec in catalog.domains[domain]:
+                if not rec.path.is_relative_to(resolved):
+                    continue
+                kind = "instruction" if domain == "instructions" else "csr"
+                for key, code in code_bodies(rec):
+                    info = {"kind": kind, "name": rec.name, "path": rec.rel, "key": key}
+                    self._add(f"{rec.rel}#{key}", info, code)
+
+        self.usage_counts = {
+            name: sum(by_caller.values()) for name, by_caller in self.callers.items()
+        }
+        self._closure: dict[tuple[str, str], dict[str, int]] = {}
+
+    def _add(self, node: str, info: dict[str, Any], code: str) -> None:
+        self.nodes[node] = info
+        self.code[node] = code
+        counts = calls(COMMENT_RE.sub("", code), self.functions)
+        self.callees[node] = counts
+        for name, n in counts.items():
+            self.callers[name][node] = n
+
+    def caller_nodes(self, name: str) -> dict[str, int]:
+        """{caller node: call count} of the direct callers of a function."""
+        return self.callers.get(name, {})
+
+    def callee_names(self, node: str) -> Counter:
+        """Counter of the functions called directly by a node."""
+        return self.callees.get(node, Counter())
+
+    def reachable(self, name: str, direction: str, max_depth: int | None = None) -> dict[str, int]:
+        """
+        Transitive closure from function `name`.
+
+        direction "callers": every node that can reach the function;
+        direction "callees": every function the function can reach.
+        Returns {node: depth}, depth 1 being direct callers/callees.
+        """
+        if name not in self.functions:
+            return {}
+        key = (name, direction)
+        if max_depth is None and key in self._closure:
+            return self._closure[key]
+        start = f"function:{name}"
+        seen: dict[str, int] = {}
+        queue = deque([(start, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            if direction == "callers":
+                fname = self.nodes[node]["name"] if node.startswith("function:") else None
+                nexts = list(self.caller_nodes(fname)) if fname else []
+            else:
+                nexts = [f"function:{f}" for f in self.callee_names(node)]
+            for nxt in nexts:
+                if nxt not in seen and nxt != start:
+                    seen[nxt] = depth + 1
+                    queue.append((nxt, depth + 1))
+        if max_depth is None:
+            self._closure[key] = seen
+        return seen
+
+    def snippet(self, node: str, name: str, before: int = 60, after: int = 120) -> str | None:
+        """Code around the first call of `name` in a node's code."""
+        code = self.code.get(node, "")
+        for m in CALL_RE.finditer(code):
+            if m.group(1) == name:
+                return code[max(0, m.start() - before) : m.start() + after]
+        return None
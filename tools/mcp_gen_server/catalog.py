@@ -0,0 +1,473 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+In-memory catalog of the YAML data under gen/
+
+The catalog walks gen/ once, parses every instruction, CSR, extension,
+parameter and exception code YAML, and keeps the parsed documents together
+with the attributes the MCP tools filter on (extension names, XLEN, CSR
+address). Secondary indexes map those
+attributes back to records so that tool calls never touch the filesystem.
+
+A Catalog is never modified after construction. Catalog.updated re-parses only
+the files that changed and returns a new Catalog with the next generation
+number, so a reader holding a reference always sees one consistent snapshot.
+"""
+
+import contextlib
+import functools
+import operator
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import yaml
+from fuzzy import FuzzyIndex
+
+# libyaml's loader is several times faster; fall back to the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DOMAINS = ("instructions", "csrs", "extensions", "params", "exception_codes")
+
+# Names a record can be found by with fuzzy matching, per domain ("stem" is the file name)
+FUZZY_FIELDS = {
+    "instructions": ("name", "assembly", "stem"),
+    "csrs": ("name", "long_name", "stem"),
+    "extensions": ("name", "long_name"),
+    "params": ("name", "long_name"),
+    "exception_codes": ("name", "display_name"),
+}
+
+
+# ============================================================================
+# YAML Helpers
+# ============================================================================
+
+
+def load_yaml(path: Path) -> dict:
+    """Load and parse a YAML file."""
+    with open(path, encoding="utf-8") as fh:
+        return yaml.load(fh, Loader=YAML_LOADER) or {}
+
+
+def extension_in_path(rel_parts: list[str] | tuple[str, ...]) -> str | None:
+    """Find extension name from path (heuristic: segment after 'inst')."""
+    for i, part in enumerate(rel_parts):
+        if part == "inst" and i + 1 < len(rel_parts):
+            return rel_parts[i + 1]
+    return None
+
+
+def _as_int(value: Any) -> int | None:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value, 0)
+        except ValueError:
+            return None
+    return None
+
+
+# ============================================================================
+# Extension Conditions
+# ============================================================================
+
+XLENS = (32, 64)
+ALL_XLENS = frozenset(XLENS)
+
+# Condition keys whose operands must all / may hold
+CONJUNCTIONS = ("extension", "allOf")
+DISJUNCTIONS = ("anyOf", "oneOf")
+NEGATIONS = ("not", "noneOf")
+
+
+def condition_extensions(
+    cond: Any, names: set[str], excluded: set[str], negated: bool = False
+) -> None:
+    """
+    Collect the extension names of a definedBy condition.
+
+    Handles {extension: {name}} and the allOf/anyOf/oneOf lists at both the
+    top level and inside `extension`, plus bare names and name lists; names
+    under not/noneOf go to `excluded` instead of `names`.
+    """
+    if isinstance(cond, str):
+        (excluded if negated else names).add(cond)
+    elif isinstance(cond, list):
+        for c in cond:
+            condition_extensions(c, names, excluded, negated)
+    elif isinstance(cond, dict):
+        name = cond.get("name")
+        if isinstance(name, str):
+            (excluded if negated else names).add(name)
+        for key in CONJUNCTIONS + DISJUNCTIONS:
+            if key in cond:
+                condition_extensions(cond[key], names, excluded, negated)
+        for key in NEGATIONS:
+            if key in cond:
+                condition_extensions(cond[key], names, excluded, not negated)
+
+
+def condition_xlens(cond: Any) -> frozenset[int]:
+    """
+    XLENs for which a definedBy condition can hold.
+
+    {xlen: N} restricts to N; allOf (and the keys of one mapping) intersect,
+    anyOf/oneOf unite; not/noneOf only exclude an XLEN when negating a plain
+    {xlen: N}. Extension terms hold for any XLEN.
+    """
+    if not isinstance(cond, dict):
+        return ALL_XLENS
+    xlens = ALL_XLENS
+    if "xlen" in cond:
+        x = _as_int(cond["xlen"])
+        if x in XLENS:
+            xlens = frozenset((x,))
+    if isinstance(cond.get("allOf"), list):
+        for c in cond["allOf"]:
+            xlens &= condition_xlens(c)
+    for key in DISJUNCTIONS:
+        if isinstance(cond.get(key), list) and cond[key]:
+            xlens &= frozenset().union(*(condition_xlens(c) for c in cond[key]))
+    for key in NEGATIONS:
+        operands = cond.get(key)
+        for c in operands if isinstance(operands, list) else [operands]:
+            if isinstance(c, dict) and c.keys() == {"xlen"}:
+                xlens -= condition_xlens(c)
+    return xlens
+
+
+def defined_by_extensions(data: dict) -> list[str]:
+    """Extension names of a definedBy condition (excluded names are left out), sorted."""
+    names: set[str] = set()
+    condition_extensions(data.get("definedBy"), names, set())
+    return sorted(names)
+
+
+def csr_extensions(data: dict) -> set[str]:
+    """Extract all extension names from CSR (top-level and field-level definedBy)."""
+    exts = set(defined_by_extensions(data))
+    fields = data.get("fields")
+    if isinstance(fields, dict):
+        for fld in fields.values():
+            if isinstance(fld, dict) and "definedBy" in fld:
+                exts.update(defined_by_extensions(fld))
+    return exts
+
+
+def extract_xlen(data: dict) -> tuple[int, ...]:
+    """
+    XLENs an instruction or CSR exists in: the intersection of `base`, the
+    encoding.RV32/RV64 variants and the xlen terms of definedBy (any XLEN
+    when none of them restricts it).
+    """
+    xlens = ALL_XLENS
+    base = _as_int(data.get("base"))
+    if base in XLENS:
+        xlens &= frozenset((base,))
+    encoding = data.get("encoding")
+    if isinstance(encoding, dict) and any(f"RV{x}" in encoding for x in XLENS):
+        xlens &= frozenset(x for x in XLENS if f"RV{x}" in encoding)
+    if "definedBy" in data:
+        xlens &= condition_xlens(data["definedBy"])
+    return tuple(sorted(xlens))
+
+
+def bitset(positions: Iterable[int]) -> int:
+    """Integer with the given bit positions set."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    buf = bytearray(max(positions) // 8 + 1)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def bit_positions(mask: int) -> list[int]:
+    """Set bit positions of a non-negative integer, ascending."""
+    bits = bin(mask)[:1:-1]
+    out = []
+    i = bits.find("1")
+    while i != -1:
+        out.append(i)
+        i = bits.find("1", i + 1)
+    return out
+
+
+# ============================================================================
+# Records
+# ============================================================================
+
+
+def classify(rel_to_gen: Path) -> str | None:
+    """Return the domain a gen/-relative YAML path belongs to, or None."""
+    parts = rel_to_gen.parts
+    dirs = parts[:-1]
+    if "inst" in dirs and any(part in {"spec", "resolved_spec"} for part in parts):
+        return "instructions"
+    if "csr" in dirs:
+        return "csrs"
+    if "ext" in dirs:
+        return "extensions"
+    if "param" in dirs:
+        return "params"
+    if "exception_code" in dirs:
+        return "exception_codes"
+    return None
+
+
+class Record:
+    """One parsed YAML file plus the attributes the search tools use."""
+
+    __slots__ = (
+        "address",
+        "data",
+        "defined_by",
+        "domain",
+        "ext_from_path",
+        "extensions",
+        "name",
+        "path",
+        "rel",
+        "search_text",
+        "stem",
+        "xlen",
+    )
+
+    def __init__(self, path: Path, domain: str, data: dict, repo_root: Path, gen_dir: Path):
+        self.path = path
+        self.domain = domain
+        self.data = data
+        self.rel = str(path.relative_to(repo_root))
+        self.stem = path.stem
+
+        name = data.get("name")
+        self.name = name if isinstance(name, str) else ""
+        self.xlen = extract_xlen(data)
+        self.address = _as_int(data.get("address")) if domain == "csrs" else None
+
+        if domain == "csrs":
+            self.defined_by = defined_by_extensions(data)
+            self.ext_from_path = None
+            self.extensions = csr_extensions(data)
+            text_parts = [self.stem.lower(), self.rel.lower(), self.name, data.get("long_name", "")]
+        else:
+            self.defined_by = defined_by_extensions(data)
+            self.ext_from_path = (
+                extension_in_path(path.relative_to(gen_dir).parts)
+                if domain == "instructions"
+                else None
+            )
+            self.extensions = set(self.defined_by)
+            if self.ext_from_path:
+                self.extensions.add(self.ext_from_path)
+            if domain == "instructions":
+                text_parts = [
+                    self.stem.lower(),
+                    self.rel.lower(),
+                    self.name,
+                    data.get("assembly", ""),
+                    data.get("long_name", ""),
+                ]
+            else:
+                text_parts = [self.name, data.get("long_name", "")]
+        self.search_text = " ".join(str(t) for t in text_parts).lower()
+
+    @property
+    def kind(self) -> str | None:
+        return self.data.get("kind")
+
+    def fuzzy_names(self) -> list[str]:
+        names = [self.stem if f == "stem" else self.data.get(f) for f in FUZZY_FIELDS[self.domain]]
+        return [n for n in names if isinstance(n, str)]
+
+
+def _load_record(path: Path, repo_root: Path, gen_dir: Path) -> Record | None:
+    domain = classify(path.relative_to(gen_dir))
+    if domain is None:
+        return None
+    try:
+        data = load_yaml(path)
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return Record(path, domain, data, repo_root, gen_dir)
+
+
+def is_yaml(path: Path) -> bool:
+    return path.suffix.lower() in {".yaml", ".yml"}
+
+
+def scan_yaml(root: Path) -> dict[Path, int]:
+    """Map every YAML file under root to its modification time (ns)."""
+    mtimes: dict[Path, int] = {}
+    if not root.exists():
+        return mtimes
+    for dirpath, _dirs, files in os.walk(root):
+        for f in files:
+            if f.lower().endswith((".yaml", ".yml")):
+                p = Path(dirpath) / f
+                with contextlib.suppress(FileNotFoundError):
+                    mtimes[p] = p.stat().st_mtime_ns
+    return mtimes
+
+
+# ============================================================================
+# Catalog
+# ============================================================================
+
+
+class Catalog:
+    """
+    Immutable snapshot of gen/ with secondary indexes.
+
+    Indexes:
+      domains[domain]: Records in path order
+      extension_by_name[name]
+      by_rel[repo-relative path]
+
+    ext_bits[domain][extension name] and xlen_bits[domain][32 | 64] index
+    extensions and XLEN as bitsets over the positions in domains[domain], so
+    that filters combine with integer | and &.
+    """
+
+    def __init__(
+        self,
+        records: dict[Path, Record],
+        mtimes: dict[Path, int],
+        repo_root: Path,
+        gen_dir: Path,
+        generation: int = 1,
+    ):
+        self.records = records
+        # Every YAML file under gen/ (indexed or not) -> mtime, used to detect changes
+        self.mtimes = mtimes
+        self.repo_root = repo_root
+        self.gen_dir = gen_dir
+        self.generation = generation
+
+        self.domains: dict[str, list[Record]] = {d: [] for d in DOMAINS}
+        # Extension and XLEN indexes as bitsets over the positions in domains[d]
+        self.ext_bits: dict[str, dict[str, int]] = {d: {} for d in DOMAINS}
+        self.xlen_bits: dict[str, dict[int, int]] = {d: {} for d in DOMAINS}
+        self.by_rel: dict[str, Record] = {}
+        # Extension name -> record; when several files define it, the shortest path wins
+        self.extension_by_name: dict[str, Record] = {}
+        self.yaml_files = sorted(str(p.relative_to(repo_root)) for p in mtimes)
+        # Built on first fuzzy query per domain
+        self._fuzzy: dict[str, FuzzyIndex] = {}
+
+        ext_positions: dict[str, dict[str, list[int]]] = {d: {} for d in DOMAINS}
+        xlen_positions: dict[str, dict[int, list[int]]] = {d: {} for d in DOMAINS}
+        for path in sorted(records):
+            rec = records[path]
+            d = rec.domain
+            pos = len(self.domains[d])
+            self.domains[d].append(rec)
+            for ext in rec.extensions:
+                ext_positions[d].setdefault(ext, []).append(pos)
+            for x in rec.xlen:
+                xlen_positions[d].setdefault(x, []).append(pos)
+            self.by_rel[rec.rel] = rec
+            if d == "extensions" and rec.kind == "extension" and rec.name:
+                prev = self.extension_by_name.get(rec.name)
+                if prev is None or len(rec.rel) < len(prev.rel):
+                    self.extension_by_name[rec.name] = rec
+
+        for d in DOMAINS:
+            self.ext_bits[d] = {e: bitset(p) for e, p in ext_positions[d].items()}
+            self.xlen_bits[d] = {x: bitset(p) for x, p in xlen_positions[d].items()}
+
+    @classmethod
+    def build(cls, repo_root: Path, gen_dir: Path, generation: int = 1) -> "Catalog":
+        """Walk gen/ once and parse the YAML of every domain."""
+        mtimes = scan_yaml(gen_dir)
+        records: dict[Path, Record] = {}
+        for p in sorted(mtimes):
+            rec = _load_record(p, repo_root, gen_dir)
+            if rec is not None:
+                records[p] = rec
+        return cls(records, mtimes, repo_root, gen_dir, generation)
+
+    def updated(self, changed: Iterable[Path]) -> "Catalog":
+        """
+        Return a new Catalog (generation + 1) with the changed paths re-read.
+
+        A path may be a file or a directory that was added, modified or removed.
+        Records of unchanged files are shared with this catalog, so only the
+        changed files are parsed; the indexes are rebuilt from the records.
+        """
+        records = dict(self.records)
+        mtimes = dict(self.mtimes)
+        for path in changed:
+            path = Path(path)
+            # Drop what was known under the path, then re-read whatever exists now
+            if is_yaml(path):
+                stale = [path] if path in mtimes else []
+            else:
+                stale = [p for p in mtimes if p.is_relative_to(path)]
+            for p in stale:
+                del mtimes[p]
+                records.pop(p, None)
+            if not path.is_relative_to(self.gen_dir):
+                continue
+            found: dict[Path, int] = {}
+            if path.is_dir():
+                found = scan_yaml(path)
+            elif is_yaml(path):
+                with contextlib.suppress(FileNotFoundError):
+                    found = {path: path.stat().st_mtime_ns}
+            for p, mtime in found.items():
+                mtimes[p] = mtime
+                rec = _load_record(p, self.repo_root, self.gen_dir)
+                if rec is not None:
+                    records[p] = rec
+        return Catalog(records, mtimes, self.repo_root, self.gen_dir, self.generation + 1)
+
+    def candidates(
+        self, domain: str, extensions: set[str] | None = None, xlens: set[int] | None = None
+    ) -> list[Record]:
+        """
+        Records of a domain, narrowed through the extension and XLEN indexes.
+
+        The result keeps path order, so callers see the same ordering as a full scan.
+        """
+        if not extensions and not xlens:
+            return self.domains[domain]
+
+        mask = -1
+        if extensions:
+            ext_bits = self.ext_bits[domain]
+            mask &= functools.reduce(operator.or_, (ext_bits.get(e, 0) for e in extensions), 0)
+        if xlens:
+            xlen_bits = self.xlen_bits[domain]
+            mask &= functools.reduce(operator.or_, (xlen_bits.get(x, 0) for x in xlens), 0)
+        recs = self.domains[domain]
+        return [recs[i] for i in bit_positions(mask)]
+
+    def fuzzy_search(
+        self, domain: str, query: str, threshold: float, limit: int | None = None
+    ) -> dict[int, float]:
+        """
+        Fuzzy-match query against the names of a domain's records.
+
+        Returns {id(record): score} for the matching records (the best `limit`
+        of them if given).
+        """
+        index = self._fuzzy.get(domain)
+        if index is None:
+            index = self._fuzzy[domain] = FuzzyIndex(r.fuzzy_names() for r in self.domains[domain])
+        recs = self.domains[domain]
+        return {id(recs[i]): score for i, score in index.search(query, threshold, limit)}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "yaml_files": len(self.mtimes),
+            **{d: len(recs) for d, recs in self.domains.items()},
+        }
@@ -0,0 +1,177 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Index of the CSR address space and CSR field layouts
+
+CSR addresses (and the virtual_address of VS CSRs) are kept in a sorted
+array, so an address range is found with two binary searches. Field bit
+ranges come from location, or location_rv32/location_rv64 when the layout
+depends on XLEN; since CSRs are at most 64 bits wide, fields are bucketed by
+bit and an overlap query only visits the buckets of the queried bits.
+
+The custom CSR ranges reserved by the privileged spec are listed per
+privilege mode to report the addresses that no CSR in gen/ uses.
+"""
+
+import bisect
+from typing import Any
+
+from catalog import Catalog, Record
+from encodingindex import compile_location
+
+# Custom (non-standard) CSR address ranges of the privileged spec, inclusive
+CUSTOM_CSR_RANGES: dict[str, tuple[tuple[int, int], ...]] = {
+    "M": ((0x7C0, 0x7FF), (0xBC0, 0xBFF), (0xFC0, 0xFFF)),
+    "S": ((0x5C0, 0x5FF), (0x9C0, 0x9FF), (0xDC0, 0xDFF)),
+    "U": ((0x800, 0x8FF), (0xCC0, 0xCFF)),
+    "H": ((0x6C0, 0x6FF), (0xAC0, 0xAFF), (0xEC0, 0xEFF)),
+}
+CUSTOM_CSR_RANGES["VS"] = CUSTOM_CSR_RANGES["H"]
+
+XLENS = (32, 64)
+
+
+class FieldSpan:
+    __slots__ = ("csr", "high", "low", "name", "xlen")
+
+    def __init__(self, csr: str, name: str, high: int, low: int, xlen: int | None):
+        self.csr = csr
+        self.name = name
+        self.high = high
+        self.low = low
+        self.xlen = xlen
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "csr": self.csr,
+            "field": self.name,
+            "location": str(self.low) if self.high == self.low else f"{self.high}-{self.low}",
+            "xlen": [self.xlen] if self.xlen else list(XLENS),
+        }
+
+
+def field_spans(rec: Record) -> list[FieldSpan]:
+    """Bit ranges of a CSR's fields; XLEN-specific locations give one span per XLEN."""
+    spans = []
+    fields = rec.data.get("fields")
+    if not isinstance(fields, dict):
+        return spans
+    for name, fld in fields.items():
+        if not isinstance(fld, dict):
+            continue
+        if "location" in fld:
+            locations = [(None, fld["location"])]
+        else:
+            locations = [(x, fld[f"location_rv{x}"]) for x in XLENS if f"location_rv{x}" in fld]
+        for xlen, location in locations:
+            try:
+                segments = compile_location(location)
+            except ValueError:
+                continue
+            for high, low in segments:
+                spans.append(FieldSpan(rec.name, name, high, low, xlen))
+    return spans
+
+
+def parse_bits(bits: Any) -> tuple[int, int]:
+    """Bit range argument (12, "12", "12-11" or [12, 11]) as (high, low)."""
+    if isinstance(bits, list) and len(bits) == 2:
+        high, low = (int(b) for b in bits)
+    else:
+        segments = compile_location(bits)
+        if len(segments) != 1:
+            raise ValueError(f"Expected a single bit range, got {bits!r}")
+        high, low = segments[0]
+    if high < low:
+        high, low = low, high
+    if low < 0 or high > 63:
+        raise ValueError(f"Bit range {bits!r} is outside 0-63")
+    return high, low
+
+
+def _runs(addresses: list[int]) -> list[tuple[int, int]]:
+    """Collapse sorted addresses into inclusive (first, last) runs."""
+    runs: list[tuple[int, int]] = []
+    for a in addresses:
+        if runs and runs[-1][1] == a - 1:
+            runs[-1] = (runs[-1][0], a)
+        else:
+            runs.append((a, a))
+    return runs
+
+
+class CsrSpace:
+    """Sorted address array and per-bit field buckets over the CSRs of a catalog."""
+
+    def __init__(self, catalog: Catalog):
+        self.generation = catalog.generation
+        # One record per CSR name: gen/spec and gen/resolved_spec hold the same CSRs
+        self.csrs: dict[str, Record] = {}
+        for rec in catalog.domains["csrs"]:
+            if rec.name and rec.name not in self.csrs:
+                self.csrs[rec.name] = rec
+
+        entries = []
+        for name, rec in self.csrs.items():
+            if rec.address is not None:
+                entries.append((rec.address, name, "address"))
+            virtual = rec.data.get("virtual_address")
+            if isinstance(virtual, int):
+                entries.append((virtual, name, "virtual_address"))
+        entries.sort()
+        self.addresses = [a for a, _n, _k in entries]
+        self.address_entries = entries
+
+        # bit -> spans covering it, and csr name -> its spans ordered by bit
+        self.bits: list[list[FieldSpan]] = [[] for _ in range(64)]
+        self.layouts: dict[str, list[FieldSpan]] = {}
+        for name, rec in self.csrs.items():
+            spans = sorted(field_spans(rec), key=lambda s: (-s.high, s.xlen or 0))
+            self.layouts[name] = spans
+            for span in spans:
+                for bit in range(span.low, min(span.high, 63) + 1):
+                    self.bits[bit].append(span)
+
+    def in_range(self, start: int, end: int) -> list[tuple[int, str, str]]:
+        """(address, csr name, "address"|"virtual_address") for addresses in [start, end]."""
+        lo = bisect.bisect_left(self.addresses, start)
+        hi = bisect.bisect_right(self.addresses, end)
+        return self.address_entries[lo:hi]
+
+    def overlapping(
+        self, high: int, low: int, csr: str | None = None, xlen: int | None = None
+    ) -> list[FieldSpan]:
+        """Field spans overlapping bits [high:low], optionally of one CSR and one XLEN."""
+        if csr is not None:
+            spans = [s for s in self.layouts.get(csr, []) if s.low <= high and s.high >= low]
+        else:
+            seen: dict[int, FieldSpan] = {}
+            for bit in range(low, high + 1):
+                for span in self.bits[bit]:
+                    seen.setdefault(id(span), span)
+            spans = sorted(seen.values(), key=lambda s: (s.csr, -s.high))
+        if xlen is not None:
+            spans = [s for s in spans if s.xlen in (None, xlen)]
+        return spans
+
+    def free_custom(self, priv_mode: str) -> list[dict[str, Any]]:
+        """Unused addresses of the custom CSR ranges of a privilege mode, as runs."""
+        ranges = CUSTOM_CSR_RANGES.get(priv_mode.upper())
+        if ranges is None:
+            raise ValueError(
+                f"Invalid priv_mode '{priv_mode}'. Must be one of: {sorted(CUSTOM_CSR_RANGES)}"
+            )
+        out = []
+        for start, end in ranges:
+            used = {a for a, _n, _k in self.in_range(start, end)}
+            free = [a for a in range(start, end + 1) if a not in used]
+            out.append(
+                {
+                    "range": [hex(start), hex(end)],
+                    "free_count": len(free),
+                    "used": sorted({n for _a, n, _k in self.in_range(start, end)}),
+                    "free": [[hex(a), hex(b)] for a, b in _runs(free)],
+                }
+            )
+        return out
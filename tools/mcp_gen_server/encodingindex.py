@@ -0,0 +1,292 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Bit-pattern index over instruction encodings
+
+Each encoding.match string (e.g. "0000000----------000-----0110011", most
+significant bit first, '-' for operand bits) is compiled into an integer mask
+of the fixed bits and the value of those bits. Instructions with RV32/RV64
+encodings get one entry per variant. Queries are bitwise operations over the
+mask/value arrays of all entries, vectorized with NumPy when it is installed:
+
+- decode a raw word: (word & mask) == value
+- compatible with a partial pattern (qmask, qvalue): the bits fixed by both
+  agree, ((value ^ qvalue) & mask & qmask) == 0
+- fixes a partial pattern: additionally every bit of qmask is fixed by the
+  encoding, (mask & qmask) == qmask
+"""
+
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from catalog import Catalog, Record
+
+# Bit locations are parsed by the generators' field compiler, so every tool agrees on them
+sys.path.append(str(Path(__file__).resolve().parents[2] / "backends" / "generators"))
+from insn_fields import compile_location
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fields of the base 32-bit and compressed 16-bit formats usable in constraints
+STANDARD_FIELDS = {
+    "opcode": "6-0",
+    "rd": "11-7",
+    "funct3": "14-12",
+    "rs1": "19-15",
+    "rs2": "24-20",
+    "funct7": "31-25",
+    "funct2": "26-25",
+    "funct5": "31-27",
+    "funct6": "31-26",
+    "rs3": "31-27",
+    "vm": "25",
+    "c.op": "1-0",
+    "c.funct3": "15-13",
+    "c.funct4": "15-12",
+}
+
+MODES = ("compatible", "fixed")
+
+
+def location_mask(segments: Iterable[tuple[int, int]]) -> int:
+    mask = 0
+    for hi, lo in segments:
+        mask |= ((1 << (hi - lo + 1)) - 1) << lo
+    return mask
+
+
+def extract(word: int, segments: Iterable[tuple[int, int]]) -> int:
+    """Concatenate the bits of word at segments (most significant first)."""
+    value = 0
+    for hi, lo in segments:
+        width = hi - lo + 1
+        value = (value << width) | ((word >> lo) & ((1 << width) - 1))
+    return value
+
+
+def deposit(value: int, segments: tuple[tuple[int, int], ...]) -> int:
+    """Inverse of extract: scatter value into the bits at segments."""
+    word = 0
+    for hi, lo in reversed(segments):
+        width = hi - lo + 1
+        word |= (value & ((1 << width) - 1)) << lo
+        value >>= width
+    return word
+
+
+def parse_match(match: str) -> tuple[int, int, int]:
+    """Compile an encoding.match string into (mask, value, width)."""
+    mask = value = 0
+    for c in match:
+        mask <<= 1
+        value <<= 1
+        if c in "01":
+            mask |= 1
+            value |= c == "1"
+        elif c != "-":
+            raise ValueError(f"Invalid character {c!r} in match {match!r}")
+    return mask, value, len(match)
+
+
+def parse_int(value: Any) -> int:
+    """
+    Integer argument: an int, or a string with a 0x/0b prefix. A bare string
+    of 0s and 1s is binary, as in encoding.match ("0110011").
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Expected an integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        s = value.strip().replace("_", "")
+        try:
+            if s and set(s) <= {"0", "1"}:
+                return int(s, 2)
+            return int(s, 0)
+        except ValueError:
+            pass
+    raise ValueError(f"Expected an integer, got {value!r}")
+
+
+def instruction_length(word: int) -> int | None:
+    """Length in bits of the instruction starting with word (standard length encoding)."""
+    if word & 0b11 != 0b11:
+        return 16
+    if (word >> 2) & 0b111 != 0b111:
+        return 32
+    if not (word >> 5) & 1:
+        return 48
+    if not (word >> 6) & 1:
+        return 64
+    return None
+
+
+def field_constraints(fields: dict[str, Any]) -> tuple[int, int]:
+    """
+    Compile {field: value} into (mask, value). Fields are STANDARD_FIELDS
+    names or bit locations ("14-12", "31-25|11-7", "25").
+    """
+    mask = value = 0
+    for name, raw in fields.items():
+        location = STANDARD_FIELDS.get(name, name)
+        segments = compile_location(location)
+        field_mask = location_mask(segments)
+        width = sum(hi - lo + 1 for hi, lo in segments)
+        v = parse_int(raw)
+        if not 0 <= v < 1 << width:
+            raise ValueError(f"Value {raw!r} does not fit in field {name!r} ({width} bits)")
+        bits = deposit(v, segments)
+        if (value ^ bits) & mask & field_mask:
+            raise ValueError(f"Constraint on {name!r} conflicts with another field")
+        mask |= field_mask
+        value |= bits
+    return mask, value
+
+
+class Variable:
+    __slots__ = ("left_shift", "name", "not_value", "segments", "sign_extend")
+
+    def __init__(self, spec: dict[str, Any]):
+        self.name = spec["name"]
+        self.segments = compile_location(spec["location"])
+        self.left_shift = int(spec.get("left_shift", 0))
+        self.sign_extend = bool(spec.get("sign_extend", False))
+        self.not_value = spec.get("not")
+
+    def decode(self, word: int) -> int:
+        raw = extract(word, self.segments)
+        if self.sign_extend:
+            width = sum(hi - lo + 1 for hi, lo in self.segments)
+            if raw >> (width - 1):
+                raw -= 1 << width
+        return raw << self.left_shift
+
+
+class Entry:
+    """One encoding (of one XLEN variant) shared by identical instruction records."""
+
+    __slots__ = ("mask", "match", "name", "records", "value", "variables", "variant", "width")
+
+    def __init__(self, rec: Record, variant: int | None, encoding: dict[str, Any]):
+        self.name = rec.name
+        self.variant = variant
+        self.match = encoding["match"]
+        self.mask, self.value, self.width = parse_match(self.match)
+        self.variables = [Variable(v) for v in encoding.get("variables") or [] if "location" in v]
+        self.records = [rec]
+
+    def operands(self, word: int) -> dict[str, int] | None:
+        """Operand values decoded from word, or None if a variable has its excluded value."""
+        out = {}
+        for var in self.variables:
+            if var.not_value is not None and extract(word, var.segments) == var.not_value:
+                return None
+            out[var.name] = var.decode(word)
+        return out
+
+
+def record_encodings(rec: Record) -> list[tuple[int | None, dict[str, Any]]]:
+    """(XLEN variant or None, encoding) pairs of an instruction record."""
+    enc = rec.data.get("encoding")
+    if not isinstance(enc, dict):
+        return []
+    if isinstance(enc.get("match"), str):
+        return [(None, enc)]
+    return [
+        (int(key[2:]), sub)
+        for key, sub in enc.items()
+        if key in ("RV32", "RV64") and isinstance(sub, dict) and isinstance(sub.get("match"), str)
+    ]
+
+
+class EncodingIndex:
+    """Integer mask/value arrays over every instruction encoding in a catalog."""
+
+    def __init__(self, catalog: Catalog):
+        self.generation = catalog.generation
+        self.entries: list[Entry] = []
+        seen: dict[tuple, Entry] = {}
+        for rec in catalog.domains["instructions"]:
+            for variant, enc in record_encodings(rec):
+                try:
+                    entry = Entry(rec, variant, enc)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                # gen/spec and gen/resolved_spec hold the same instructions
+                key = (entry.name, variant, entry.mask, entry.value, entry.width)
+                if key in seen:
+                    seen[key].records.append(rec)
+                    continue
+                seen[key] = entry
+                self.entries.append(entry)
+
+        masks = [e.mask for e in self.entries]
+        values = [e.value for e in self.entries]
+        spans = [(1 << e.width) - 1 for e in self.entries]
+        if np is not None:
+            self._masks = np.array(masks, dtype=np.uint64)
+            self._values = np.array(values, dtype=np.uint64)
+            self._spans = np.array(spans, dtype=np.uint64)
+        else:
+            self._masks, self._values, self._spans = masks, values, spans
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def decode(self, word: int, width: int | None = None) -> list[tuple[Entry, dict[str, int]]]:
+        """Entries whose encoding matches a raw instruction word, with decoded operands."""
+        width = width or instruction_length(word)
+        if width is None:
+            return []
+        word &= (1 << width) - 1
+        if np is not None:
+            hits = np.flatnonzero(
+                ((self._masks & np.uint64(word)) == self._values)
+                & (self._spans == np.uint64((1 << width) - 1))
+            ).tolist()
+        else:
+            span = (1 << width) - 1
+            hits = [
+                i
+                for i, (m, v, s) in enumerate(
+                    zip(self._masks, self._values, self._spans, strict=True)
+                )
+                if word & m == v and s == span
+            ]
+        out = []
+        for i in hits:
+            operands = self.entries[i].operands(word)
+            if operands is not None:
+                out.append((self.entries[i], operands))
+        # Most specific encoding first (e.g. c.nop before c.addi)
+        out.sort(key=lambda pair: -pair[0].mask.bit_count())
+        return out
+
+    def search(self, mask: int, value: int, mode: str = "compatible") -> list[Entry]:
+        """Entries compatible with, or fixing, the bits (mask, value)."""
+        if mode not in MODES:
+            raise ValueError(f"Invalid mode '{mode}'. Must be one of: {MODES}")
+        value &= mask
+        if np is not None:
+            qm, qv = np.uint64(mask), np.uint64(value)
+            ok = (((self._values ^ qv) & self._masks & qm) == 0) & ((self._spans & qm) == qm)
+            if mode == "fixed":
+                ok &= (self._masks & qm) == qm
+            hits = np.flatnonzero(ok).tolist()
+        else:
+            hits = [
+                i
+                for i, (m, v, s) in enumerate(
+                    zip(self._masks, self._values, self._spans, strict=True)
+                )
+                if not (v ^ value) & m & mask
+                and s & mask == mask
+                and (mode != "fixed" or m & mask == mask)
+            ]
+        return [self.entries[i] for i in hits]
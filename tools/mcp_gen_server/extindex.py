@@ -0,0 +1,124 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Reverse indexes from extensions to what they define, and extension closures
+
+For every extension name, the instructions, CSRs, parameters and exception
+codes whose definedBy names it are listed once (gen/spec and
+gen/resolved_spec hold the same objects; the first of a name in path order
+is kept, and records without a name are all kept).
+
+Extension relations come from the extension YAMLs:
+  implies   names of `implies` (top level or in any version)
+  requires  names that `requirements` always needs, i.e. those reached only
+            through extension/allOf (in any version)
+  optional  the other names of `requirements` (under anyOf/oneOf/not)
+The closure of an extension is everything reachable through implies and
+requires, and implied_by/required_by are the reverse edges; they are computed
+for all extensions when the index is built, so a detail response only copies
+precomputed lists.
+"""
+
+from typing import Any
+
+from catalog import Catalog, Record, condition_extensions
+
+MEMBER_DOMAINS = ("instructions", "csrs", "params", "exception_codes")
+
+
+def required_extensions(cond: Any, out: set[str]) -> None:
+    """Collect the names a condition cannot hold without (conjunctive terms only)."""
+    if isinstance(cond, str):
+        out.add(cond)
+    elif isinstance(cond, list):
+        for c in cond:
+            required_extensions(c, out)
+    elif isinstance(cond, dict):
+        name = cond.get("name")
+        if isinstance(name, str):
+            out.add(name)
+        for key in ("extension", "allOf"):
+            if key in cond:
+                required_extensions(cond[key], out)
+
+
+def _versioned(data: dict, key: str) -> list[Any]:
+    """A key of an extension at the top level and in each of its versions."""
+    values = [data[key]] if key in data else []
+    versions = data.get("versions")
+    if isinstance(versions, list):
+        values += [v[key] for v in versions if isinstance(v, dict) and key in v]
+    return values
+
+
+class ExtensionIndex:
+    """Per-extension members and relations over the records of a catalog."""
+
+    def __init__(self, catalog: Catalog):
+        self.generation = catalog.generation
+
+        # domain -> extension name -> records naming it, one per object name
+        self.members: dict[str, dict[str, list[Record]]] = {}
+        for domain in MEMBER_DOMAINS:
+            by_ext: dict[str, list[Record]] = {}
+            seen: set[str] = set()
+            for rec in catalog.domains[domain]:
+                # Unnamed records cannot be matched across trees; each file is its own object
+                key = rec.name or rec.rel
+                if key in seen:
+                    continue
+                seen.add(key)
+                for ext in rec.extensions:
+                    by_ext.setdefault(ext, []).append(rec)
+            self.members[domain] = by_ext
+
+        self.implies: dict[str, list[str]] = {}
+        self.requires: dict[str, list[str]] = {}
+        self.optional: dict[str, list[str]] = {}
+        for name, rec in catalog.extension_by_name.items():
+            implied: set[str] = set()
+            for value in _versioned(rec.data, "implies"):
+                condition_extensions(value, implied, set())
+            required: set[str] = set()
+            mentioned: set[str] = set()
+            for value in _versioned(rec.data, "requirements"):
+                required_extensions(value, required)
+                condition_extensions(value, mentioned, mentioned)
+            self.implies[name] = sorted(implied - {name})
+            self.requires[name] = sorted(required - {name})
+            self.optional[name] = sorted(mentioned - required - {name})
+
+        self.closure: dict[str, list[str]] = {name: self._reach(name) for name in self.implies}
+        self.implied_by: dict[str, list[str]] = {}
+        self.required_by: dict[str, list[str]] = {}
+        for name in sorted(self.implies):
+            for other in self.implies[name]:
+                self.implied_by.setdefault(other, []).append(name)
+            for other in self.requires[name]:
+                self.required_by.setdefault(other, []).append(name)
+
+    def _reach(self, name: str) -> list[str]:
+        seen = {name}
+        stack = [name]
+        while stack:
+            cur = stack.pop()
+            for nxt in (*self.implies.get(cur, ()), *self.requires.get(cur, ())):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        seen.discard(name)
+        return sorted(seen)
+
+    def records(self, domain: str, ext: str) -> list[Record]:
+        return self.members[domain].get(ext, [])
+
+    def relations(self, name: str) -> dict[str, list[str]]:
+        return {
+            "implies": self.implies.get(name, []),
+            "requires": self.requires.get(name, []),
+            "optional": self.optional.get(name, []),
+            "closure": self.closure.get(name, []),
+            "implied_by": self.implied_by.get(name, []),
+            "required_by": self.required_by.get(name, []),
+        }
@@ -0,0 +1,197 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Index of the IDL function documentation in gen/cfg_html_doc
+
+funcs.adoc has one "== name" section per function. The file is scanned once
+for section boundaries into {name: (offset, length)} and mapped with mmap;
+a section is then a slice of the mapping, so a lookup does not depend on the
+size of the file. The boundaries are saved next to the other caches, keyed by
+the SHA-256 of the file, and reused while the file is unchanged.
+
+A FuncDocs replaced by a newer one is retired: its mapping is closed when the
+last request using it releases it.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+INDEX_VERSION = 1
+
+# "== name" section headings (level 2), as split by the original parser
+HEADING_RE = re.compile(rb"^==\s+", re.M)
+WHITESPACE = b" \t\n\r\f\v"
+
+
+def find_doc_files(cfg_root: Path) -> tuple[Path | None, Path | None]:
+    """Locate funcs.adoc (antora/modules/funcs/pages) and all_funcs.adoc (adoc/funcs)."""
+    funcs_doc = None
+    all_funcs = None
+    if not cfg_root.exists():
+        return None, None
+    for root, _dirs, _files in os.walk(cfg_root):
+        root_p = Path(root)
+        # prefer antora/modules/funcs/pages/funcs.adoc
+        if root_p.name == "pages" and "funcs" in root_p.parts and "modules" in root_p.parts:
+            cand = root_p / "funcs.adoc"
+            if cand.exists():
+                funcs_doc = cand
+        if root_p.name == "funcs" and root_p.parent.name == "adoc":
+            cand_all = root_p / "all_funcs.adoc"
+            if cand_all.exists():
+                all_funcs = cand_all
+    return funcs_doc, all_funcs
+
+
+@functools.lru_cache(maxsize=256)
+def needle_pattern(needle: str) -> re.Pattern[bytes]:
+    """Case-insensitive (ASCII) pattern of a literal search term."""
+    return re.compile(re.escape(needle.encode()), re.IGNORECASE)
+
+
+def file_hash(data: bytes | mmap.mmap) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def scan_sections(data: bytes | mmap.mmap) -> dict[str, tuple[int, int]]:
+    """
+    {function name: (offset, length)} of the section bodies of funcs.adoc.
+
+    A body runs from the line after its heading to the next heading, without
+    surrounding whitespace; a repeated name keeps its last section.
+    """
+    sections: dict[str, tuple[int, int]] = {}
+    headings = list(HEADING_RE.finditer(data))
+    for i, heading in enumerate(headings):
+        start = heading.end()
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(data)
+        eol = data.find(b"\n", start, end)
+        header = bytes(data[start : eol if eol != -1 else end]).split()
+        if not header:
+            continue
+        body_start = eol + 1 if eol != -1 else end
+        body_end = end
+        while body_start < body_end and data[body_start] in WHITESPACE:
+            body_start += 1
+        while body_end > body_start and data[body_end - 1] in WHITESPACE:
+            body_end -= 1
+        sections[header[0].decode("utf-8", "replace")] = (body_start, body_end - body_start)
+    return sections
+
+
+class FuncDocs:
+    """funcs.adoc mapped in memory with its section index."""
+
+    def __init__(self, path: Path, cache_path: Path | None = None):
+        self.path = path
+        st = path.stat()
+        self.stamp = (st.st_size, st.st_mtime_ns)
+        self._file = open(path, "rb")  # noqa: SIM115 - kept open for the mapping
+        # mmap cannot map an empty file
+        self._data: mmap.mmap | bytes = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b""
+        )
+        self.sha256 = file_hash(self._data)
+        self._users = 0
+        self._retired = False
+        self._users_lock = threading.Lock()
+
+        cached = self._load(cache_path) if cache_path else None
+        if cached is None:
+            self.sections = scan_sections(self._data)
+            if cache_path:
+                # A read-only gen/ only costs a rescan next time
+                with contextlib.suppress(OSError):
+                    self._save(cache_path)
+        else:
+            self.sections = cached
+
+    def _load(self, cache_path: Path) -> dict[str, tuple[int, int]] | None:
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != INDEX_VERSION or payload.get("sha256") != self.sha256:
+            return None
+        return {name: (off, length) for name, (off, length) in payload["sections"].items()}
+
+    def _save(self, cache_path: Path) -> None:
+        payload = {"version": INDEX_VERSION, "sha256": self.sha256, "sections": self.sections}
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{cache_path.name}.", suffix=".tmp", dir=cache_path.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def is_current(self) -> bool:
+        """Whether the file on disk is still the one that was indexed."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == self.stamp
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def acquire(self) -> None:
+        """Register a user; the mapping stays open until it calls release()."""
+        with self._users_lock:
+            self._users += 1
+
+    def release(self) -> None:
+        with self._users_lock:
+            self._users -= 1
+            unused = self._retired and self._users == 0
+        if unused:
+            self.close()
+
+    def retire(self) -> None:
+        """Close the mapping once no user holds it (right away if none does)."""
+        with self._users_lock:
+            self._retired = True
+            unused = self._users == 0
+        if unused:
+            self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def doc(self, name: str) -> str | None:
+        """Body of a function's section, or None."""
+        span = self.sections.get(name)
+        if span is None:
+            return None
+        off, length = span
+        text = self._data[off : off + length].decode("utf-8", "replace")
+        return text.replace("\r\n", "\n") if "\r" in text else text
+
+    def snippet(self, name: str, size: int = 300) -> str | None:
+        off, length = self.sections[name]
+        if not length:
+            return None
+        # Cut at a byte boundary, then drop a split multi-byte character
+        text = self._data[off : off + min(length, size * 4)].decode("utf-8", "ignore")
+        return (text.replace("\r\n", "\n") if "\r" in text else text)[:size]
+
+    def body_contains(self, name: str, needle: str) -> bool:
+        """Case-insensitive substring test within a section, searched in the mapping."""
+        off, length = self.sections[name]
+        return needle_pattern(needle).search(self._data, off, off + length) is not None
@@ -0,0 +1,246 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Typo-tolerant name lookup
+
+Scores follow the rules the MCP tools have always used: 1.0 for an exact
+(case-insensitive) match, 0.9 when the query is a substring of the target,
+otherwise the normalized Levenshtein similarity 1 - distance / max(len).
+
+FuzzyIndex answers "which names are within a similarity threshold of this
+query" without computing a full edit distance against every name. The
+threshold bounds the allowed distance, and with it the target length. Targets
+are then pruned by the number of shared trigrams (each edit destroys at most
+three) and by the characters they lack, and the survivors are checked with a
+bit-parallel edit distance (Myers/Hyyrö) that processes the whole query per
+target character using the query's precomputed character bitmasks.
+"""
+
+import heapq
+import math
+from collections.abc import Iterable, Sequence
+
+# Similarity threshold used when fuzzy matching is enabled without a value
+DEFAULT_THRESHOLD = 0.6
+
+EXACT_SCORE = 1.0
+SUBSTRING_SCORE = 0.9
+
+
+def bounded_distance(a: str, b: str, k: int) -> int | None:
+    """Levenshtein distance between a and b if it is at most k, else None."""
+    if len(a) > len(b):
+        a, b = b, a
+    la, lb = len(a), len(b)
+    if lb - la > k:
+        return None
+    over = k + 1
+    prev = [j if j <= k else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo = max(1, i - k)
+        hi = min(lb, i + k)
+        cur = [over] * (lb + 1)
+        cur[0] = i if i <= k else over
+        row_min = cur[0] if lo == 1 else over
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            if v > over:
+                v = over
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > k:
+            return None
+        prev = cur
+    return prev[lb] if prev[lb] <= k else None
+
+
+class BitDistance:
+    """Bit-parallel Levenshtein distance from a fixed query to many targets."""
+
+    def __init__(self, query: str):
+        self.length = len(query)
+        self.mask = (1 << self.length) - 1
+        self.high = 1 << (self.length - 1) if query else 0
+        self.peq: dict[str, int] = {}
+        for i, c in enumerate(query):
+            self.peq[c] = self.peq.get(c, 0) | (1 << i)
+
+    def __call__(self, target: str) -> int:
+        if not self.length:
+            return len(target)
+        mask, high, peq = self.mask, self.high, self.peq
+        vp, vn, score = mask, 0, self.length
+        for c in target:
+            eq = peq.get(c, 0)
+            xv = eq | vn
+            xh = ((((eq & vp) + vp) & mask) ^ vp) | eq
+            ph = vn | (~(xh | vp) & mask)
+            mh = vp & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            vp = mh | (~(xv | ph) & mask)
+            vn = ph & xv
+        return score
+
+
+def similarity(query: str, target: str) -> float:
+    """Fuzzy match score of target for query (0-1, higher is better)."""
+    if not query or not target:
+        return 0.0
+    q = query.lower()
+    t = target.lower()
+    if q == t:
+        return EXACT_SCORE
+    if q in t:
+        return SUBSTRING_SCORE
+    max_len = max(len(q), len(t))
+    return 1.0 - bounded_distance(q, t, max_len) / max_len
+
+
+def _trigrams(s: str) -> set[str]:
+    padded = f"\x02\x02{s}\x03\x03"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _char_mask(s: str) -> int:
+    # Characters are hashed onto 64 bits; collisions only weaken the bound
+    mask = 0
+    for c in s:
+        mask |= 1 << (ord(c) & 63)
+    return mask
+
+
+def _rank(pair: tuple[int, float]) -> tuple[float, int]:
+    return (-pair[1], pair[0])
+
+
+class FuzzyIndex:
+    """
+    Index over the names of a list of items.
+
+    Each item has one or more names (e.g. an instruction's name, assembly
+    and file stem); an item matches when any of its names does, and scores
+    as its best name.
+    """
+
+    def __init__(self, item_names: Iterable[Sequence[str]]):
+        self.strings: list[str] = []
+        self.owners: list[list[int]] = []
+        self.masks: list[int] = []
+        self.by_length: dict[int, list[int]] = {}
+        self.grams: dict[str, list[int]] = {}
+
+        ids: dict[str, int] = {}
+        for item, names in enumerate(item_names):
+            for name in names:
+                if not isinstance(name, str) or not name:
+                    continue
+                s = name.lower()
+                sid = ids.get(s)
+                if sid is None:
+                    sid = ids[s] = len(self.strings)
+                    self.strings.append(s)
+                    self.owners.append([])
+                    self.masks.append(_char_mask(s))
+                    self.by_length.setdefault(len(s), []).append(sid)
+                    for g in _trigrams(s):
+                        self.grams.setdefault(g, []).append(sid)
+                if not self.owners[sid] or self.owners[sid][-1] != item:
+                    self.owners[sid].append(item)
+
+    def _substring_ids(self, q: str) -> list[int]:
+        if len(q) < 3:
+            return [sid for sid, s in enumerate(self.strings) if q in s]
+        # Every trigram of the query must occur in the target
+        postings = sorted((self.grams.get(q[i : i + 3], []) for i in range(len(q) - 2)), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [sid for sid in candidates if q in self.strings[sid]]
+
+    def match_strings(self, query: str, threshold: float = DEFAULT_THRESHOLD) -> dict[int, float]:
+        """Return {string id: score} for every indexed string that matches query."""
+        q = query.lower()
+        if not q:
+            return {}
+        scores = {
+            sid: EXACT_SCORE if self.strings[sid] == q else SUBSTRING_SCORE
+            for sid in self._substring_ids(q)
+        }
+
+        lq = len(q)
+        if threshold > 1:
+            lengths = []
+        elif threshold <= 0:
+            lengths = list(self.by_length)
+        else:
+            lengths = [
+                n
+                for n in range(
+                    math.ceil(lq * threshold - 1e-9), math.floor(lq / threshold + 1e-9) + 1
+                )
+                if n in self.by_length
+            ]
+        if not lengths:
+            return scores
+
+        q_grams = _trigrams(q)
+        shared: dict[int, int] = {}
+        for g in q_grams:
+            for sid in self.grams.get(g, ()):
+                shared[sid] = shared.get(sid, 0) + 1
+        q_mask = _char_mask(q)
+        distance = BitDistance(q)
+
+        for n in lengths:
+            max_len = max(lq, n)
+            k = math.floor((1.0 - threshold) * max_len + 1e-9)
+            need = len(q_grams) - 3 * k
+            bucket = (
+                self.by_length[n]
+                if need <= 0
+                else (sid for sid in self.by_length[n] if shared.get(sid, 0) >= need)
+            )
+            for sid in bucket:
+                if sid in scores:
+                    continue
+                s_mask = self.masks[sid]
+                if (q_mask & ~s_mask).bit_count() > k or (s_mask & ~q_mask).bit_count() > k:
+                    continue
+                d = distance(self.strings[sid])
+                if d <= k:
+                    scores[sid] = EXACT_SCORE if d == 0 else 1.0 - d / max_len
+        return scores
+
+    def search(
+        self, query: str, threshold: float = DEFAULT_THRESHOLD, limit: int | None = None
+    ) -> list[tuple[int, float]]:
+        """
+        Return (item, score) pairs for items with a name matching query.
+
+        Best scores come first (ties in item order); with a limit, only the top
+        `limit` items are returned.
+        """
+        best: dict[int, float] = {}
+        for sid, score in self.match_strings(query, threshold).items():
+            for item in self.owners[sid]:
+                if score > best.get(item, -1.0):
+                    best[item] = score
+        if limit is not None and limit < len(best):
+            return heapq.nsmallest(limit, best.items(), key=_rank)
+        return sorted(best.items(), key=_rank)
@@ -0,0 +1,79 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Streamable HTTP transport
+
+Serves the MCP server at http://<host>:<port>/mcp with the SDK's
+StreamableHTTPSessionManager (responses are streamed as SSE), mounted in a
+Starlette app run by uvicorn. All clients share the one process, so the
+catalog and every index are built once. Requires the optional `starlette`
+and `uvicorn` packages (both come with `mcp[cli]`).
+"""
+
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from mcp.server.lowlevel.server import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.server.transport_security import TransportSecuritySettings
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MCP_PATH = "/mcp"
+
+log = logging.getLogger(__name__)
+
+
+def client_id(request: Any) -> str:
+    """Rate-limit key of an HTTP request: its MCP session, else the peer address."""
+    session = request.headers.get("mcp-session-id")
+    if session:
+        return f"session:{session}"
+    return f"addr:{request.client.host}" if request.client else "addr:unknown"
+
+
+class _MCPEndpoint:
+    """ASGI endpoint for the session manager (Route only treats non-functions as ASGI apps)."""
+
+    def __init__(self, manager: StreamableHTTPSessionManager):
+        self.manager = manager
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.manager.handle_request(scope, receive, send)
+
+
+def _security(host: str, port: int) -> TransportSecuritySettings:
+    # Reject requests whose Host/Origin is not this address (DNS rebinding)
+    hosts = {host, "127.0.0.1", "localhost"} if host in ("127.0.0.1", "localhost") else {host}
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=[f"{h}:{port}" for h in sorted(hosts)],
+        allowed_origins=[f"http://{h}:{port}" for h in sorted(hosts)],
+    )
+
+
+async def serve_http(server: Server, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Serve `server` over streamable HTTP until cancelled."""
+    try:
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+    except ImportError as e:
+        raise SystemExit(
+            f"The HTTP transport needs starlette and uvicorn ({e}); pip install 'mcp[cli]'"
+        ) from e
+
+    manager = StreamableHTTPSessionManager(app=server, security_settings=_security(host, port))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app: Starlette) -> AsyncIterator[None]:
+        async with manager.run():
+            log.info("Serving MCP on http://%s:%d%s", host, port, MCP_PATH)
+            yield
+
+    app = Starlette(routes=[Route(MCP_PATH, endpoint=_MCPEndpoint(manager))], lifespan=lifespan)
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    await uvicorn.Server(config).serve()
@@ -0,0 +1,126 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Request latency histograms and per-client rate limiting
+
+Latencies are counted in fixed millisecond buckets per tool, so recording is
+O(1) and percentiles are estimated from the bucket bounds. Rate limits are
+token buckets per client: each client may burst up to `burst` calls and is
+refilled at `rate` calls per second.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any
+
+# Upper bounds (ms) of the latency buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "errors", "max_ms", "total_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, p: float) -> float | None:
+        """Upper bound of the bucket holding the p-th percentile, capped at max_ms."""
+        n = sum(self.counts)
+        if not n:
+            return None
+        rank = p / 100 * n
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if i < len(LATENCY_BUCKETS_MS):
+                    return min(float(LATENCY_BUCKETS_MS[i]), round(self.max_ms, 3))
+                return round(self.max_ms, 3)
+        return self.max_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        n = sum(self.counts)
+        bounds = [f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": n,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / n, 3) if n else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets_ms": {b: c for b, c in zip(bounds, self.counts, strict=True) if c},
+        }
+
+
+class LatencyHistograms:
+    """Thread-safe latency histograms keyed by tool name."""
+
+    def __init__(self):
+        self._by_tool: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, ms: float, error: bool = False) -> None:
+        with self._lock:
+            hist = self._by_tool.get(tool)
+            if hist is None:
+                hist = self._by_tool[tool] = LatencyHistogram()
+            hist.record(ms, error)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {tool: hist.snapshot() for tool, hist in sorted(self._by_tool.items())}
+
+
+class RateLimiter:
+    """Token bucket per client; rate <= 0 disables limiting."""
+
+    # Clients idle for this long are forgotten
+    IDLE_SECONDS = 600.0
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def allow(self, client: str) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(client, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            else:
+                self.rejected += 1
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > 1024:
+                self._buckets = {
+                    c: v for c, v in self._buckets.items() if now - v[1] < self.IDLE_SECONDS
+                }
+            return allowed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "clients": len(self._buckets),
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,129 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Cursor pagination over ranked search results
+
+A search ranks every match once and returns the first page. When more
+matches remain, the full ranked list is kept in memory and the response
+carries an opaque cursor; passing the cursor back returns the next page from
+that list without searching again. Result sets are bound to the catalog
+generation they were computed from, expire after a while, and only the most
+recent ones are kept.
+"""
+
+import base64
+import binascii
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Result sets kept for follow-up pages, and how long (seconds) they stay valid
+MAX_RESULT_SETS = 64
+RESULT_SET_TTL = 600.0
+
+
+class CursorError(ValueError):
+    """Raised for a malformed, expired or stale cursor."""
+
+
+def encode_cursor(set_id: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{set_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        set_id, offset = raw.rsplit(":", 1)
+        return set_id, int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorError("Invalid cursor") from None
+
+
+class ResultSet:
+    __slots__ = ("created", "extra", "generation", "results", "tool")
+
+    def __init__(self, tool: str, generation: int, results: list[Any], extra: dict[str, Any]):
+        self.tool = tool
+        self.generation = generation
+        self.results = results
+        self.extra = extra
+        self.created = time.monotonic()
+
+
+class ResultSets:
+    """Bounded, thread-safe store of ranked result lists addressed by cursors."""
+
+    def __init__(self, max_sets: int = MAX_RESULT_SETS, ttl: float = RESULT_SET_TTL):
+        self.max_sets = max_sets
+        self.ttl = ttl
+        self._sets: OrderedDict[str, ResultSet] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        # Sets are kept in creation order: drop from the oldest end
+        while self._sets:
+            set_id, rs = next(iter(self._sets.items()))
+            if now - rs.created < self.ttl and len(self._sets) <= self.max_sets:
+                break
+            del self._sets[set_id]
+
+    def _page(self, set_id: str, rs: ResultSet, offset: int, limit: int) -> dict[str, Any]:
+        page = rs.results[offset : offset + limit]
+        end = offset + len(page)
+        return {
+            "count": len(page),
+            "total": len(rs.results),
+            "results": page,
+            "next_cursor": encode_cursor(set_id, end) if end < len(rs.results) else None,
+            **rs.extra,
+        }
+
+    def first_page(
+        self,
+        tool: str,
+        generation: int,
+        results: list[Any],
+        limit: int,
+        extra: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return the first `limit` results, keeping the rest for follow-up pages.
+
+        `extra` holds response fields repeated on every page (e.g. search_mode).
+        """
+        rs = ResultSet(tool, generation, results, extra or {})
+        if len(results) <= limit:
+            return self._page("", rs, 0, limit)
+        set_id = secrets.token_urlsafe(9)
+        with self._lock:
+            self._sets[set_id] = rs
+            self._expire(time.monotonic())
+        return self._page(set_id, rs, 0, limit)
+
+    def next_page(self, tool: str, cursor: str, generation: int, limit: int) -> dict[str, Any]:
+        """Return the page starting at a cursor from a previous response of `tool`."""
+        set_id, offset = decode_cursor(cursor)
+        with self._lock:
+            self._expire(time.monotonic())
+            rs = self._sets.get(set_id)
+        if rs is None or rs.tool != tool or not 0 <= offset <= len(rs.results):
+            raise CursorError("Cursor is unknown or has expired; repeat the search")
+        if rs.generation != generation:
+            raise CursorError("gen/ changed since the search; repeat it to get a new cursor")
+        return self._page(set_id, rs, offset, limit)
+
+    def alive(self, cursor: str) -> bool:
+        """Whether next_page can still serve a cursor (ignoring the catalog generation)."""
+        try:
+            set_id, _offset = decode_cursor(cursor)
+        except CursorError:
+            return False
+        with self._lock:
+            rs = self._sets.get(set_id)
+            return rs is not None and time.monotonic() - rs.created < self.ttl
+
+    def __len__(self) -> int:
+        return len(self._sets)
@@ -0,0 +1,191 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Partial reads of parsed YAML documents
+
+Paths select parts of a document, either dotted ("fields.FS.location_rv64")
+or as a JSONPath subset: "$" root, ".name" or "['name']" keys, "[0]"
+indexes, "*" / "[*]" wildcards and ".." recursive descent ("$..location").
+Each match is reported under its concrete path.
+
+Results can then be bounded: below max_depth, containers are replaced by a
+summary such as "<dict: 12 keys>"; beyond max_bytes (of compact JSON), long
+strings are cut and remaining keys/items are omitted, and the omitted paths
+are reported.
+"""
+
+import json
+import re
+from typing import Any
+
+NAME_RE = re.compile(r"[^.\[\]]+")
+PLAIN_KEY_RE = re.compile(r"^[^.\[\]'\"\s]+$")
+
+# Bytes kept back for the closing of a cut container
+MIN_BUDGET = 16
+
+
+class PathError(ValueError):
+    """Raised for a malformed path expression."""
+
+
+def parse_path(expr: str) -> list[tuple[str, Any]]:
+    """
+    Compile a path into steps: ("key", name), ("index", i), ("wild", None),
+    ("desc", name or None).
+    """
+    s = expr.strip()
+    if not s:
+        raise PathError("Empty path")
+    steps: list[tuple[str, Any]] = []
+    if s == "$" or s.startswith(("$.", "$[")):
+        pos = 1
+    else:
+        # Dotted form: the first name needs no leading dot ("$schema" is a key)
+        m = NAME_RE.match(s)
+        if m is None:
+            raise PathError(f"Invalid path {expr!r}")
+        steps.append(("wild", None) if m.group() == "*" else ("key", m.group()))
+        pos = m.end()
+
+    while pos < len(s):
+        if s.startswith("..", pos):
+            pos += 2
+            if s.startswith("[", pos):
+                step, pos = _bracket(s, pos, expr)
+                if step[0] not in ("key", "wild"):
+                    raise PathError(f"Recursive descent needs a name in {expr!r}")
+            else:
+                m = NAME_RE.match(s, pos)
+                if m is None:
+                    raise PathError(f"Expected a name after '..' in {expr!r}")
+                step = ("wild", None) if m.group() == "*" else ("key", m.group())
+                pos = m.end()
+            steps.append(("desc", step[1]))
+        elif s[pos] == ".":
+            m = NAME_RE.match(s, pos + 1)
+            if m is None:
+                raise PathError(f"Expected a name after '.' in {expr!r}")
+            steps.append(("wild", None) if m.group() == "*" else ("key", m.group()))
+            pos = m.end()
+        elif s[pos] == "[":
+            step, pos = _bracket(s, pos, expr)
+            steps.append(step)
+        else:
+            raise PathError(f"Unexpected {s[pos]!r} at {pos} in {expr!r}")
+    return steps
+
+
+def _bracket(s: str, pos: int, expr: str) -> tuple[tuple[str, Any], int]:
+    end = s.find("]", pos)
+    if end == -1:
+        raise PathError(f"Unclosed '[' in {expr!r}")
+    inner = s[pos + 1 : end].strip()
+    if inner == "*":
+        return ("wild", None), end + 1
+    if len(inner) >= 2 and inner[0] == inner[-1] and inner[0] in "'\"":
+        return ("key", inner[1:-1]), end + 1
+    try:
+        return ("index", int(inner)), end + 1
+    except ValueError:
+        raise PathError(f"Invalid subscript [{inner}] in {expr!r}") from None
+
+
+def _child_path(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    key = str(key)
+    return f"{path}.{key}" if PLAIN_KEY_RE.match(key) else f"{path}[{json.dumps(key)}]"
+
+
+def _children(value: Any):
+    if isinstance(value, dict):
+        return value.items()
+    if isinstance(value, list):
+        return enumerate(value)
+    return ()
+
+
+def _descendants(path: str, value: Any):
+    """(path, value) of value and everything below it, depth first."""
+    yield path, value
+    for key, child in _children(value):
+        yield from _descendants(_child_path(path, key), child)
+
+
+def select(doc: Any, steps: list[tuple[str, Any]]) -> list[tuple[str, Any]]:
+    """(concrete path, value) of every match of compiled steps in doc."""
+    current = [("$", doc)]
+    for kind, arg in steps:
+        nxt: list[tuple[str, Any]] = []
+        for path, value in current:
+            if kind == "key":
+                if isinstance(value, dict) and arg in value:
+                    nxt.append((_child_path(path, arg), value[arg]))
+            elif kind == "index":
+                if isinstance(value, list) and -len(value) <= arg < len(value):
+                    i = arg % len(value)
+                    nxt.append((_child_path(path, i), value[i]))
+            elif kind == "wild":
+                nxt.extend((_child_path(path, k), v) for k, v in _children(value))
+            else:
+                for dpath, dvalue in _descendants(path, value):
+                    for k, v in _children(dvalue):
+                        if arg is None or (isinstance(dvalue, dict) and k == arg):
+                            nxt.append((_child_path(dpath, k), v))
+        current = nxt
+    return current
+
+
+def limit_depth(value: Any, max_depth: int, depth: int = 0) -> Any:
+    """Replace containers deeper than max_depth by a short summary string."""
+    if isinstance(value, dict):
+        if depth >= max_depth:
+            return f"<dict: {len(value)} keys>"
+        return {k: limit_depth(v, max_depth, depth + 1) for k, v in value.items()}
+    if isinstance(value, list):
+        if depth >= max_depth:
+            return f"<list: {len(value)} items>"
+        return [limit_depth(v, max_depth, depth + 1) for v in value]
+    return value
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def limit_bytes(value: Any, budget: int, path: str, omitted: list[str]) -> tuple[Any, int]:
+    """
+    Cut value to about `budget` bytes of compact JSON; returns (value, size).
+    Paths of dropped keys/items and cut strings are appended to omitted.
+    """
+    size = _size(value)
+    if size <= budget:
+        return value, size
+    if isinstance(value, str):
+        keep = max(0, budget - 40)
+        omitted.append(path)
+        cut = f"{value[:keep]}...[{len(value) - keep} more chars]"
+        return cut, _size(cut)
+    if not isinstance(value, dict | list):
+        omitted.append(path)
+        return None, 4
+
+    is_dict = isinstance(value, dict)
+    out: Any = {} if is_dict else []
+    used = 2
+    items = list(_children(value))
+    for n, (key, child) in enumerate(items):
+        cost = (_size(str(key)) + 1 if is_dict else 0) + (1 if n else 0)
+        remaining = budget - used - cost
+        if remaining < MIN_BUDGET:
+            omitted.extend(_child_path(path, k) for k, _v in items[n:])
+            break
+        cut, child_size = limit_bytes(child, remaining, _child_path(path, key), omitted)
+        if is_dict:
+            out[key] = cut
+        else:
+            out.append(cut)
+        used += cost + child_size
+    return out, used
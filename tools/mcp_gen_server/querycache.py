@@ -0,0 +1,127 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Cache of tool responses
+
+Responses are keyed by tool name, normalized arguments, catalog generation
+and a stamp of the other files the tool reads (funcs.adoc, isa/), so a
+refresh of gen/ or an edit of those files makes every older entry
+unreachable (they age out through the LRU order). Each entry is stored with its size, the byte
+length of the serialized response. The cache is bounded by entry count and
+total bytes, and entries expire after a time-to-live.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: _normalize(v)
+            for k, v in sorted(value.items())
+            if v is not None and v != [] and v != ""
+        }
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(
+    tool: str, args: dict[str, Any], generation: int, stamp: tuple = ()
+) -> tuple[str, str, int, tuple]:
+    """
+    Key of a tool call.
+
+    Arguments are compared after sorting keys and dropping unset values (None,
+    empty list or string), which every tool treats like a missing argument.
+    stamp identifies the files outside the catalog that the answer depends on.
+    """
+    normalized = json.dumps(_normalize(args), sort_keys=True, separators=(",", ":"), default=str)
+    return (tool, normalized, generation, stamp)
+
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL, entry and byte bounds, and hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (stored at, size, value)
+        self._entries: OrderedDict[tuple, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key: tuple) -> None:
+        _stored, size, _value = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: tuple) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: tuple, value: Any, size: int) -> None:
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key: tuple) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -13,6 +13,10 @@ Provides tools for querying:
 - Instructions, CSRs, Extensions
 - IDL Functions and their usages
 
+All instruction, CSR and extension YAMLs are parsed once at startup into an
+in-memory catalog (see catalog.py); tool calls are answered from its indexes.
+A background task (see watcher.py) re-indexes files as gen/ is regenerated.
+
 Enhanced features:
 - Regex search support
 - Fuzzy matching for typo-tolerant searches
@@ -21,18 +25,38 @@ Enhanced features:
 - Combined multi-domain queries
 """
 
+import argparse
 import asyncio
 import contextlib
+import contextvars
+import functools
 import json
 import os
 import re
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-import yaml
+from callgraph import CallGraph, isa_files, isa_stamp
+from catalog import Catalog, Record, load_yaml
+from csrspace import CUSTOM_CSR_RANGES, CsrSpace, parse_bits
+from encodingindex import MODES, EncodingIndex, field_constraints, parse_int, parse_match
+from extindex import ExtensionIndex
+from funcdocs import FuncDocs, find_doc_files
+from fuzzy import DEFAULT_THRESHOLD, FuzzyIndex, similarity
+from httptransport import DEFAULT_HOST, DEFAULT_PORT, client_id, serve_http
 from mcp.server.lowlevel.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
+from metrics import LatencyHistograms, RateLimiter
+from pagination import ResultSets
+from projection import limit_bytes, limit_depth, parse_path, select
+from querycache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, DEFAULT_TTL, QueryCache, cache_key
+from textindex import FIELD_GROUPS, TextIndex, document_fields, snippet
+from watcher import watch_catalog
 
 # ============================================================================
 # Constants and Configuration
@@ -41,92 +65,117 @@ from mcp.types import TextContent, Tool
 REPO_ROOT = Path(__file__).resolve().parents[2]
 GEN_DIR = REPO_ROOT / "gen"
 
+# Indexes derived from gen/ are cached here between server runs
+CACHE_DIR = GEN_DIR / ".mcp_cache"
 
-# ============================================================================
-# Fuzzy Matching Utilities
-# ============================================================================
+# Default deadline of a search_all request, in seconds
+SEARCH_ALL_TIMEOUT = 30.0
 
+# Bounds of the tool response cache; MCP_QUERY_CACHE_ENTRIES=0 disables it
+QUERY_CACHE_ENTRIES = int(os.environ.get("MCP_QUERY_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES))
+QUERY_CACHE_BYTES = int(
+    float(os.environ.get("MCP_QUERY_CACHE_MB", DEFAULT_MAX_BYTES / 2**20)) * 2**20
+)
+QUERY_CACHE_TTL = float(os.environ.get("MCP_QUERY_CACHE_TTL", DEFAULT_TTL))
 
-def _levenshtein_distance(s1: str, s2: str) -> int:
-    """Calculate Levenshtein distance between two strings."""
-    if len(s1) < len(s2):
-        return _levenshtein_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
+# Tools whose responses are not cached
+UNCACHED_TOOLS = {"server_stats"}
 
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+# Tools that read files outside the catalog (funcs.adoc, isa/); their cached
+# responses are keyed on the stamps of those files as well
+FUNC_DOC_TOOLS = {"search_functions", "read_function_doc"}
+CALL_GRAPH_TOOLS = {"find_function_usages", "function_call_graph"}
 
-    return previous_row[-1]
+# Tool calls served at once (and worker threads); more calls wait for a free slot
+DEFAULT_WORKERS = 8
 
+# Per-client tool call rate over HTTP (calls/second and burst); 0 disables the limit
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_BURST = 40
 
-def _fuzzy_match(query: str, target: str, threshold: float = 0.6) -> bool:
-    """
-    Check if query fuzzy matches target.
 
-    Args:
-        query: search string
-        target: string to match against
-        threshold: similarity threshold (0-1), default 0.6
+# ============================================================================
+# Fuzzy Matching Utilities
+# ============================================================================
 
-    Returns:
-        True if similarity >= threshold
-    """
-    if not query or not target:
-        return False
 
-    query_lower = query.lower()
-    target_lower = target.lower()
+def _fuzzy_threshold(fuzzy: Any) -> float:
+    """Threshold for a 'fuzzy' argument: a number in 0-1, or true for the default."""
+    if isinstance(fuzzy, (int, float)) and not isinstance(fuzzy, bool):
+        return float(fuzzy)
+    return DEFAULT_THRESHOLD
 
-    # Exact substring match always passes
-    if query_lower in target_lower:
-        return True
 
-    # Calculate similarity
-    max_len = max(len(query_lower), len(target_lower))
-    if max_len == 0:
-        return True
+def _record_fuzzy_score(rec: Record, term: str, fuzzy_scores: dict[int, float] | None) -> float:
+    """Score from the fuzzy index, or computed directly for rows matched another way."""
+    score = fuzzy_scores.get(id(rec)) if fuzzy_scores is not None else None
+    if score is None:
+        score = max((similarity(term, n) for n in rec.fuzzy_names()), default=0.0)
+    return score
 
-    distance = _levenshtein_distance(query_lower, target_lower)
-    similarity = 1.0 - (distance / max_len)
 
-    return similarity >= threshold
+# ============================================================================
+# Utility Functions
+# ============================================================================
 
 
-def _fuzzy_score(query: str, target: str) -> float:
-    """Calculate fuzzy match score (0-1, higher is better)."""
-    if not query or not target:
-        return 0.0
+class SearchCancelled(Exception):
+    """Raised inside a worker thread when its search request was cancelled."""
 
-    query_lower = query.lower()
-    target_lower = target.lower()
 
-    # Exact match bonus
-    if query_lower == target_lower:
-        return 1.0
+def _check_cancelled(cancel: threading.Event | None) -> None:
+    if cancel is not None and cancel.is_set():
+        raise SearchCancelled
 
-    # Substring match bonus
-    if query_lower in target_lower:
-        return 0.9
 
-    max_len = max(len(query_lower), len(target_lower))
-    if max_len == 0:
-        return 1.0
+# Progress callback of the tool call being served, set when the client sent a progressToken
+_progress: contextvars.ContextVar[Callable[[float, float | None, str], Awaitable[None]] | None] = (
+    contextvars.ContextVar("progress", default=None)
+)
 
-    distance = _levenshtein_distance(query_lower, target_lower)
-    return 1.0 - (distance / max_len)
 
+async def _report_progress(progress: float, total: float | None, message: str) -> None:
+    report = _progress.get()
+    if report is not None:
+        await report(progress, total, message)
 
-# ============================================================================
-# Utility Functions
-# ============================================================================
+
+def _match_rank(rec: Record, term: str | None, regex_pattern: re.Pattern | None) -> int:
+    """Rank of a term match: 0 exact name, 1 name prefix, 2 within the name, 3 elsewhere."""
+    if not term:
+        return 0
+    name = (rec.name or "").lower()
+    if regex_pattern is not None:
+        if regex_pattern.fullmatch(name):
+            return 0
+        m = regex_pattern.search(name)
+        if m is None:
+            return 3
+        return 1 if m.start() == 0 else 2
+    t = term.lower()
+    if name == t:
+        return 0
+    if name.startswith(t):
+        return 1
+    return 2 if t in name else 3
+
+
+def _parse_xlen_filter(xlen_filter: Any) -> set[int]:
+    """XLEN filter argument (32, 64, "64" or a list of them) as a set; empty means any."""
+    xlen_set: set[int] = set()
+    if xlen_filter is not None:
+        if isinstance(xlen_filter, int):
+            xlen_set = {xlen_filter}
+        elif isinstance(xlen_filter, list):
+            xlen_set = {
+                int(x)
+                for x in xlen_filter
+                if isinstance(x, int) or (isinstance(x, str) and x.isdigit())
+            }
+        else:
+            with contextlib.suppress(ValueError, TypeError):
+                xlen_set = {int(xlen_filter)}
+    return xlen_set
 
 
 def _ensure_in_gen(path: Path) -> Path:
@@ -141,106 +190,6 @@ def _ensure_in_gen(path: Path) -> Path:
     return p
 
 
-def _load_yaml(path: Path) -> dict:
-    """Load and parse a YAML file."""
-    with open(path, encoding="utf-8") as fh:
-        return yaml.safe_load(fh) or {}
-
-
-def _extract_defined_by(data: dict) -> list[str]:
-    """Extract extension names from definedBy field (handles string, list, dict with anyOf/allOf)."""
-    defined = data.get("definedBy")
-    if defined is None:
-        return []
-    if isinstance(defined, str):
-        return [defined]
-    if isinstance(defined, list):
-        return [str(x) for x in defined]
-    if isinstance(defined, dict):
-        # handle anyOf / allOf patterns
-        for k in ("anyOf", "allOf", "oneOf"):
-            if k in defined and isinstance(defined[k], list):
-                return [str(x) for x in defined[k]]
-    return []
-
-
-def _extension_in_path(rel_parts: list[str]) -> str | None:
-    """Find extension name from path (heuristic: segment after 'inst')."""
-    for i, part in enumerate(rel_parts):
-        if part == "inst" and i + 1 < len(rel_parts):
-            return rel_parts[i + 1]
-    return None
-
-
-def _csr_extensions(data: dict) -> set[str]:
-    """Extract all extension names from CSR (top-level and field-level definedBy)."""
-    exts: set[str] = set()
-    top = data.get("definedBy")
-    if isinstance(top, str):
-        exts.add(top)
-    elif isinstance(top, list):
-        exts.update(str(x) for x in top)
-    fields = data.get("fields")
-    if isinstance(fields, dict):
-        for fld in fields.values():
-            if isinstance(fld, dict) and "definedBy" in fld:
-                db = fld.get("definedBy")
-                if isinstance(db, str):
-                    exts.add(db)
-                elif isinstance(db, list):
-                    exts.update(str(x) for x in db)
-    return exts
-
-
-def _extract_xlen(data: dict) -> set[int]:
-    """
-    Extract XLEN values from instruction/CSR data.
-
-    Checks base field and other indicators to determine if instruction
-    supports 32-bit, 64-bit, or both.
-    """
-    xlens: set[int] = set()
-
-    # Check base field (common indicator)
-    base = data.get("base")
-    if isinstance(base, (int, str)):
-        try:
-            base_int = int(base)
-            if base_int in {32, 64}:
-                xlens.add(base_int)
-        except (ValueError, TypeError):
-            pass
-
-    # Check for RV32/RV64 in definedBy or name
-    defined_by = _extract_defined_by(data)
-    name = data.get("name", "")
-
-    indicators = defined_by + [name]
-    for indicator in indicators:
-        s = str(indicator).upper()
-        if "RV32" in s or "32" in s:
-            xlens.add(32)
-        if "RV64" in s or "64" in s:
-            xlens.add(64)
-
-    # Check encoding for base-specific patterns
-    encoding = data.get("encoding")
-    if isinstance(encoding, dict):
-        match = encoding.get("match", "")
-        if isinstance(match, str):
-            # Some encodings have XLEN-specific patterns
-            if "32" in match:
-                xlens.add(32)
-            if "64" in match:
-                xlens.add(64)
-
-    # If no specific XLEN found, assume both (most instructions support both)
-    if not xlens:
-        xlens = {32, 64}
-
-    return xlens
-
-
 def _matches_field_search(data: dict, field: str, pattern: str, use_regex: bool = False) -> bool:
     """
     Check if a specific field in data matches the pattern.
@@ -279,59 +228,123 @@ def _matches_field_search(data: dict, field: str, pattern: str, use_regex: bool
 
 
 # ============================================================================
-# Path Iterators (domain-specific file discovery)
+# Catalog
 # ============================================================================
 
+_catalog: Catalog | None = None
 
-def _iter_instruction_yaml_paths() -> list[Path]:
-    """Find all instruction YAML files."""
-    paths: list[Path] = []
-    if not GEN_DIR.exists():
-        return paths
-    for root, _dirs, files in os.walk(GEN_DIR):
-        root_p = Path(root)
-        # Only consider instruction folders
-        if "inst" not in root_p.parts:
-            continue
-        for f in files:
-            if f.lower().endswith((".yaml", ".yml")):
-                p = root_p / f
-                # Must be under spec/*/inst or resolved_spec/*/inst
-                if any(part in {"spec", "resolved_spec"} for part in p.relative_to(GEN_DIR).parts):
-                    paths.append(p)
-    return paths
-
-
-def _iter_csr_yaml_paths() -> list[Path]:
-    """Find all CSR YAML files."""
-    paths: list[Path] = []
-    if not GEN_DIR.exists():
-        return paths
-    for root, _dirs, files in os.walk(GEN_DIR):
-        root_p = Path(root)
-        if "csr" not in root_p.parts:
-            continue
-        for f in files:
-            if f.lower().endswith((".yaml", ".yml")):
-                p = root_p / f
-                paths.append(p)
-    return paths
+# Statistics of the most recent background refresh
+_last_refresh: dict[str, Any] = {"latency_ms": None, "changed_files": 0, "time": None}
 
 
-def _iter_extension_yaml_paths() -> list[Path]:
-    """Find all extension YAML files."""
-    paths: list[Path] = []
-    if not GEN_DIR.exists():
-        return paths
-    for root, _dirs, files in os.walk(GEN_DIR):
-        root_p = Path(root)
-        if "ext" not in root_p.parts:
-            continue
-        for f in files:
-            if f.lower().endswith((".yaml", ".yml")):
-                p = root_p / f
-                paths.append(p)
-    return paths
+def get_catalog() -> Catalog:
+    """Return the in-memory catalog of gen/, building it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog.build(REPO_ROOT, GEN_DIR)
+    return _catalog
+
+
+def _swap_catalog(new: Catalog, seconds: float, changed: int) -> None:
+    """Install a refreshed catalog; queries already running keep their reference to the old one."""
+    global _catalog
+    _catalog = new
+    _last_refresh.update(
+        latency_ms=round(seconds * 1000, 1),
+        changed_files=changed,
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+
+
+_text_index: TextIndex | None = None
+_text_index_lock = threading.Lock()
+
+
+def get_text_index() -> TextIndex:
+    """Return the full-text index for the current catalog generation (blocking on first use)."""
+    global _text_index
+    catalog = get_catalog()
+    with _text_index_lock:
+        if _text_index is None or _text_index.generation != catalog.generation:
+            _text_index = TextIndex.load_or_build(catalog, CACHE_DIR / "text_index.json.gz")
+        return _text_index
+
+
+# Ranked results of search_instructions/search_csrs, for cursor pagination
+_result_sets = ResultSets()
+
+# Serialized tool responses, keyed by tool, arguments and catalog generation
+_query_cache = QueryCache(QUERY_CACHE_ENTRIES, QUERY_CACHE_BYTES, QUERY_CACHE_TTL)
+_started = time.time()
+
+# Tool call latencies, and the per-client limiter (set up by main for the HTTP transport)
+_latency = LatencyHistograms()
+_rate_limiter = RateLimiter(0, 1)
+_transport = "stdio"
+
+_call_graph: CallGraph | None = None
+_call_graph_lock = threading.Lock()
+
+
+def get_call_graph() -> CallGraph:
+    """Return the IDL call graph, rebuilt when the catalog or the isa/ files change."""
+    global _call_graph
+    catalog = get_catalog()
+    with _call_graph_lock:
+        if (
+            _call_graph is None
+            or _call_graph.generation != catalog.generation
+            or _call_graph.stamp != isa_stamp(isa_files(catalog))
+        ):
+            _call_graph = CallGraph(catalog)
+        return _call_graph
+
+
+_encoding_index: EncodingIndex | None = None
+_encoding_index_lock = threading.Lock()
+
+
+def get_encoding_index() -> EncodingIndex:
+    """Return the instruction encoding index for the current catalog generation."""
+    global _encoding_index
+    catalog = get_catalog()
+    with _encoding_index_lock:
+        if _encoding_index is None or _encoding_index.generation != catalog.generation:
+            _encoding_index = EncodingIndex(catalog)
+        return _encoding_index
+
+
+_csr_space: CsrSpace | None = None
+_csr_space_lock = threading.Lock()
+
+
+def get_csr_space() -> CsrSpace:
+    """Return the CSR address/field index for the current catalog generation."""
+    global _csr_space
+    catalog = get_catalog()
+    with _csr_space_lock:
+        if _csr_space is None or _csr_space.generation != catalog.generation:
+            _csr_space = CsrSpace(catalog)
+        return _csr_space
+
+
+_ext_index: ExtensionIndex | None = None
+_ext_index_lock = threading.Lock()
+
+
+def get_ext_index() -> ExtensionIndex:
+    """Return the extension reverse indexes for the current catalog generation."""
+    global _ext_index
+    catalog = get_catalog()
+    with _ext_index_lock:
+        if _ext_index is None or _ext_index.generation != catalog.generation:
+            _ext_index = ExtensionIndex(catalog)
+        return _ext_index
+
+
+def catalog_info() -> dict[str, Any]:
+    """Catalog generation and last refresh statistics, attached to every tool response."""
+    return {"generation": get_catalog().generation, "last_refresh": dict(_last_refresh)}
 
 
 # ============================================================================
@@ -343,25 +356,70 @@ async def list_gen_yaml():
     """List all YAML files under gen/ as repo-relative paths."""
     if not GEN_DIR.exists():
         return {"files": []}
-    paths: list[str] = []
-    for root, _dirs, files in os.walk(GEN_DIR):
-        for f in files:
-            if f.lower().endswith((".yaml", ".yml")):
-                full = Path(root) / f
-                rel = str(full.relative_to(REPO_ROOT))
-                paths.append(rel)
-    paths.sort()
+    paths = get_catalog().yaml_files
     return {"count": len(paths), "files": paths}
 
 
+@functools.lru_cache(maxsize=64)
+def _load_other_yaml(path: Path, mtime_ns: int) -> Any:
+    """Parsed YAML of a file outside the catalog domains, cached per mtime."""
+    return load_yaml(path)
+
+
 async def read_gen_yaml(args: dict[str, Any]):
-    """Read and parse a YAML file under gen/."""
+    """
+    Read a parsed YAML file under gen/, optionally only parts of it.
+
+    Documents come from the catalog (or a small cache for files outside its
+    domains), so a read does not re-parse the file. `fields` selects paths
+    (dotted or JSONPath, see projection.py) and returns {concrete path: value};
+    `max_depth` and `max_bytes` bound the size of what is returned.
+    """
     rel = args.get("path")
     if not isinstance(rel, str):
         raise ValueError("'path' arg must be a string")
+    fields = args.get("fields")
+    if isinstance(fields, str):
+        fields = [fields]
+    if fields is not None and not (
+        isinstance(fields, list) and all(isinstance(f, str) for f in fields)
+    ):
+        raise ValueError("'fields' must be a string or a list of strings")
+    max_depth = args.get("max_depth")
+    max_bytes = args.get("max_bytes")
+    if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+        raise ValueError("'max_depth' must be a non-negative integer")
+    if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 64):
+        raise ValueError("'max_bytes' must be an integer >= 64")
+    # Fail on a bad path before touching the file
+    steps = [(f, parse_path(f)) for f in fields or []]
+
     p = _ensure_in_gen(Path(rel))
-    data = _load_yaml(p)
-    return {"path": rel, "data": data}
+    rec = get_catalog().records.get(p)
+    data = rec.data if rec is not None else _load_other_yaml(p, p.stat().st_mtime_ns)
+
+    out: dict[str, Any] = {"path": rel}
+    if fields:
+        selected: dict[str, Any] = {}
+        missing = []
+        for expr, compiled in steps:
+            matches = select(data, compiled)
+            if not matches:
+                missing.append(expr)
+            selected.update(matches)
+        data = selected
+        out["missing"] = missing
+    if max_depth is not None:
+        data = limit_depth(data, max_depth)
+    if max_bytes is not None:
+        omitted: list[str] = []
+        data, _size = limit_bytes(data, max_bytes, "$", omitted)
+        out["truncated"] = bool(omitted)
+        if omitted:
+            out["omitted_count"] = len(omitted)
+            out["omitted"] = omitted[:50]
+    out["data"] = data
+    return out
 
 
 # ============================================================================
@@ -370,6 +428,10 @@ async def read_gen_yaml(args: dict[str, Any]):
 
 
 async def search_instructions(args: dict[str, Any]):
+    return await asyncio.to_thread(_search_instructions, args)
+
+
+def _search_instructions(args: dict[str, Any], cancel: threading.Event | None = None):
     """
     Search instruction YAMLs with flexible filtering.
 
@@ -381,8 +443,18 @@ async def search_instructions(args: dict[str, Any]):
         use_regex: treat term as regex pattern (default False)
         fuzzy: enable fuzzy matching with threshold (0-1, default disabled)
         field: specific field to search in (e.g., "assembly", "encoding.match")
-        limit: max results (default 50)
+        limit: max results per page (default 50)
+        cursor: next_cursor of a previous response, to get the following page
+
+    Every match is ranked (fuzzy score, else exact name, name prefix, name
+    substring, other fields; path order within a rank) before paging.
     """
+    limit = int(args.get("limit") or 50)
+    if args.get("cursor"):
+        return _result_sets.next_page(
+            "search_instructions", args["cursor"], get_catalog().generation, limit
+        )
+
     term = args.get("term")
     keys = args.get("keys") or []
     extensions = args.get("extensions") or []
@@ -390,7 +462,6 @@ async def search_instructions(args: dict[str, Any]):
     use_regex = args.get("use_regex", False)
     fuzzy = args.get("fuzzy")
     field = args.get("field")
-    limit = int(args.get("limit") or 50)
 
     if term is not None and not isinstance(term, str):
         raise ValueError("'term' must be a string if provided")
@@ -399,24 +470,11 @@ async def search_instructions(args: dict[str, Any]):
     if not isinstance(extensions, list) or not all(isinstance(e, str) for e in extensions):
         raise ValueError("'extensions' must be a list of strings")
 
-    # Parse XLEN filter
-    xlen_set: set[int] = set()
-    if xlen_filter is not None:
-        if isinstance(xlen_filter, int):
-            xlen_set = {xlen_filter}
-        elif isinstance(xlen_filter, list):
-            xlen_set = {
-                int(x)
-                for x in xlen_filter
-                if isinstance(x, int) or (isinstance(x, str) and x.isdigit())
-            }
-        else:
-            with contextlib.suppress(ValueError, TypeError):
-                xlen_set = {int(xlen_filter)}
+    xlen_set = _parse_xlen_filter(xlen_filter)
 
     ext_set = {e for e in extensions}
-    results: list[dict[str, Any]] = []
-    count = 0
+    term_lower = term.lower() if term else ""
+    ranked: list[tuple[Any, dict[str, Any]]] = []
 
     # Compile regex if needed
     regex_pattern = None
@@ -426,14 +484,20 @@ async def search_instructions(args: dict[str, Any]):
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
 
-    for p in _iter_instruction_yaml_paths():
-        rel = p.relative_to(REPO_ROOT)
-        rel_str = str(rel)
+    # Fuzzy scores come from the name index, over the whole catalog
+    catalog = get_catalog()
+    fuzzy_scores = None
+    if fuzzy and term and not field and regex_pattern is None:
+        fuzzy_scores = catalog.fuzzy_search(
+            "instructions",
+            term,
+            _fuzzy_threshold(fuzzy),
+        )
 
-        try:
-            data = _load_yaml(p)
-        except Exception:
-            continue
+    # Extension and XLEN filters are answered by the catalog indexes
+    for rec in catalog.candidates("instructions", ext_set, xlen_set):
+        _check_cancelled(cancel)
+        data = rec.data
 
         # Keys filter: require all specified keys
         if keys and not all(k in data for k in keys):
@@ -447,53 +511,21 @@ async def search_instructions(args: dict[str, Any]):
                 continue
         # General term filter
         elif term:
-            namepart = p.stem.lower()
-            target_str = rel_str.lower()
-
-            # Also include instruction name and assembly in search
-            inst_name = data.get("name", "")
-            assembly = data.get("assembly", "")
-            long_name = data.get("long_name", "")
-            search_text = f"{namepart} {target_str} {inst_name} {assembly} {long_name}".lower()
-
+            # Name, path, assembly and long name are pre-joined in rec.search_text
             matched = False
 
             if regex_pattern:
-                matched = bool(regex_pattern.search(search_text))
-            elif fuzzy:
-                threshold = float(fuzzy) if isinstance(fuzzy, (int, float)) else 0.6
-                matched = (
-                    _fuzzy_match(term, inst_name, threshold)
-                    or _fuzzy_match(term, assembly, threshold)
-                    or _fuzzy_match(term, namepart, threshold)
-                )
+                matched = bool(regex_pattern.search(rec.search_text))
+            elif fuzzy_scores is not None:
+                matched = id(rec) in fuzzy_scores
             else:
-                matched = term.lower() in search_text
+                matched = term_lower in rec.search_text
 
             if not matched:
                 continue
 
-        defined_by = _extract_defined_by(data)
-        ext_from_path = _extension_in_path(
-            rel.relative_to(GEN_DIR).parts if rel.is_relative_to(GEN_DIR) else rel.parts
-        )
-
-        # Extension filter
-        if ext_set:
-            present = set(defined_by)
-            if ext_from_path:
-                present.add(ext_from_path)
-            if present.isdisjoint(ext_set):
-                continue
-
-        # XLEN filter
-        if xlen_set:
-            inst_xlens = _extract_xlen(data)
-            if inst_xlens.isdisjoint(xlen_set):
-                continue
-
         info = {
-            "path": rel_str,
+            "path": rec.rel,
             "kind": data.get("kind"),
             "name": data.get("name"),
             "long_name": data.get("long_name"),
@@ -503,39 +535,132 @@ async def search_instructions(args: dict[str, Any]):
                 if isinstance(data.get("encoding"), dict)
                 else None
             ),
-            "definedBy": defined_by,
-            "extensionInPath": ext_from_path,
-            "xlen": list(_extract_xlen(data)),
+            "definedBy": rec.defined_by,
+            "extensionInPath": rec.ext_from_path,
+            "xlen": list(rec.xlen),
         }
 
         # Add fuzzy score if fuzzy matching was used
         if fuzzy and term:
-            score = max(
-                _fuzzy_score(term, data.get("name", "")),
-                _fuzzy_score(term, data.get("assembly", "")),
-                _fuzzy_score(term, p.stem),
-            )
-            info["fuzzy_score"] = round(score, 3)
+            info["fuzzy_score"] = round(_record_fuzzy_score(rec, term, fuzzy_scores), 3)
 
-        results.append(info)
-        count += 1
-        if count >= limit:
-            break
+        if fuzzy and term:
+            rank = -info["fuzzy_score"]
+        else:
+            rank = 0 if field else _match_rank(rec, term, regex_pattern)
+        ranked.append((rank, info))
+
+    # Stable sort: path order within equal ranks
+    ranked.sort(key=lambda pair: pair[0])
+    search_mode = {
+        "regex": use_regex,
+        "fuzzy": bool(fuzzy),
+        "field_specific": bool(field),
+        "xlen_filter": list(xlen_set) if xlen_set else None,
+    }
+    return _result_sets.first_page(
+        "search_instructions",
+        catalog.generation,
+        [info for _, info in ranked],
+        limit,
+        {"search_mode": search_mode},
+    )
 
-    # Sort by fuzzy score if applicable
-    if fuzzy and term:
-        results.sort(key=lambda x: x.get("fuzzy_score", 0), reverse=True)
 
-    return {
-        "count": count,
-        "results": results,
-        "search_mode": {
-            "regex": use_regex,
-            "fuzzy": bool(fuzzy),
-            "field_specific": bool(field),
-            "xlen_filter": list(xlen_set) if xlen_set else None,
-        },
-    }
+async def search_encoding(args: dict[str, Any]):
+    return await asyncio.to_thread(_search_encoding, args)
+
+
+def _search_encoding(args: dict[str, Any]):
+    """
+    Search instructions by encoding bits.
+
+    Args:
+        word: raw instruction word to decode (int, or "0x..."/"0b..." string)
+        match: partial pattern in encoding.match syntax, MSB first, '-' for any bit
+        mask/value: partial pattern as integers
+        fields: {field: value} constraints; fields are standard names (opcode, funct3,
+                funct7, rd, rs1, rs2, c.op, c.funct3, ...) or bit locations ("14-12")
+        mode: "compatible" (the fixed bits agree, default) or "fixed" (the encoding
+              also fixes every queried bit)
+        width: instruction length for 'word' (default: from its low bits)
+        extensions: filter by extension names (optional)
+        xlen: filter by XLEN (optional)
+        limit: max results (default 50)
+
+    'word' is exclusive with the others; match, mask/value and fields combine.
+    """
+    word = args.get("word")
+    match = args.get("match")
+    fields = args.get("fields") or {}
+    mode = args.get("mode") or "compatible"
+    width = args.get("width")
+    extensions = args.get("extensions") or []
+    xlen_set = _parse_xlen_filter(args.get("xlen"))
+    limit = int(args.get("limit") or 50)
+
+    has_pattern = match is not None or "mask" in args or "value" in args or fields
+    if (word is None) == (not has_pattern):
+        raise ValueError("Provide either 'word' or a pattern ('match', 'mask'/'value', 'fields')")
+    if not isinstance(fields, dict):
+        raise ValueError("'fields' must be an object of {field: value}")
+    if mode not in MODES:
+        raise ValueError(f"Invalid mode '{mode}'. Must be one of: {MODES}")
+
+    index = get_encoding_index()
+    query: dict[str, Any]
+    if word is not None:
+        word = parse_int(word)
+        hits = index.decode(word, int(width) if width else None)
+        query = {"word": hex(word)}
+    else:
+        mask = value = 0
+        parts = []
+        if match is not None:
+            parts.append(parse_match(match)[:2])
+        if "mask" in args or "value" in args:
+            m = parse_int(args.get("mask", 0))
+            parts.append((m, parse_int(args.get("value", 0)) & m))
+        if fields:
+            parts.append(field_constraints(fields))
+        for m, v in parts:
+            if (value ^ v) & mask & m:
+                raise ValueError("'match', 'mask'/'value' and 'fields' constrain a bit differently")
+            mask |= m
+            value |= v
+        hits = [(entry, None) for entry in index.search(mask, value, mode)]
+        query = {"mask": hex(mask), "value": hex(value), "mode": mode}
+
+    # Extension and XLEN filters, through the catalog indexes
+    if extensions or xlen_set:
+        allowed = {
+            id(r) for r in get_catalog().candidates("instructions", set(extensions), xlen_set)
+        }
+        hits = [
+            (entry, operands)
+            for entry, operands in hits
+            if any(id(r) in allowed for r in entry.records)
+            and (entry.variant is None or not xlen_set or entry.variant in xlen_set)
+        ]
+
+    results = []
+    for entry, operands in hits[:limit]:
+        rec = entry.records[0]
+        info = {
+            "name": entry.name,
+            "paths": [r.rel for r in entry.records],
+            "match": entry.match,
+            "mask": hex(entry.mask),
+            "value": hex(entry.value),
+            "width": entry.width,
+            "xlen": [entry.variant] if entry.variant else list(rec.xlen),
+            "definedBy": rec.defined_by,
+        }
+        if operands is not None:
+            info["operands"] = operands
+        results.append(info)
+
+    return {"query": query, "count": len(results), "total": len(hits), "results": results}
 
 
 # ============================================================================
@@ -544,6 +669,10 @@ async def search_instructions(args: dict[str, Any]):
 
 
 async def search_csrs(args: dict[str, Any]):
+    return await asyncio.to_thread(_search_csrs, args)
+
+
+def _search_csrs(args: dict[str, Any], cancel: threading.Event | None = None):
     """
     Search CSR YAMLs with flexible filtering.
 
@@ -555,8 +684,18 @@ async def search_csrs(args: dict[str, Any]):
         use_regex: treat term as regex pattern (default False)
         fuzzy: enable fuzzy matching with threshold (0-1, default disabled)
         field: specific field to search in (e.g., "priv_mode", "address")
-        limit: max results (default 50)
+        limit: max results per page (default 50)
+        cursor: next_cursor of a previous response, to get the following page
+
+    Every match is ranked (fuzzy score, else exact name, name prefix, name
+    substring, other fields; path order within a rank) before paging.
     """
+    limit = int(args.get("limit") or 50)
+    if args.get("cursor"):
+        return _result_sets.next_page(
+            "search_csrs", args["cursor"], get_catalog().generation, limit
+        )
+
     term = args.get("term")
     keys = args.get("keys") or []
     extensions = args.get("extensions") or []
@@ -564,7 +703,6 @@ async def search_csrs(args: dict[str, Any]):
     use_regex = args.get("use_regex", False)
     fuzzy = args.get("fuzzy")
     field = args.get("field")
-    limit = int(args.get("limit") or 50)
 
     if term is not None and not isinstance(term, str):
         raise ValueError("'term' must be a string if provided")
@@ -573,24 +711,11 @@ async def search_csrs(args: dict[str, Any]):
     if not isinstance(extensions, list) or not all(isinstance(e, str) for e in extensions):
         raise ValueError("'extensions' must be a list of strings")
 
-    # Parse XLEN filter
-    xlen_set: set[int] = set()
-    if xlen_filter is not None:
-        if isinstance(xlen_filter, int):
-            xlen_set = {xlen_filter}
-        elif isinstance(xlen_filter, list):
-            xlen_set = {
-                int(x)
-                for x in xlen_filter
-                if isinstance(x, int) or (isinstance(x, str) and x.isdigit())
-            }
-        else:
-            with contextlib.suppress(ValueError, TypeError):
-                xlen_set = {int(xlen_filter)}
+    xlen_set = _parse_xlen_filter(xlen_filter)
 
     ext_set = set(extensions)
-    results: list[dict[str, Any]] = []
-    count = 0
+    term_lower = term.lower() if term else ""
+    ranked: list[tuple[Any, dict[str, Any]]] = []
 
     # Compile regex if needed
     regex_pattern = None
@@ -600,13 +725,20 @@ async def search_csrs(args: dict[str, Any]):
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
 
-    for p in _iter_csr_yaml_paths():
-        rel = str(p.relative_to(REPO_ROOT))
+    # Fuzzy scores come from the name index, over the whole catalog
+    catalog = get_catalog()
+    fuzzy_scores = None
+    if fuzzy and term and not field and regex_pattern is None:
+        fuzzy_scores = catalog.fuzzy_search(
+            "csrs",
+            term,
+            _fuzzy_threshold(fuzzy),
+        )
 
-        try:
-            data = _load_yaml(p)
-        except Exception:
-            continue
+    # Extension and XLEN filters are answered by the catalog indexes
+    for rec in catalog.candidates("csrs", ext_set, xlen_set):
+        _check_cancelled(cancel)
+        data = rec.data
 
         # Keys filter
         if keys and not all(k in data for k in keys):
@@ -620,79 +752,130 @@ async def search_csrs(args: dict[str, Any]):
                 continue
         # General term filter
         elif term:
-            namepart = p.stem.lower()
-            csr_name = data.get("name", "")
-            long_name = data.get("long_name", "")
-            search_text = f"{namepart} {rel.lower()} {csr_name} {long_name}".lower()
-
+            # Name, path and long name are pre-joined in rec.search_text
             matched = False
 
             if regex_pattern:
-                matched = bool(regex_pattern.search(search_text))
-            elif fuzzy:
-                threshold = float(fuzzy) if isinstance(fuzzy, (int, float)) else 0.6
-                matched = (
-                    _fuzzy_match(term, csr_name, threshold)
-                    or _fuzzy_match(term, long_name, threshold)
-                    or _fuzzy_match(term, namepart, threshold)
-                )
+                matched = bool(regex_pattern.search(rec.search_text))
+            elif fuzzy_scores is not None:
+                matched = id(rec) in fuzzy_scores
             else:
-                matched = term.lower() in search_text
+                matched = term_lower in rec.search_text
 
             if not matched:
                 continue
 
-        csr_exts = _csr_extensions(data)
-
-        # Extension filter
-        if ext_set and csr_exts.isdisjoint(ext_set):
-            continue
-
-        # XLEN filter
-        if xlen_set:
-            csr_xlens = _extract_xlen(data)
-            if csr_xlens.isdisjoint(xlen_set):
-                continue
-
         info = {
-            "path": rel,
+            "path": rec.rel,
             "kind": data.get("kind"),
             "name": data.get("name"),
             "long_name": data.get("long_name"),
             "address": data.get("address"),
             "priv_mode": data.get("priv_mode"),
-            "definedBy": list(csr_exts),
-            "xlen": list(_extract_xlen(data)),
+            "definedBy": list(rec.extensions),
+            "xlen": list(rec.xlen),
         }
 
         # Add fuzzy score if fuzzy matching was used
         if fuzzy and term:
-            score = max(
-                _fuzzy_score(term, data.get("name", "")),
-                _fuzzy_score(term, data.get("long_name", "")),
-                _fuzzy_score(term, p.stem),
-            )
-            info["fuzzy_score"] = round(score, 3)
+            info["fuzzy_score"] = round(_record_fuzzy_score(rec, term, fuzzy_scores), 3)
 
-        results.append(info)
-        count += 1
-        if count >= limit:
-            break
+        if fuzzy and term:
+            rank = -info["fuzzy_score"]
+        else:
+            rank = 0 if field else _match_rank(rec, term, regex_pattern)
+        ranked.append((rank, info))
+
+    # Stable sort: path order within equal ranks
+    ranked.sort(key=lambda pair: pair[0])
+    search_mode = {
+        "regex": use_regex,
+        "fuzzy": bool(fuzzy),
+        "field_specific": bool(field),
+        "xlen_filter": list(xlen_set) if xlen_set else None,
+    }
+    return _result_sets.first_page(
+        "search_csrs",
+        catalog.generation,
+        [info for _, info in ranked],
+        limit,
+        {"search_mode": search_mode},
+    )
 
-    # Sort by fuzzy score if applicable
-    if fuzzy and term:
-        results.sort(key=lambda x: x.get("fuzzy_score", 0), reverse=True)
 
-    return {
-        "count": count,
-        "results": results,
-        "search_mode": {
-            "regex": use_regex,
-            "fuzzy": bool(fuzzy),
-            "field_specific": bool(field),
-            "xlen_filter": list(xlen_set) if xlen_set else None,
-        },
-    }
+async def query_csr_space(args: dict[str, Any]):
+    return await asyncio.to_thread(_query_csr_space, args)
+
+
+def _query_csr_space(args: dict[str, Any]):
+    """
+    Query CSR addresses and field layouts.
+
+    Args:
+        start, end: CSRs at addresses in [start, end] (end defaults to start)
+        csr: CSR name; alone, returns its field layout
+        bits: bit range ("12-11", 12 or [12, 11]); fields overlapping it, of 'csr'
+              or of every CSR
+        xlen: only field locations valid for this XLEN (32 or 64)
+        free_custom: privilege mode (M, S, U, H/VS); unused custom CSR addresses
+        limit: max CSRs/fields returned (default 200)
+
+    Each given query adds its section ("csrs", "fields", "free_custom") to the result.
+    """
+    start = args.get("start")
+    end = args.get("end")
+    csr = args.get("csr")
+    bits = args.get("bits")
+    xlen = args.get("xlen")
+    free_custom = args.get("free_custom")
+    limit = int(args.get("limit") or 200)
+
+    if start is None and csr is None and bits is None and free_custom is None:
+        raise ValueError("Provide 'start'/'end', 'csr', 'bits' or 'free_custom'")
+    if xlen is not None and int(xlen) not in (32, 64):
+        raise ValueError("'xlen' must be 32 or 64")
+
+    space = get_csr_space()
+    result: dict[str, Any] = {}
+
+    if start is not None:
+        lo = parse_int(start)
+        hi = parse_int(end) if end is not None else lo
+        entries = space.in_range(min(lo, hi), max(lo, hi))
+        csrs = []
+        for address, name, via in entries[:limit]:
+            rec = space.csrs[name]
+            info = {
+                "address": hex(address),
+                "name": name,
+                "long_name": rec.data.get("long_name"),
+                "priv_mode": rec.data.get("priv_mode"),
+                "path": rec.rel,
+            }
+            if via != "address":
+                info["via"] = via
+            csrs.append(info)
+        result["csrs"] = {"range": [hex(lo), hex(hi)], "count": len(entries), "results": csrs}
+
+    if csr is not None or bits is not None:
+        if csr is not None and csr not in space.csrs:
+            raise ValueError(f"Unknown CSR '{csr}'")
+        high, low = parse_bits(bits) if bits is not None else (63, 0)
+        spans = space.overlapping(high, low, csr, int(xlen) if xlen is not None else None)
+        result["fields"] = {
+            "csr": csr,
+            "bits": (str(high) if high == low else f"{high}-{low}") if bits is not None else None,
+            "count": len(spans),
+            "results": [s.as_dict() for s in spans[:limit]],
+        }
+
+    if free_custom is not None:
+        result["free_custom"] = {
+            "priv_mode": free_custom,
+            "ranges": space.free_custom(str(free_custom)),
+        }
+
+    return result
 
 
 # ============================================================================
@@ -700,6 +883,61 @@ async def search_csrs(args: dict[str, Any]):
 # ============================================================================
 
 
+def _search_extension_names(
+    term: str, use_regex: bool, fuzzy: Any, limit: int, cancel: threading.Event | None = None
+) -> dict[str, Any]:
+    """Name/long-name search over extensions, as used by search_all."""
+    ext_results = {"count": 0, "results": []}
+    regex_pattern = None
+    if use_regex:
+        with contextlib.suppress(re.error):
+            regex_pattern = re.compile(term, re.IGNORECASE)
+
+    catalog = get_catalog()
+    fuzzy_scores = None
+    if fuzzy and regex_pattern is None:
+        fuzzy_scores = catalog.fuzzy_search("extensions", term, _fuzzy_threshold(fuzzy))
+
+    for rec in catalog.domains["extensions"]:
+        _check_cancelled(cancel)
+        data = rec.data
+        if data.get("kind") != "extension":
+            continue
+
+        name = data.get("name", "")
+        long_name = data.get("long_name", "")
+
+        matched = False
+        if regex_pattern:
+            matched = bool(regex_pattern.search(rec.search_text))
+        elif fuzzy_scores is not None:
+            matched = id(rec) in fuzzy_scores
+        else:
+            matched = term.lower() in rec.search_text
+
+        if matched:
+            info = {
+                "path": rec.rel,
+                "name": name,
+                "long_name": long_name,
+            }
+            if fuzzy:
+                info["fuzzy_score"] = round(_record_fuzzy_score(rec, term, fuzzy_scores), 3)
+
+            ext_results["results"].append(info)
+            ext_results["count"] += 1
+            if ext_results["count"] >= limit and fuzzy_scores is None:
+                break
+
+    # Sort by fuzzy score if applicable
+    if fuzzy:
+        ext_results["results"].sort(key=lambda x: x.get("fuzzy_score", 0), reverse=True)
+        del ext_results["results"][limit:]
+        ext_results["count"] = len(ext_results["results"])
+
+    return ext_results
+
+
 async def search_all(args: dict[str, Any]):
     """
     Search across multiple domains (instructions, CSRs, extensions) simultaneously.
@@ -713,6 +951,12 @@ async def search_all(args: dict[str, Any]):
         extensions: filter by extension names (optional)
         xlen: filter by XLEN (32, 64) (optional)
         limit_per_domain: max results per domain (default 20)
+        timeout_ms: deadline for the whole request (default 30000)
+
+    Domains are searched concurrently in worker threads. When the client asked
+    for progress, each domain's results are sent as a progress notification as
+    soon as it completes. Domains still running at the deadline are cancelled
+    and listed in "timed_out".
 
     Returns:
         Combined results from all requested domains with match scores
@@ -727,6 +971,8 @@ async def search_all(args: dict[str, Any]):
     extensions_filter = args.get("extensions") or []
     xlen_filter = args.get("xlen")
     limit_per_domain = int(args.get("limit_per_domain") or 20)
+    timeout_ms = args.get("timeout_ms")
+    timeout = SEARCH_ALL_TIMEOUT if timeout_ms is None else float(timeout_ms) / 1000
 
     if not isinstance(domains, list):
         raise ValueError("'domains' must be a list")
@@ -735,93 +981,62 @@ async def search_all(args: dict[str, Any]):
     for d in domains:
         if d not in valid_domains:
             raise ValueError(f"Invalid domain '{d}'. Must be one of: {valid_domains}")
+    domains = list(dict.fromkeys(domains))
+
+    domain_args = {
+        "term": term,
+        "use_regex": use_regex,
+        "fuzzy": fuzzy,
+        "extensions": extensions_filter,
+        "xlen": xlen_filter,
+        "limit": limit_per_domain,
+    }
+    # Worker threads cannot be interrupted; they poll this event and stop early
+    cancel = threading.Event()
+    workers = {
+        "instructions": functools.partial(_search_instructions, domain_args, cancel),
+        "csrs": functools.partial(_search_csrs, domain_args, cancel),
+        "extensions": functools.partial(
+            _search_extension_names, term, use_regex, fuzzy, limit_per_domain, cancel
+        ),
+    }
+    tasks = {asyncio.create_task(asyncio.to_thread(workers[d])): d for d in domains}
 
     results = {}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                domain = tasks[task]
+                domain_results = task.result()
+                # Instruction/CSR pages carry a cursor for search_instructions/search_csrs
+                results[domain] = {
+                    k: domain_results[k]
+                    for k in ("count", "total", "results", "next_cursor")
+                    if k in domain_results
+                }
+                await _report_progress(
+                    len(results),
+                    len(domains),
+                    json.dumps({"domain": domain, **results[domain]}),
+                )
+    finally:
+        # Deadline, failure in one domain or cancellation of the request
+        cancel.set()
+        for task in pending:
+            task.cancel()
 
-    # Search instructions
-    if "instructions" in domains:
-        inst_args = {
-            "term": term,
-            "use_regex": use_regex,
-            "fuzzy": fuzzy,
-            "extensions": extensions_filter,
-            "xlen": xlen_filter,
-            "limit": limit_per_domain,
-        }
-        inst_results = await search_instructions(inst_args)
-        results["instructions"] = {
-            "count": inst_results["count"],
-            "results": inst_results["results"],
-        }
-
-    # Search CSRs
-    if "csrs" in domains:
-        csr_args = {
-            "term": term,
-            "use_regex": use_regex,
-            "fuzzy": fuzzy,
-            "extensions": extensions_filter,
-            "xlen": xlen_filter,
-            "limit": limit_per_domain,
-        }
-        csr_results = await search_csrs(csr_args)
-        results["csrs"] = {
-            "count": csr_results["count"],
-            "results": csr_results["results"],
-        }
-
-    # Search extensions
-    if "extensions" in domains:
-        # For extensions, do a simpler search
-        ext_results = {"count": 0, "results": []}
-        regex_pattern = None
-        if use_regex:
-            with contextlib.suppress(re.error):
-                regex_pattern = re.compile(term, re.IGNORECASE)
-
-        for p in _iter_extension_yaml_paths():
-            try:
-                data = _load_yaml(p)
-                if data.get("kind") != "extension":
-                    continue
-
-                name = data.get("name", "")
-                long_name = data.get("long_name", "")
-                search_text = f"{name} {long_name}".lower()
-
-                matched = False
-                if regex_pattern:
-                    matched = bool(regex_pattern.search(search_text))
-                elif fuzzy:
-                    threshold = float(fuzzy) if isinstance(fuzzy, (int, float)) else 0.6
-                    matched = _fuzzy_match(term, name, threshold) or _fuzzy_match(
-                        term, long_name, threshold
-                    )
-                else:
-                    matched = term.lower() in search_text
-
-                if matched:
-                    info = {
-                        "path": str(p.relative_to(REPO_ROOT)),
-                        "name": name,
-                        "long_name": long_name,
-                    }
-                    if fuzzy:
-                        score = max(_fuzzy_score(term, name), _fuzzy_score(term, long_name))
-                        info["fuzzy_score"] = round(score, 3)
-
-                    ext_results["results"].append(info)
-                    ext_results["count"] += 1
-                    if ext_results["count"] >= limit_per_domain:
-                        break
-            except Exception:
-                continue
-
-        # Sort by fuzzy score if applicable
-        if fuzzy:
-            ext_results["results"].sort(key=lambda x: x.get("fuzzy_score", 0), reverse=True)
-
-        results["extensions"] = ext_results
+    timed_out = [tasks[t] for t in pending]
+    results = {d: results[d] for d in domains if d in results}
 
     # Calculate total matches
     total_count = sum(r.get("count", 0) for r in results.values())
@@ -829,6 +1044,7 @@ async def search_all(args: dict[str, Any]):
     return {
         "total_count": total_count,
         "domains_searched": domains,
+        "timed_out": timed_out,
         "search_mode": {
             "regex": use_regex,
             "fuzzy": bool(fuzzy),
@@ -851,46 +1067,26 @@ async def search_extensions(args: dict[str, Any]):
         name: specific extension name (optional, omit to list all)
         include_instructions: include instruction summary (default False)
         include_csrs: include CSR summary (default False)
-        limit: max instructions/CSRs per section (default 100)
+        include_params: include parameter summary (default False)
+        include_exception_codes: include exception code summary (default False)
+        limit: max items per section (default 100)
 
     Returns:
         If name is None: list of all extensions
-        If name provided: detailed extension info with optional instruction/CSR data
+        If name provided: detailed extension info with its implied/required
+        extensions and optional instruction/CSR/parameter/exception code data
     """
     name = args.get("name")
-    include_instructions = args.get("include_instructions", False)
-    include_csrs = args.get("include_csrs", False)
     limit = int(args.get("limit") or 100)
 
-    # Collect all extensions
-    items: list[dict[str, Any]] = []
-    for p in _iter_extension_yaml_paths():
-        try:
-            data = _load_yaml(p)
-        except Exception:
-            continue
-        if data.get("kind") == "extension" and isinstance(data.get("name"), str):
-            items.append(
-                {
-                    "path": str(p.relative_to(REPO_ROOT)),
-                    "name": data.get("name"),
-                    "long_name": data.get("long_name"),
-                    "data": data,  # Keep full data for detail view
-                }
-            )
-
-    # De-dup by name, favor shortest path
-    by_name: dict[str, dict[str, Any]] = {}
-    for it in items:
-        n = it["name"]
-        if n not in by_name or len(it["path"]) < len(by_name[n]["path"]):
-            by_name[n] = it
+    catalog = get_catalog()
+    by_name = catalog.extension_by_name
 
     # List all extensions if no specific name
     if not name:
         extensions = [
-            {"path": v["path"], "name": v["name"], "long_name": v["long_name"]}
-            for v in sorted(by_name.values(), key=lambda x: x["name"])
+            {"path": rec.rel, "name": rec.name, "long_name": rec.data.get("long_name")}
+            for _n, rec in sorted(by_name.items())
         ]
         return {"count": len(extensions), "extensions": extensions}
 
@@ -898,64 +1094,114 @@ async def search_extensions(args: dict[str, Any]):
     if name not in by_name:
         return {"found": False, "name": name}
 
-    ext_info = by_name[name]
+    ext_rec = by_name[name]
+    index = get_ext_index()
     result = {
         "found": True,
-        "path": ext_info["path"],
-        "extension": ext_info["data"],
+        "path": ext_rec.rel,
+        "extension": ext_rec.data,
+        **index.relations(name),
     }
 
-    # Optionally include instructions
-    if include_instructions:
-        insts: list[dict[str, Any]] = []
-        for p in _iter_instruction_yaml_paths():
-            try:
-                data = _load_yaml(p)
-            except Exception:
-                continue
-            defined_by = set(_extract_defined_by(data))
-            rel_parts = p.relative_to(GEN_DIR).parts if str(p).startswith(str(GEN_DIR)) else p.parts
-            ext_from_path = _extension_in_path(list(rel_parts))
-            if name in defined_by or (ext_from_path == name):
-                insts.append(
-                    {
-                        "path": str(p.relative_to(REPO_ROOT)),
-                        "name": data.get("name"),
-                        "assembly": data.get("assembly"),
-                        "encoding": (
-                            data.get("encoding", {}).get("match")
-                            if isinstance(data.get("encoding"), dict)
-                            else None
-                        ),
-                    }
-                )
-                if len(insts) >= limit:
-                    break
-        result["instructions"] = {"count": len(insts), "items": insts}
-
-    # Optionally include CSRs
-    if include_csrs:
-        csrs: list[dict[str, Any]] = []
-        for p in _iter_csr_yaml_paths():
-            try:
-                data = _load_yaml(p)
-            except Exception:
-                continue
-            csr_exts = _csr_extensions(data)
-            if name in csr_exts:
-                csrs.append(
-                    {
-                        "path": str(p.relative_to(REPO_ROOT)),
-                        "name": data.get("name"),
-                        "address": data.get("address"),
-                        "priv_mode": data.get("priv_mode"),
-                    }
-                )
-                if len(csrs) >= limit:
-                    break
-        result["csrs"] = {"count": len(csrs), "items": csrs}
-
-    return result
+    # Sections come from the reverse indexes; only the returned items are built
+    sections: dict[str, Callable[[Record], dict[str, Any]]] = {
+        "instructions": lambda rec: {
+            "path": rec.rel,
+            "name": rec.name,
+            "assembly": rec.data.get("assembly"),
+            "encoding": (
+                rec.data["encoding"].get("match")
+                if isinstance(rec.data.get("encoding"), dict)
+                else None
+            ),
+        },
+        "csrs": lambda rec: {
+            "path": rec.rel,
+            "name": rec.name,
+            "address": rec.data.get("address"),
+            "priv_mode": rec.data.get("priv_mode"),
+        },
+        "params": lambda rec: {
+            "path": rec.rel,
+            "name": rec.name,
+            "long_name": rec.data.get("long_name"),
+        },
+        "exception_codes": lambda rec: {
+            "path": rec.rel,
+            "name": rec.name,
+            "num": rec.data.get("num"),
+            "display_name": rec.data.get("display_name"),
+        },
+    }
+    for section, summary in sections.items():
+        if not args.get(f"include_{section}", False):
+            continue
+        recs = index.records(section, name)
+        items = [summary(rec) for rec in recs[:limit]]
+        result[section] = {"count": len(items), "total": len(recs), "items": items}
+
+    return result
+
+
+# ============================================================================
+# Full-Text Search Tool
+# ============================================================================
+
+
+async def search_text(args: dict[str, Any]):
+    """
+    BM25-ranked full-text search over descriptions, operation()/sail() bodies
+    and CSR field descriptions.
+
+    Args:
+        query: terms and "quoted phrases" combined with AND (default), OR,
+               NOT / -term and parentheses (required)
+        domains: restrict to ["instructions", "csrs", "extensions"] (optional)
+        fields: restrict matches to field groups: description, operation(),
+                sail(), fields (CSR field descriptions) (optional)
+        limit: max results (default 20)
+    """
+    query = args.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("'query' is required and must be a string")
+    domains = args.get("domains") or ["instructions", "csrs", "extensions"]
+    fields = args.get("fields")
+    limit = int(args.get("limit") or 20)
+
+    if not isinstance(domains, list) or not set(domains) <= {"instructions", "csrs", "extensions"}:
+        raise ValueError("'domains' must be a list of: instructions, csrs, extensions")
+    if fields is not None and (
+        not isinstance(fields, list) or not set(fields) <= set(FIELD_GROUPS)
+    ):
+        raise ValueError(f"'fields' must be a list of: {', '.join(FIELD_GROUPS)}")
+
+    index = await asyncio.to_thread(get_text_index)
+    # Not get_catalog(): a refresh may have swapped in a catalog without some of these documents
+    catalog = index.catalog
+    wanted = set(domains)
+    docs = {i for i, rel in enumerate(index.docs) if catalog.by_rel[rel].domain in wanted}
+    groups = set(fields) if fields else None
+
+    matches = index.search(query, docs, groups)
+    tokens = index.query_tokens(query)
+
+    results: list[dict[str, Any]] = []
+    for doc, score in matches[:limit]:
+        rec = catalog.by_rel[index.docs[doc]]
+        matched = index.matched_fields(doc, tokens, groups)
+        texts = dict(document_fields(rec))
+        results.append(
+            {
+                "path": rec.rel,
+                "domain": rec.domain,
+                "name": rec.data.get("name"),
+                "score": round(score, 3),
+                "fields": matched,
+                "snippet": snippet(texts[matched[0]], tokens) if matched else None,
+            }
+        )
+
+    return {"count": len(matches), "results": results}
 
 
 # ============================================================================
@@ -963,28 +1209,25 @@ async def search_extensions(args: dict[str, Any]):
 # ============================================================================
 
 
+_doc_files: tuple[int, Path | None, Path | None] | None = None
+
+
 def _find_funcs_adoc() -> tuple[Path | None, Path | None]:
-    """Locate function documentation files."""
-    funcs_doc = None
-    all_funcs = None
+    """Locate function documentation files (the walk is redone when cfg_html_doc changes)."""
+    global _doc_files
     cfg_root = GEN_DIR / "cfg_html_doc"
-    if not cfg_root.exists():
+    try:
+        mtime = cfg_root.stat().st_mtime_ns
+    except OSError:
         return None, None
-    for root, _dirs, _files in os.walk(cfg_root):
-        root_p = Path(root)
-        # prefer antora/modules/funcs/pages/funcs.adoc
-        if root_p.name == "pages" and "funcs" in root_p.parts and "modules" in root_p.parts:
-            cand = root_p / "funcs.adoc"
-            if cand.exists():
-                funcs_doc = cand
-        if root_p.name == "funcs" and root_p.parent.name == "adoc":
-            cand_all = root_p / "all_funcs.adoc"
-            if cand_all.exists():
-                all_funcs = cand_all
-    return funcs_doc, all_funcs
+    cached = _doc_files
+    if cached is None or cached[0] != mtime or not all(p is None or p.exists() for p in cached[1:]):
+        cached = _doc_files = (mtime, *find_doc_files(cfg_root))
+    return cached[1], cached[2]
 
 
-def _parse_all_funcs_names(all_funcs_path: Path) -> list[str]:
+@functools.lru_cache(maxsize=1)
+def _all_funcs_names(all_funcs_path: Path, _mtime_ns: int) -> tuple[str, ...]:
     """Extract function names from all_funcs.adoc."""
     names: list[str] = []
     try:
@@ -998,29 +1241,56 @@ def _parse_all_funcs_names(all_funcs_path: Path) -> list[str]:
                         names.append(back[0])
     except Exception:
         pass
-    return names
+    return tuple(names)
 
 
-def _parse_funcs_sections(funcs_path: Path) -> dict[str, str]:
-    """Parse function documentation sections."""
-    sections: dict[str, str] = {}
+def _parse_all_funcs_names(all_funcs_path: Path) -> list[str]:
+    """Function names of all_funcs.adoc, parsed again only when the file changes."""
     try:
-        with open(funcs_path, encoding="utf-8") as fh:
-            content = fh.read()
-        # Split on level 2 headings "== name" (start of line)
-        parts = re.split(r"^==\s+", content, flags=re.M)
-        # parts[0] is preamble; subsequent parts are "Name\n<body>"
-        for part in parts[1:]:
-            lines = part.splitlines()
-            if not lines:
-                continue
-            header = lines[0].strip()
-            name = header.split()[0]
-            body = "\n".join(lines[1:]).strip()
-            sections[name] = body
-    except Exception:
-        pass
-    return sections
+        mtime = all_funcs_path.stat().st_mtime_ns
+    except OSError:
+        return []
+    return list(_all_funcs_names(all_funcs_path, mtime))
+
+
+_func_docs: FuncDocs | None = None
+_func_docs_lock = threading.Lock()
+
+
+def get_func_docs() -> FuncDocs | None:
+    """
+    Return the indexed funcs.adoc, acquired for the caller (who releases it),
+    or None if gen/ has no function documentation.
+    """
+    global _func_docs
+    funcs_doc, _ = _find_funcs_adoc()
+    if funcs_doc is None:
+        return None
+    with _func_docs_lock:
+        if _func_docs is None or _func_docs.path != funcs_doc or not _func_docs.is_current():
+            docs = FuncDocs(funcs_doc, CACHE_DIR / "func_docs.json")
+            # The previous mapping is closed once no request uses it anymore
+            if _func_docs is not None:
+                _func_docs.retire()
+            _func_docs = docs
+        _func_docs.acquire()
+        return _func_docs
+
+
+@contextlib.asynccontextmanager
+async def _func_docs_in_use():
+    """get_func_docs for the duration of a request."""
+    docs = await asyncio.to_thread(get_func_docs)
+    try:
+        yield docs
+    finally:
+        if docs is not None:
+            docs.release()
+
+
+@functools.lru_cache(maxsize=1)
+def _function_name_index(names: tuple[str, ...]) -> FuzzyIndex:
+    return FuzzyIndex((n,) for n in names)
 
 
 async def search_functions(args: dict[str, Any]):
@@ -1029,33 +1299,46 @@ async def search_functions(args: dict[str, Any]):
 
     Args:
         term: search term (optional, omit or empty string to list all)
+        fuzzy: match function names typo-tolerantly (true or threshold 0-1)
         limit: max results (default 100)
 
     Returns matching functions with snippets
     """
     term = args.get("term", "")
+    fuzzy = args.get("fuzzy")
     limit = int(args.get("limit") or 100)
 
-    funcs_doc, all_funcs = _find_funcs_adoc()
-    sections = _parse_funcs_sections(funcs_doc) if funcs_doc else {}
+    async with _func_docs_in_use() as docs:
+        names = tuple(docs.sections) if docs else ()
 
-    # If no term, return all function names
-    if not term:
-        if all_funcs:
-            names = _parse_all_funcs_names(all_funcs)
-        else:
-            names = sorted(sections.keys())
-        return {"count": len(names[:limit]), "functions": names[:limit]}
-
-    # Search by term
-    out: list[dict[str, str | None]] = []
-    for k, v in sections.items():
-        if term.lower() in k.lower() or (v and term.lower() in v.lower()):
-            out.append({"name": k, "snippet": v[:300] if v else None})
-            if len(out) >= limit:
-                break
+        # If no term, return all function names
+        if not term:
+            _, all_funcs = _find_funcs_adoc()
+            names = _parse_all_funcs_names(all_funcs) if all_funcs else sorted(names)
+            return {"count": len(names[:limit]), "functions": names[:limit]}
 
-    return {"count": len(out), "results": out}
+        # Rank function names by similarity to the term
+        if fuzzy:
+            matches = _function_name_index(names).search(term, _fuzzy_threshold(fuzzy), limit)
+            fuzzy_out = [
+                {
+                    "name": names[i],
+                    "snippet": docs.snippet(names[i]),
+                    "fuzzy_score": round(score, 3),
+                }
+                for i, score in matches
+            ]
+            return {"count": len(fuzzy_out), "results": fuzzy_out}
+
+        # Search by term
+        out: list[dict[str, str | None]] = []
+        for k in names:
+            if term.lower() in k.lower() or docs.body_contains(k, term):
+                out.append({"name": k, "snippet": docs.snippet(k)})
+                if len(out) >= limit:
+                    break
+
+        return {"count": len(out), "results": out}
 
 
 async def read_function_doc(args: dict[str, Any]):
@@ -1064,62 +1347,173 @@ async def read_function_doc(args: dict[str, Any]):
     if not isinstance(name, str) or not name:
         raise ValueError("'name' is required")
 
-    funcs_doc, _ = _find_funcs_adoc()
-    sections = _parse_funcs_sections(funcs_doc) if funcs_doc else {}
-    body = sections.get(name)
-
-    # Fuzzy match if exact name not found
-    if body is None:
-        for k, v in sections.items():
-            if k.startswith(name):
-                body = v
-                name = k
-                break
+    async with _func_docs_in_use() as docs:
+        body = docs.doc(name) if docs else None
 
-    return {
-        "name": name,
-        "found": body is not None,
-        "doc": body,
-        "source": str(funcs_doc) if funcs_doc else None,
+        # Fuzzy match if exact name not found
+        if body is None and docs:
+            for k in docs.sections:
+                if k.startswith(name):
+                    body = docs.doc(k)
+                    name = k
+                    break
+
+        return {
+            "name": name,
+            "found": body is not None,
+            "doc": body,
+            "source": str(docs.path) if docs else None,
+        }
+
+
+def _usage_entry(graph: CallGraph, node: str, name: str | None = None) -> dict[str, Any]:
+    info = graph.nodes[node]
+    entry = {
+        "path": info["path"],
+        "kind": info["kind"],
+        "name": info["name"],
+        "key": info.get("key", "body"),
     }
+    if name is not None:
+        entry["calls"] = graph.caller_nodes(name).get(node, 0)
+        entry["snippet"] = graph.snippet(node, name)
+    return entry
 
 
 async def find_function_usages(args: dict[str, Any]):
-    """Find instruction YAMLs that use a specific function."""
+    """
+    Find the IDL code that calls a function.
+
+    Args:
+        name: function name (exact)
+        transitive: also include indirect callers, through other functions (default False)
+        limit: max results (default 50)
+
+    Callers are instruction operation() code, CSR sw_read() and CSR field
+    sw_write()/type()/reset_value()/legal?() code, and other global functions.
+    """
     name = args.get("name")
+    transitive = bool(args.get("transitive", False))
     limit = int(args.get("limit") or 50)
 
     if not isinstance(name, str) or not name:
         raise ValueError("'name' is required")
 
-    hits: list[dict[str, str]] = []
-    count = 0
+    graph = await asyncio.to_thread(get_call_graph)
+    if name not in graph.functions:
+        return {"name": name, "found": False, "count": 0, "results": []}
 
-    # Scan instruction YAMLs for function references
-    for p in _iter_instruction_yaml_paths():
-        try:
-            data = _load_yaml(p)
-        except Exception:
-            continue
+    if transitive:
+        by_depth = graph.reachable(name, "callers")
+        nodes = sorted(by_depth, key=lambda n: (by_depth[n], n))
+    else:
+        by_depth = None
+        nodes = sorted(graph.caller_nodes(name))
 
-        for key in ("operation()", "sail()"):
-            val = data.get(key)
-            if isinstance(val, str) and (name in val):
-                # Extract snippet around first occurrence
-                idx = val.find(name)
-                snippet = val[max(0, idx - 60) : idx + 120]
-                hits.append(
-                    {
-                        "path": str(p.relative_to(REPO_ROOT)),
-                        "key": key,
-                        "snippet": snippet,
-                    }
-                )
-                count += 1
-                if count >= limit:
-                    return {"count": count, "results": hits}
+    hits: list[dict[str, Any]] = []
+    for node in nodes[:limit]:
+        entry = _usage_entry(graph, node, name if by_depth is None or by_depth[node] == 1 else None)
+        if by_depth is not None:
+            entry["depth"] = by_depth[node]
+        hits.append(entry)
+
+    return {
+        "name": name,
+        "found": True,
+        "defined_in": graph.functions[name][0],
+        "usage_count": graph.usage_counts[name],
+        "caller_count": len(graph.caller_nodes(name)),
+        "count": len(nodes),
+        "results": hits,
+    }
+
+
+async def function_call_graph(args: dict[str, Any]):
+    """
+    Query the IDL call graph.
+
+    Args:
+        name: function name (omit to list every function with its usage counts)
+        direction: "callees" (functions it calls, default) or "callers"
+        transitive: follow calls through intermediate functions (default False)
+        max_depth: limit for transitive queries (optional)
+        limit: max results (default 100)
+    """
+    name = args.get("name")
+    direction = args.get("direction") or "callees"
+    transitive = bool(args.get("transitive", False))
+    max_depth = args.get("max_depth")
+    limit = int(args.get("limit") or 100)
+
+    if direction not in {"callers", "callees"}:
+        raise ValueError("'direction' must be 'callers' or 'callees'")
+    if max_depth is not None:
+        max_depth = int(max_depth)
+
+    graph = await asyncio.to_thread(get_call_graph)
+
+    if not name:
+        ranked = sorted(graph.usage_counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        functions = [
+            {"name": f, "usage_count": n, "caller_count": len(graph.caller_nodes(f))}
+            for f, n in ranked[:limit]
+        ]
+        return {"count": len(ranked), "functions": functions}
+
+    if name not in graph.functions:
+        return {"name": name, "found": False}
+
+    if transitive or max_depth is not None:
+        by_depth = graph.reachable(name, direction, max_depth)
+    elif direction == "callers":
+        by_depth = dict.fromkeys(graph.caller_nodes(name), 1)
+    else:
+        by_depth = {f"function:{f}": 1 for f in graph.callee_names(f"function:{name}")}
+
+    nodes = sorted(by_depth, key=lambda n: (by_depth[n], n))
+    results = []
+    for node in nodes[:limit]:
+        entry = _usage_entry(graph, node)
+        entry["depth"] = by_depth[node]
+        results.append(entry)
+
+    return {
+        "name": name,
+        "found": True,
+        "defined_in": graph.functions[name][0],
+        "direction": direction,
+        "usage_count": graph.usage_counts[name],
+        "count": len(nodes),
+        "results": results,
+    }
+
+
+# ============================================================================
+# Server Tools
+# ============================================================================
 
-    return {"count": count, "results": hits}
+
+def _response_cursors(result: dict[str, Any]) -> tuple[str, ...]:
+    """next_cursor values of a response, including the per-domain ones of search_all."""
+    cursors = [result.get("next_cursor")]
+    if isinstance(result.get("results"), dict):
+        cursors.extend(
+            r.get("next_cursor") for r in result["results"].values() if isinstance(r, dict)
+        )
+    return tuple(c for c in cursors if c)
+
+
+async def server_stats():
+    """Catalog size, query cache counters, open result sets and tool call latencies."""
+    return {
+        "uptime_seconds": round(time.time() - _started, 1),
+        "transport": _transport,
+        "catalog_records": get_catalog().stats(),
+        "query_cache": _query_cache.stats(),
+        "result_sets": len(_result_sets),
+        "rate_limit": _rate_limiter.stats(),
+        "latency": _latency.snapshot(),
+    }
 
 
 # ============================================================================
@@ -1127,7 +1521,134 @@ async def find_function_usages(args: dict[str, Any]):
 # ============================================================================
 
 
-async def main() -> None:
+# Tool name -> handler; list_gen_yaml and server_stats take no arguments
+TOOL_HANDLERS: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {
+    "list_gen_yaml": list_gen_yaml,
+    "read_gen_yaml": read_gen_yaml,
+    "search_instructions": search_instructions,
+    "search_encoding": search_encoding,
+    "search_csrs": search_csrs,
+    "query_csr_space": query_csr_space,
+    "search_extensions": search_extensions,
+    "search_all": search_all,
+    "search_text": search_text,
+    "search_functions": search_functions,
+    "read_function_doc": read_function_doc,
+    "find_function_usages": find_function_usages,
+    "function_call_graph": function_call_graph,
+    "server_stats": server_stats,
+}
+NO_ARG_TOOLS = {"list_gen_yaml", "server_stats"}
+
+# Bounds the tool calls served at once; set by main()
+_call_slots: asyncio.Semaphore | None = None
+
+
+async def _call_tool(
+    name: str, arguments: dict[str, Any] | None, client: str = "local", ctx: Any = None
+) -> list[TextContent]:
+    """
+    Serve one tool call: rate limit, concurrency slot, latency histogram.
+
+    `ctx` is the MCP request context (for progress notifications); without it,
+    as when called in-process (see bench.py), no progress is reported.
+    """
+    if not _rate_limiter.allow(client):
+        raise ValueError(f"Rate limit exceeded for {client}; retry shortly")
+
+    start = time.perf_counter()
+    failed = True
+    try:
+        if _call_slots is not None:
+            async with _call_slots:
+                content = await _run_tool(name, arguments or {}, ctx)
+        else:
+            content = await _run_tool(name, arguments or {}, ctx)
+        failed = False
+        return content
+    finally:
+        _latency.record(name, (time.perf_counter() - start) * 1000, failed)
+
+
+def _source_stamp(name: str) -> tuple:
+    """Stamp of the non-YAML files a tool reads; () for tools that only read the catalog."""
+    if name in FUNC_DOC_TOOLS:
+        return isa_stamp([p for p in _find_funcs_adoc() if p is not None])
+    if name in CALL_GRAPH_TOOLS:
+        return isa_stamp(isa_files(get_catalog()))
+    return ()
+
+
+async def _run_tool(name: str, args: dict[str, Any], ctx: Any = None) -> list[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if not handler:
+        raise ValueError(f"Unknown tool: {name}")
+
+    # Partial results are streamed as progress notifications when the client asks for them
+    token = ctx.meta.progressToken if ctx is not None and ctx.meta else None
+    if token is not None:
+
+        async def report(progress: float, total: float | None, message: str) -> None:
+            await ctx.session.send_progress_notification(
+                token, progress, total, message, related_request_id=str(ctx.request_id)
+            )
+
+        _progress.set(report)
+
+    # Repeated queries are answered from the cache. Cursor pages are not cached,
+    # and a cached first page is only reused while its cursors are still served.
+    generation = get_catalog().generation
+    key = None
+    if name not in UNCACHED_TOOLS and not args.get("cursor"):
+        stamp = _source_stamp(name)
+        key = cache_key(name, args, generation, stamp)
+        cached = _query_cache.get(key)
+        if cached is not None:
+            text, cursors = cached
+            if all(_result_sets.alive(c) for c in cursors):
+                return [TextContent(type="text", text=text)]
+            _query_cache.discard(key)
+
+    result = await handler() if name in NO_ARG_TOOLS else await handler(args)
+
+    result["catalog"] = catalog_info()
+    text = json.dumps(result, indent=2)
+
+    # Partial (timed out) results and results computed across a refresh are not cached
+    if (
+        key is not None
+        and not result.get("timed_out")
+        and get_catalog().generation == generation
+        and _source_stamp(name) == stamp
+    ):
+        _query_cache.put(key, (text, _response_cursors(result)), len(text))
+
+    # Return properly formatted MCP response
+    return [TextContent(type="text", text=text)]
+
+
+async def main(
+    transport: str = "stdio",
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+    burst: int = DEFAULT_BURST,
+) -> None:
+    global _call_slots, _catalog, _rate_limiter, _transport
+    # Blocking work of the handlers runs on a bounded pool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-worker")
+    )
+    _call_slots = asyncio.Semaphore(workers)
+    _transport = transport
+    if transport == "http":
+        _rate_limiter = RateLimiter(rate_limit, burst)
+
+    # Parse gen/ once before serving; tool calls only read the in-memory catalog
+    _catalog = await asyncio.to_thread(Catalog.build, REPO_ROOT, GEN_DIR)
+    watch_task = asyncio.create_task(watch_catalog(get_catalog, _swap_catalog))
+
     server = Server("riscv-udb-mcp")
 
     @server.list_tools()
@@ -1144,14 +1665,39 @@ async def main() -> None:
             ),
             Tool(
                 name="read_gen_yaml",
-                description="Read and parse a YAML file under gen/; returns JSON",
+                description=(
+                    "Read and parse a YAML file under gen/; returns JSON. Use fields to "
+                    "select parts (e.g. 'fields.FS.location_rv64', '$.fields.*.type', "
+                    "'$..reset_value') and max_depth/max_bytes to bound the response"
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "path": {
                             "type": "string",
                             "description": "repo-relative path under gen/",
-                        }
+                        },
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": (
+                                "Paths to return, dotted or JSONPath ($, .key, ['key'], [n], "
+                                "*, ..key); data becomes {concrete path: value}"
+                            ),
+                        },
+                        "max_depth": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "description": "Summarize containers nested deeper than this",
+                        },
+                        "max_bytes": {
+                            "type": "integer",
+                            "minimum": 64,
+                            "description": (
+                                "Approximate limit on the JSON size of data; cut strings "
+                                "and dropped keys are listed in omitted"
+                            ),
+                        },
                     },
                     "required": ["path"],
                 },
@@ -1159,7 +1705,10 @@ async def main() -> None:
             # ===== Instruction Tools =====
             Tool(
                 name="search_instructions",
-                description="Search instruction YAMLs with advanced filtering (regex, fuzzy matching, field-specific, XLEN)",
+                description=(
+                    "Search instruction YAMLs with advanced filtering (regex, fuzzy matching, field-specific, "
+                    "XLEN). Results are ranked; follow next_cursor for more pages."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -1208,6 +1757,75 @@ async def main() -> None:
                             "minimum": 1,
                             "maximum": 500,
                             "default": 50,
+                            "description": "page size",
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor of a previous response; returns the next page of that search",
+                        },
+                    },
+                },
+            ),
+            Tool(
+                name="search_encoding",
+                description=(
+                    "Search instructions by encoding bits: decode a raw instruction word, or find "
+                    "encodings compatible with a partial pattern (match string with '-', "
+                    "mask/value, or field constraints such as opcode/funct3/funct7 or bit ranges)"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "word": {
+                            "type": ["integer", "string"],
+                            "description": "raw instruction word to decode, e.g. '0x00b50533'",
+                        },
+                        "match": {
+                            "type": "string",
+                            "description": "pattern in encoding.match syntax (MSB first, '-' = any)",
+                        },
+                        "mask": {
+                            "type": ["integer", "string"],
+                            "description": "bits constrained by 'value'",
+                        },
+                        "value": {"type": ["integer", "string"]},
+                        "fields": {
+                            "type": "object",
+                            "description": (
+                                "{field: value}; field is opcode, rd, funct3, rs1, rs2, funct7, "
+                                "funct2, funct5, funct6, rs3, vm, c.op, c.funct3, c.funct4 or a bit "
+                                "location like '14-12'; values are ints, '0x..'/'0b..' or bare binary"
+                            ),
+                            "additionalProperties": {"type": ["integer", "string"]},
+                        },
+                        "mode": {
+                            "type": "string",
+                            "enum": list(MODES),
+                            "default": "compatible",
+                            "description": "compatible: fixed bits agree; fixed: encoding fixes all queried bits",
+                        },
+                        "width": {
+                            "type": "integer",
+                            "enum": [16, 32, 48, 64],
+                            "description": "length of 'word' (default: from its low bits)",
+                        },
+                        "extensions": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "filter by extension names",
+                        },
+                        "xlen": {
+                            "description": "filter by XLEN: 32, 64, or [32, 64]",
+                            "oneOf": [
+                                {"type": "integer", "enum": [32, 64]},
+                                {"type": "array", "items": {"type": "integer", "enum": [32, 64]}},
+                            ],
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 1000,
+                            "default": 50,
                         },
                     },
                 },
@@ -1215,7 +1833,10 @@ async def main() -> None:
             # ===== CSR Tools =====
             Tool(
                 name="search_csrs",
-                description="Search CSR YAMLs with advanced filtering (regex, fuzzy matching, field-specific, XLEN)",
+                description=(
+                    "Search CSR YAMLs with advanced filtering (regex, fuzzy matching, field-specific, "
+                    "XLEN). Results are ranked; follow next_cursor for more pages."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -1264,6 +1885,49 @@ async def main() -> None:
                             "minimum": 1,
                             "maximum": 500,
                             "default": 50,
+                            "description": "page size",
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor of a previous response; returns the next page of that search",
+                        },
+                    },
+                },
+            ),
+            Tool(
+                name="query_csr_space",
+                description=(
+                    "CSR address space and field layout queries: CSRs in an address range, the "
+                    "fields of a CSR (or of all CSRs) overlapping a bit range, and free custom CSR "
+                    "addresses for a privilege mode"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "start": {
+                            "type": ["integer", "string"],
+                            "description": "first address of the range, e.g. '0x7a0'",
+                        },
+                        "end": {
+                            "type": ["integer", "string"],
+                            "description": "last address of the range (inclusive, default start)",
+                        },
+                        "csr": {"type": "string", "description": "CSR name, e.g. 'mstatus'"},
+                        "bits": {
+                            "type": ["integer", "string", "array"],
+                            "description": "bit range, e.g. '12-11'",
+                        },
+                        "xlen": {"type": "integer", "enum": [32, 64]},
+                        "free_custom": {
+                            "type": "string",
+                            "enum": sorted(CUSTOM_CSR_RANGES),
+                            "description": "privilege mode whose free custom CSR addresses to list",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 4096,
+                            "default": 200,
                         },
                     },
                 },
@@ -1273,7 +1937,8 @@ async def main() -> None:
                 name="search_extensions",
                 description=(
                     "Flexible extension query: list all extensions (omit name) or get detailed info for "
-                    "a specific extension (provide name). Optionally include instructions/CSRs."
+                    "a specific extension (provide name) with its implied/required extensions and "
+                    "their closure. Optionally include instructions/CSRs/parameters/exception codes."
                 ),
                 inputSchema={
                     "type": "object",
@@ -1292,6 +1957,16 @@ async def main() -> None:
                             "default": False,
                             "description": "include CSR summary",
                         },
+                        "include_params": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "include parameter summary",
+                        },
+                        "include_exception_codes": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "include exception code summary",
+                        },
                         "limit": {
                             "type": "integer",
                             "minimum": 1,
@@ -1307,7 +1982,8 @@ async def main() -> None:
                 name="search_all",
                 description=(
                     "Search across multiple domains (instructions, CSRs, extensions) simultaneously. "
-                    "Supports regex, fuzzy matching, and XLEN filtering."
+                    "Supports regex, fuzzy matching, and XLEN filtering. Domains run concurrently; "
+                    "with a progressToken, each domain's results arrive as a progress notification."
                 ),
                 inputSchema={
                     "type": "object",
@@ -1358,10 +2034,55 @@ async def main() -> None:
                             "maximum": 100,
                             "default": 20,
                         },
+                        "timeout_ms": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "default": 30000,
+                            "description": "deadline; domains not finished in time are listed in timed_out",
+                        },
                     },
                     "required": ["term"],
                 },
             ),
+            # ===== Full-Text Search =====
+            Tool(
+                name="search_text",
+                description=(
+                    "BM25-ranked full-text search over instruction descriptions and operation()/sail() "
+                    "code, CSR and CSR field descriptions, and extension descriptions. Supports "
+                    '"phrases", AND (default), OR, NOT/-term and parentheses; dotted names such as '
+                    "mstatus.FS match as phrases (e.g. CSR[mstatus].FS in IDL)."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": 'e.g. mstatus.FS, "page fault" OR misaligned, fence -fence.i',
+                        },
+                        "domains": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                                "enum": ["instructions", "csrs", "extensions"],
+                            },
+                            "description": "domains to search (default: all)",
+                        },
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": list(FIELD_GROUPS)},
+                            "description": "only match within these fields",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 500,
+                            "default": 20,
+                        },
+                    },
+                    "required": ["query"],
+                },
+            ),
             # ===== Function/IDL Tools =====
             Tool(
                 name="search_functions",
@@ -1373,6 +2094,13 @@ async def main() -> None:
                             "type": "string",
                             "description": "search term (omit for full list)",
                         },
+                        "fuzzy": {
+                            "description": "rank function names by similarity (true or threshold 0-1)",
+                            "oneOf": [
+                                {"type": "boolean"},
+                                {"type": "number", "minimum": 0, "maximum": 1},
+                            ],
+                        },
                         "limit": {
                             "type": "integer",
                             "minimum": 1,
@@ -1393,11 +2121,20 @@ async def main() -> None:
             ),
             Tool(
                 name="find_function_usages",
-                description="Find instruction YAMLs whose operation()/sail() code reference the function",
+                description=(
+                    "Find the IDL code that calls a function (exact name): instruction operation(), "
+                    "CSR sw_read() and field sw_write()/type()/reset_value()/legal?(), and other "
+                    "functions. Reports call counts; 'transitive' adds indirect callers."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "name": {"type": "string", "description": "function name"},
+                        "transitive": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "include callers of callers",
+                        },
                         "limit": {
                             "type": "integer",
                             "minimum": 1,
@@ -1408,47 +2145,106 @@ async def main() -> None:
                     "required": ["name"],
                 },
             ),
+            Tool(
+                name="function_call_graph",
+                description=(
+                    "Query the IDL call graph: functions called by a function (callees) or code "
+                    "calling it (callers), directly or transitively. Omit name to list all "
+                    "functions by usage count."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "name": {
+                            "type": "string",
+                            "description": "function name (omit for usage counts)",
+                        },
+                        "direction": {
+                            "type": "string",
+                            "enum": ["callees", "callers"],
+                            "default": "callees",
+                        },
+                        "transitive": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "follow calls through intermediate functions",
+                        },
+                        "max_depth": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "depth limit for transitive queries",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 1000,
+                            "default": 100,
+                        },
+                    },
+                },
+            ),
+            # ===== Server Tools =====
+            Tool(
+                name="server_stats",
+                description=(
+                    "Server statistics: catalog size and generation, query cache entries, bytes, "
+                    "hits, misses and evictions"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            ),
         ]
 
     @server.call_tool()
-    async def _call_tool(name: str, arguments: dict[str, Any] | None):
-        args = arguments or {}
-
-        # Route to appropriate handler
-        handlers = {
-            "list_gen_yaml": list_gen_yaml,
-            "read_gen_yaml": read_gen_yaml,
-            "search_instructions": search_instructions,
-            "search_csrs": search_csrs,
-            "search_extensions": search_extensions,
-            "search_all": search_all,
-            "search_functions": search_functions,
-            "read_function_doc": read_function_doc,
-            "find_function_usages": find_function_usages,
-        }
-
-        handler = handlers.get(name)
-        if not handler:
-            raise ValueError(f"Unknown tool: {name}")
+    async def _handle_call_tool(name: str, arguments: dict[str, Any] | None):
+        ctx = server.request_context
+        client = client_id(ctx.request) if ctx.request is not None else "stdio"
+        return await _call_tool(name, arguments, client, ctx)
 
-        # Call handler (pass args only if function expects them)
-        if name == "list_gen_yaml":
-            result = await handler()
+    try:
+        if transport == "http":
+            # One shared process for many clients
+            await serve_http(server, host, port)
         else:
-            result = await handler(args)
-
-        # Return properly formatted MCP response
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-    # Run over stdio transport (for MCP clients)
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+            # Run over stdio transport (for MCP clients)
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options(),
+                )
+    finally:
+        watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watch_task
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP server for RISC-V Unified Database")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default="stdio",
+        help="stdio (one client, default) or streamable HTTP on localhost (shared)",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="HTTP port")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="concurrent tool calls"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help="HTTP tool calls per second per client (0 disables)",
+    )
+    parser.add_argument(
+        "--burst", type=int, default=DEFAULT_BURST, help="HTTP calls a client may burst"
+    )
+    opts = parser.parse_args()
     with contextlib.suppress(KeyboardInterrupt):
-        asyncio.run(main())
+        asyncio.run(
+            main(opts.transport, opts.host, opts.port, opts.workers, opts.rate_limit, opts.burst)
+        )
@@ -0,0 +1,111 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+import watcher
+from catalog import Catalog
+
+
+def write_inst(gen_dir: Path, name: str, subdir: str = "spec") -> Path:
+    path = gen_dir / subdir / "isa" / "inst" / "I" / f"{name}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"kind: instruction\nname: {name}\ndefinedBy: I\n")
+    return path
+
+
+@pytest.fixture
+def gen_dir(tmp_path: Path) -> Path:
+    gen = tmp_path / "gen"
+    write_inst(gen, "add")
+    write_inst(gen, "add", "resolved_spec")
+    return gen
+
+
+def names(catalog: Catalog) -> list[str]:
+    return sorted(rec.name for rec in catalog.domains["instructions"])
+
+
+def test_updated_reindexes_changed_files(gen_dir: Path):
+    catalog = Catalog.build(gen_dir.parent, gen_dir)
+    sub = write_inst(gen_dir, "sub")
+    add = gen_dir / "spec" / "isa" / "inst" / "I" / "add.yaml"
+    add.unlink()
+
+    new = catalog.updated({sub, add})
+    assert new.generation == catalog.generation + 1
+    assert names(new) == ["add", "sub"]
+    assert names(catalog) == ["add", "add"]
+
+
+def run_watcher(gen_dir: Path, actions, expect, poll: bool, monkeypatch) -> list[Catalog]:
+    """Apply each action in turn with the watcher running; wait for `expect` after each."""
+    if poll:
+        monkeypatch.setattr(watcher, "watchfiles", None)
+    catalogs = [Catalog.build(gen_dir.parent, gen_dir)]
+
+    def swap(new: Catalog, _seconds: float, _changed: int) -> None:
+        catalogs.append(new)
+
+    async def main() -> None:
+        task = asyncio.create_task(watcher.watch_catalog(lambda: catalogs[-1], swap, 0.05))
+        try:
+            for action, expected in zip(actions, expect, strict=True):
+                await asyncio.sleep(0.3)
+                action()
+                async with asyncio.timeout(10):
+                    while names(catalogs[-1]) != expected:
+                        await asyncio.sleep(0.05)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(main())
+    return catalogs
+
+
+@pytest.mark.parametrize("poll", [False, True], ids=["inotify", "poll"])
+def test_watch_picks_up_changes(gen_dir: Path, poll: bool, monkeypatch):
+    if not poll:
+        pytest.importorskip("watchfiles")
+    spec = gen_dir / "spec"
+    run_watcher(
+        gen_dir,
+        [
+            lambda: write_inst(gen_dir, "sub"),
+            # bin/clean and a regeneration remove and recreate the watched directories
+            lambda: shutil.rmtree(spec),
+            lambda: write_inst(gen_dir, "xor"),
+            lambda: shutil.rmtree(gen_dir),
+            lambda: write_inst(gen_dir, "and"),
+        ],
+        [["add", "add", "sub"], ["add"], ["add", "xor"], [], ["and"]],
+        poll,
+        monkeypatch,
+    )
+
+
+def test_watch_survives_failed_refresh(gen_dir: Path, monkeypatch, caplog):
+    updated = Catalog.updated
+    failures = []
+
+    def flaky(self: Catalog, changed):
+        if not failures:
+            failures.append(changed)
+            raise PermissionError("gen/spec")
+        return updated(self, changed)
+
+    monkeypatch.setattr(Catalog, "updated", flaky)
+    run_watcher(
+        gen_dir,
+        [lambda: write_inst(gen_dir, "sub"), lambda: write_inst(gen_dir, "xor")],
+        [["add", "add"], ["add", "add", "sub", "xor"]],
+        True,
+        monkeypatch,
+    )
+    assert failures
+    assert "Refreshing the catalog" in caplog.text
@@ -0,0 +1,411 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Full-text index over descriptions and IDL/Sail bodies
+
+Every instruction, CSR and extension in the catalog is one document made of
+its text fields: description, operation() and sail() for instructions,
+description and per-field descriptions for CSRs, description for extensions.
+Text is split into lowercase identifier/number tokens, so `CSR[mstatus].FS`
+becomes `csr mstatus fs`, and positions are kept per token for phrase queries.
+
+Queries combine terms and "quoted phrases" with AND (the default between
+items), OR, NOT / -term and parentheses; an unquoted term that tokenizes into
+several tokens (e.g. mstatus.FS) is treated as a phrase. Matching documents are
+ranked with BM25 over their positive terms.
+
+The index is saved as gzipped JSON under gen/.mcp_cache, together with a
+fingerprint of the indexed files, and reused when the fingerprint matches.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from catalog import Catalog, Record
+
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+
+# Domains whose records are indexed
+TEXT_DOMAINS = ("instructions", "csrs", "extensions")
+
+# Field groups accepted by the `fields` filter
+FIELD_GROUPS = ("description", "operation()", "sail()", "fields")
+
+
+def tokenize(text: str) -> list[str]:
+    return [m.group().lower() for m in TOKEN_RE.finditer(text)]
+
+
+def _as_text(value: Any) -> str | None:
+    """Text of a description-like value (a string, or a list of strings / {text: ...} entries)."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        parts = [v.get("text") if isinstance(v, dict) else v for v in value]
+        return "\n".join(p for p in parts if isinstance(p, str))
+    return None
+
+
+def document_fields(rec: Record) -> list[tuple[str, str]]:
+    """(field name, text) pairs indexed for a record."""
+    if rec.domain not in TEXT_DOMAINS:
+        return []
+    data = rec.data
+    out: list[tuple[str, str]] = []
+    keys = (
+        ("description", "operation()", "sail()")
+        if rec.domain == "instructions"
+        else ("description",)
+    )
+    for key in keys:
+        text = _as_text(data.get(key))
+        if text:
+            out.append((key, text))
+    if rec.domain == "csrs" and isinstance(data.get("fields"), dict):
+        for name, fld in data["fields"].items():
+            text = _as_text(fld.get("description")) if isinstance(fld, dict) else None
+            if text:
+                out.append((f"fields.{name}.description", text))
+    return out
+
+
+def field_group(field: str) -> str:
+    return "fields" if field.startswith("fields.") else field
+
+
+def fingerprint(catalog: Catalog) -> str:
+    """Hash of the indexed files and their modification times."""
+    digest = hashlib.sha256(f"v{INDEX_VERSION}".encode())
+    for path in sorted(catalog.records):
+        if catalog.records[path].domain not in TEXT_DOMAINS:
+            continue
+        digest.update(f"{catalog.records[path].rel}\0{catalog.mtimes.get(path)}\n".encode())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Query Parsing
+# ============================================================================
+
+QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\()|(\))|(-)(?=\S)|([^\s()"]+)')
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _lex(query: str) -> list[tuple[str, str]]:
+    items = []
+    for m in QUERY_TOKEN_RE.finditer(query):
+        phrase, lpar, rpar, minus, word = m.groups()
+        if phrase is not None:
+            items.append(("phrase", phrase))
+        elif lpar:
+            items.append(("(", lpar))
+        elif rpar:
+            items.append((")", rpar))
+        elif minus:
+            items.append(("NOT", minus))
+        elif word in {"AND", "OR", "NOT"}:
+            items.append((word, word))
+        else:
+            items.append(("phrase", word))
+    return items
+
+
+def parse_query(query: str) -> tuple:
+    """
+    Parse a query into a tree of ("and", a, b), ("or", a, b), ("not", a) and
+    ("phrase", tokens) nodes.
+    """
+    items = _lex(query)
+    pos = 0
+
+    def peek() -> str | None:
+        return items[pos][0] if pos < len(items) else None
+
+    def take() -> tuple[str, str]:
+        nonlocal pos
+        pos += 1
+        return items[pos - 1]
+
+    def parse_or() -> tuple:
+        node = parse_and()
+        while peek() == "OR":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and() -> tuple:
+        node = parse_unary()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, parse_unary())
+        return node
+
+    def parse_unary() -> tuple:
+        kind = peek()
+        if kind == "NOT":
+            take()
+            return ("not", parse_unary())
+        if kind == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise QueryError("Unbalanced parentheses in query")
+            take()
+            return node
+        if kind == "phrase":
+            tokens = tokenize(take()[1])
+            if not tokens:
+                raise QueryError("Query term has no searchable characters")
+            return ("phrase", tokens)
+        raise QueryError(f"Unexpected {kind or 'end of query'!r} in query")
+
+    if not items:
+        raise QueryError("Query is empty")
+    tree = parse_or()
+    if pos != len(items):
+        raise QueryError(f"Unexpected {items[pos][1]!r} in query")
+    return tree
+
+
+def positive_tokens(tree: tuple) -> list[str]:
+    """Tokens that contribute to the score (those not under a NOT)."""
+    if tree[0] == "phrase":
+        return list(tree[1])
+    if tree[0] == "not":
+        return []
+    return positive_tokens(tree[1]) + positive_tokens(tree[2])
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+
+class TextIndex:
+    """Positional inverted index with BM25 ranking."""
+
+    def __init__(
+        self,
+        docs: list[str],
+        doc_fields: list[list[tuple[str, int, int]]],
+        lengths: list[int],
+        postings: dict[str, dict[int, list[int]]],
+        fp: str,
+    ):
+        # docs[i] is the repo-relative path of document i
+        self.docs = docs
+        # (field name, first position, end position) per document
+        self.doc_fields = doc_fields
+        self.lengths = lengths
+        # token -> {document: [positions]}
+        self.postings = postings
+        self.fingerprint = fp
+        self.avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+        self.generation = 0
+        # Catalog the documents belong to; search results are resolved through it
+        self.catalog: Catalog | None = None
+
+    @classmethod
+    def build(cls, catalog: Catalog) -> "TextIndex":
+        docs: list[str] = []
+        doc_fields: list[list[tuple[str, int, int]]] = []
+        lengths: list[int] = []
+        postings: dict[str, dict[int, list[int]]] = {}
+        for path in sorted(catalog.records):
+            rec = catalog.records[path]
+            fields = document_fields(rec)
+            if not fields:
+                continue
+            doc = len(docs)
+            spans = []
+            pos = 0
+            for field, text in fields:
+                start = pos
+                for token in tokenize(text):
+                    postings.setdefault(token, {}).setdefault(doc, []).append(pos)
+                    pos += 1
+                spans.append((field, start, pos))
+                # Leave a gap so that phrases never span two fields
+                pos += 1
+            docs.append(rec.rel)
+            doc_fields.append(spans)
+            lengths.append(pos - len(fields))
+        return cls(docs, doc_fields, lengths, postings, fingerprint(catalog))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Write the index atomically as gzipped JSON."""
+        payload = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "docs": self.docs,
+            "doc_fields": self.doc_fields,
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with (
+                os.fdopen(fd, "wb") as raw,
+                gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as fh,
+            ):
+                fh.write(json.dumps(payload, separators=(",", ":")).encode())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "TextIndex | None":
+        """Read a saved index, or None if it is missing or from another index version."""
+        try:
+            with gzip.open(path, "rb") as fh:
+                payload = json.loads(fh.read())
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        postings = {
+            token: {int(doc): positions for doc, positions in by_doc.items()}
+            for token, by_doc in payload["postings"].items()
+        }
+        doc_fields = [[tuple(span) for span in spans] for spans in payload["doc_fields"]]
+        return cls(
+            payload["docs"], doc_fields, payload["lengths"], postings, payload["fingerprint"]
+        )
+
+    @classmethod
+    def load_or_build(cls, catalog: Catalog, path: Path) -> "TextIndex":
+        """Reuse the index saved at path if it matches the catalog, else rebuild and save it."""
+        index = cls.load(path)
+        if index is None or index.fingerprint != fingerprint(catalog):
+            index = cls.build(catalog)
+            # A read-only gen/ only costs a rebuild next time
+            with contextlib.suppress(OSError):
+                index.save(path)
+        index.generation = catalog.generation
+        index.catalog = catalog
+        return index
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _in_fields(self, doc: int, pos: int, groups: set[str] | None) -> bool:
+        if groups is None:
+            return True
+        return any(
+            start <= pos < end and field_group(field) in groups
+            for field, start, end in self.doc_fields[doc]
+        )
+
+    def _phrase(self, tokens: list[str], groups: set[str] | None) -> dict[int, list[int]]:
+        """{document: start positions} of a phrase."""
+        lists = [self.postings.get(t) for t in tokens]
+        if not all(lists):
+            return {}
+        docs = set(lists[0])
+        for by_doc in lists[1:]:
+            docs.intersection_update(by_doc)
+        out: dict[int, list[int]] = {}
+        for doc in docs:
+            starts = set(lists[0][doc])
+            for offset, by_doc in enumerate(lists[1:], 1):
+                starts.intersection_update(p - offset for p in by_doc[doc])
+                if not starts:
+                    break
+            hits = sorted(p for p in starts if self._in_fields(doc, p, groups))
+            if hits:
+                out[doc] = hits
+        return out
+
+    def evaluate(self, tree: tuple, groups: set[str] | None, universe: set[int]) -> set[int]:
+        """Documents (within universe) matching a parsed query."""
+        op = tree[0]
+        if op == "phrase":
+            return set(self._phrase(tree[1], groups)) & universe
+        if op == "not":
+            return universe - self.evaluate(tree[1], groups, universe)
+        left = self.evaluate(tree[1], groups, universe)
+        if op == "and":
+            return left & self.evaluate(tree[2], groups, left) if left else left
+        return left | self.evaluate(tree[2], groups, universe)
+
+    def bm25(self, doc: int, tokens: list[str]) -> float:
+        n = len(self.docs)
+        norm = K1 * (1 - B + B * self.lengths[doc] / self.avg_length) if self.avg_length else K1
+        score = 0.0
+        for token in set(tokens):
+            by_doc = self.postings.get(token)
+            if not by_doc or doc not in by_doc:
+                continue
+            df = len(by_doc)
+            tf = len(by_doc[doc])
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+            score += idf * tf * (K1 + 1) / (tf + norm)
+        return score
+
+    def matched_fields(self, doc: int, tokens: list[str], groups: set[str] | None) -> list[str]:
+        """Fields of a document that contain any of the tokens."""
+        positions = set()
+        for token in tokens:
+            positions.update(self.postings.get(token, {}).get(doc, ()))
+        return [
+            field
+            for field, start, end in self.doc_fields[doc]
+            if (groups is None or field_group(field) in groups)
+            and any(start <= p < end for p in positions)
+        ]
+
+    @staticmethod
+    def query_tokens(query: str) -> list[str]:
+        """Tokens of a query that contribute to ranking and snippets."""
+        return positive_tokens(parse_query(query))
+
+    def search(
+        self,
+        query: str,
+        docs: set[int] | None = None,
+        groups: set[str] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return (document, BM25 score) for every match, best first."""
+        tree = parse_query(query)
+        universe = set(range(len(self.docs))) if docs is None else docs
+        matches = self.evaluate(tree, groups, universe)
+        tokens = positive_tokens(tree)
+        scored = [(doc, self.bm25(doc, tokens)) for doc in matches]
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored
+
+
+def snippet(text: str, tokens: list[str], width: int = 160) -> str:
+    """Excerpt of text around the first occurrence of any token."""
+    wanted = set(tokens)
+    for m in TOKEN_RE.finditer(text):
+        if m.group().lower() in wanted:
+            start = max(0, m.start() - width // 3)
+            return text[start : start + width].strip()
+    return text[:width].strip()
@@ -0,0 +1,143 @@
+# Copyright (c) Synopsys, Inc.
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+Background refresh of the catalog when gen/ is regenerated
+
+gen/resolved_spec and gen/spec are watched with inotify (through the optional
+`watchfiles` package) or, when it is not installed, by polling file
+modification times. inotify watches gen/ itself, so the two directories may be
+removed and created again; once gen/ itself is removed (bin/clean) its watch is
+gone and the watcher falls back to polling. Each batch of changed paths is
+re-indexed in a worker thread with Catalog.updated and the result is handed to
+a callback that swaps it in, so queries keep using the previous catalog until
+the new one is ready.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+from catalog import Catalog, scan_yaml
+
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+# Directories under gen/ whose YAML feeds the catalog
+WATCH_SUBDIRS = ("resolved_spec", "spec")
+
+# Seconds between mtime scans when inotify is not available
+POLL_INTERVAL = 2.0
+
+log = logging.getLogger(__name__)
+
+
+def watched_dirs(gen_dir: Path) -> list[Path]:
+    return [gen_dir / d for d in WATCH_SUBDIRS]
+
+
+def scan_dirs(dirs: list[Path]) -> dict[Path, int]:
+    mtimes: dict[Path, int] = {}
+    for d in dirs:
+        mtimes.update(scan_yaml(d))
+    return mtimes
+
+
+def changed_paths(old: dict[Path, int], new: dict[Path, int]) -> set[Path]:
+    """Paths added, removed or with a different mtime between two scans."""
+    changed = {p for p, mtime in new.items() if old.get(p) != mtime}
+    changed.update(p for p in old if p not in new)
+    return changed
+
+
+async def poll_changes(
+    get_catalog: Callable[[], Catalog], interval: float = POLL_INTERVAL
+) -> AsyncIterator[set[Path]]:
+    """Yield batches of changed paths by comparing mtimes against the current catalog."""
+    while True:
+        await asyncio.sleep(interval)
+        catalog = get_catalog()
+        dirs = watched_dirs(catalog.gen_dir)
+
+        try:
+            current = await asyncio.to_thread(scan_dirs, dirs)
+        except Exception:
+            log.exception("Scanning %s failed", catalog.gen_dir)
+            continue
+        known = {p: m for p, m in catalog.mtimes.items() if any(p.is_relative_to(d) for d in dirs)}
+        changed = changed_paths(known, current)
+        if changed:
+            yield changed
+
+
+async def inotify_changes(gen_dir: Path) -> AsyncIterator[set[Path]]:
+    """
+    Yield batches of changed paths reported by watchfiles (debounced).
+
+    Returns once gen/ itself is removed or replaced, as its watch no longer
+    sees the new directory.
+    """
+    dirs = watched_dirs(gen_dir)
+    inode = gen_dir.stat().st_ino
+
+    def relevant(_change: object, path: str) -> bool:
+        p = Path(path)
+        return p == gen_dir or any(p.is_relative_to(d) for d in dirs)
+
+    changes = watchfiles.awatch(gen_dir, watch_filter=relevant)
+    async with contextlib.aclosing(changes):
+        async for batch in changes:
+            yield {Path(path) for _change, path in batch}
+            try:
+                replaced = gen_dir.stat().st_ino != inode
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                return
+
+
+async def refresh(
+    get_catalog: Callable[[], Catalog],
+    swap: Callable[[Catalog, float, int], None],
+    changed: set[Path],
+) -> None:
+    """Re-index one batch of changed paths; a failure is logged and the old catalog kept."""
+    start = time.perf_counter()
+    try:
+        new = await asyncio.to_thread(get_catalog().updated, changed)
+        swap(new, time.perf_counter() - start, len(changed))
+    except Exception:
+        log.exception("Refreshing the catalog for %d changed paths failed", len(changed))
+
+
+async def watch_catalog(
+    get_catalog: Callable[[], Catalog],
+    swap: Callable[[Catalog, float, int], None],
+    interval: float = POLL_INTERVAL,
+) -> None:
+    """
+    Keep the catalog in sync with gen/ until cancelled.
+
+    swap(new_catalog, refresh_seconds, changed_count) is called on the event
+    loop after each refresh.
+    """
+    gen_dir = get_catalog().gen_dir
+    # inotify needs gen/ to exist; poll until a first generation creates it
+    if watchfiles is not None and gen_dir.is_dir():
+        log.info("Watching %s with inotify", gen_dir)
+        try:
+            async for changed in inotify_changes(gen_dir):
+                await refresh(get_catalog, swap, changed)
+            log.info("%s was removed, polling it every %.1fs", gen_dir, interval)
+        except Exception:
+            log.exception("Watching %s failed, polling it every %.1fs", gen_dir, interval)
+    else:
+        log.info("Polling %s every %.1fs", gen_dir, interval)
+
+    async for changed in poll_changes(get_catalog, interval):
+        await refresh(get_catalog, swap, changed)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: Copyright (c) Qualcomm Technologies, Inc. and/or its subsidiaries.
+# SPDX-FileCopyrightText: 2024-2025 Contributors to the RISCV UnifiedDB <https://github.com/riscv/riscv-unified-db>
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""Check every UDB instruction encoding against LLVM's riscv.json in one batch.
+
+The same checks as test_parsing.py, run over a process pool without pytest:
+```
+$ ./check_encodings.py --json report.json --junit report.xml
+```
+Exits with status 1 when an encoding mismatches.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from parsing import (
+    check_all,
+    get_cache_directory,
+    get_yaml_directory,
+    llvm_json_location,
+    load_check_results,
+    load_encoding_index,
+    load_llvm_instructions,
+    results_to_junit,
+    summarize_results,
+)
+
+
+def main() -> None:
+    """Check encodings and report the mismatches."""
+
+    parser = argparse.ArgumentParser(description="Check UDB encodings against LLVM's riscv.json")
+    parser.add_argument("--llvm-json", help="riscv.json (default: ext/llvm-project/riscv.json)")
+    parser.add_argument("--yaml-dir", default=get_yaml_directory(), help="instruction YAML tree")
+    parser.add_argument("--cache-dir", default=get_cache_directory())
+    parser.add_argument("-j", "--workers", type=int, help="processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="check again even if unchanged")
+    parser.add_argument("--json", help="write all results as JSON here")
+    parser.add_argument("--junit", help="write all results as JUnit XML here")
+    params = parser.parse_args()
+
+    json_path = params.llvm_json or str(llvm_json_location())
+    for path in (json_path, params.yaml_dir):
+        if not os.path.exists(path):
+            sys.exit(f"{path} not found")
+
+    if params.no_cache:
+        results = check_all(
+            load_encoding_index(params.yaml_dir, params.cache_dir, params.workers),
+            load_llvm_instructions(json_path, params.cache_dir),
+            params.workers,
+        )
+    else:
+        table = load_check_results(params.yaml_dir, json_path, params.cache_dir, params.workers)
+        results = table.results()
+        table.close()
+
+    summary = summarize_results(results)
+    if params.json:
+        with open(params.json, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
+    if params.junit:
+        with open(params.junit, "w") as f:
+            f.write(results_to_junit(results))
+
+    for result in results:
+        if result["outcome"] == "failed":
+            print(result["message"])
+    print(
+        f"{summary['total']} instructions: {summary['passed']} passed, "
+        f"{summary['failed']} failed, {summary['skipped']} skipped"
+    )
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: Copyright (c) Qualcomm Technologies, Inc. and/or its subsidiaries.
+# SPDX-FileCopyrightText: 2024-2025 Contributors to the RISCV UnifiedDB <https://github.com/riscv/riscv-unified-db>
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+
+"""
+pytest plugin of the encoding cross-check.
+
+The first test that needs the results checks all instructions at once, in a
+process pool, into a memory-mapped result table; every test then reports its
+row. With pytest-xdist (`pytest -n auto`) one worker builds the table under a
+file lock while the others wait, then all of them map the same file.
+"""
+
+import pytest
+from parsing import (
+    get_cache_directory,
+    get_json_path,
+    get_yaml_directory,
+    load_check_results,
+)
+
+
+@pytest.fixture(scope="session")
+def encoding_results():
+    """Checked result of every instruction, by name."""
+    json_path = get_json_path()
+    table = load_check_results(get_yaml_directory(), json_path, get_cache_directory())
+    yield table
+    table.close()
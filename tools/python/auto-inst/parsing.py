@@ -2,16 +2,45 @@
 # SPDX-FileCopyrightText: 2024-2025 Contributors to the RISCV UnifiedDB <https://github.com/riscv/riscv-unified-db>
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 
+import contextlib
+import functools
+import hashlib
+import json
+import mmap
 import os
 import re
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pytest
 import yaml
 
+try:
+    import ijson
+except ImportError:  # optional: riscv.json is then parsed whole, once
+    ijson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent builds of a cache are then not serialized
+    fcntl = None
+
+# Bit locations are parsed by the generators' field compiler, so every tool agrees on them
+sys.path.append(str(Path(__file__).resolve().parents[3] / "backends" / "generators"))
+from insn_fields import compile_location
+
 yaml_instructions = {}
 REPO_DIRECTORY = None
 
+# libyaml's loader is several times faster; fall back to the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Hash of this module: the caches it writes are only valid for the code that wrote them
+SOURCE_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
 
 def safe_get(data, key, default=""):
     """Safely get a value from a dictionary, return default if not found or error."""
@@ -34,11 +63,7 @@ def get_json_path():
     print(f"Current working directory: {cwd}")
     print(f"Script directory: {script_dir}")
 
-    # Try to find the repository root
-    repo_root = os.environ.get("GITHUB_WORKSPACE", cwd)
-    repo_root = Path(repo_root)
-
-    llvm_json_path = repo_root / "ext" / "llvm-project" / "riscv.json"
+    llvm_json_path = llvm_json_location()
     print(f"Looking for riscv.json at: {llvm_json_path}")
 
     if not llvm_json_path.is_file():
@@ -49,10 +74,21 @@ def get_json_path():
     return llvm_json_path
 
 
+def llvm_json_location():
+    """Expected path of riscv.json (under GITHUB_WORKSPACE, else the working directory)."""
+    repo_root = Path(os.environ.get("GITHUB_WORKSPACE", Path.cwd()))
+    return repo_root / "ext" / "llvm-project" / "riscv.json"
+
+
 def get_yaml_directory():
     return "spec/std/isa/inst"
 
 
+def get_cache_directory():
+    """Directory of the cached encoding index (AUTO_INST_CACHE_DIR, else gen/auto-inst)."""
+    return os.environ.get("AUTO_INST_CACHE_DIR", os.path.join("gen", "auto-inst"))
+
+
 def load_inherited_variable(var_path, repo_dir):
     """Load variable definition from an inherited YAML file."""
     try:
@@ -95,24 +131,11 @@ def parse_location(loc_str):
     """Parse location string that may contain multiple ranges."""
     if not loc_str:
         return []
-
-    loc_str = str(loc_str).strip()
-    ranges = []
-
-    for range_str in loc_str.split("|"):
-        range_str = range_str.strip()
-        if "-" in range_str:
-            high, low = map(int, range_str.split("-"))
-            ranges.append((high, low))
-        else:
-            try:
-                val = int(range_str)
-                ranges.append((val, val))
-            except ValueError:
-                print(f"Warning: Invalid location format: {range_str}")
-                continue
-
-    return ranges
+    try:
+        return list(compile_location(loc_str))
+    except ValueError as e:
+        print(f"Warning: {e}")
+        return []
 
 
 def load_yaml_encoding(instr_name):
@@ -135,8 +158,13 @@ def load_yaml_encoding(instr_name):
     if not yaml_file_path or not os.path.isfile(yaml_file_path):
         return None, None, None
 
+    return read_yaml_encoding(yaml_file_path)
+
+
+def read_yaml_encoding(yaml_file_path):
+    """(match, variables, hints) of one instruction YAML file."""
     with open(yaml_file_path) as yf:
-        ydata = yaml.safe_load(yf)
+        ydata = yaml.load(yf, Loader=YAML_LOADER)
 
     encoding = safe_get(ydata, "encoding", {})
     yaml_match = safe_get(encoding, "match", None)
@@ -146,6 +174,65 @@ def load_yaml_encoding(instr_name):
     return yaml_match, yaml_vars, hints
 
 
+# Tokens of an LLVM encoding string, MSB first: a fixed bit, or a field bit such as imm[3]
+JSON_TOKEN_RE = re.compile(r"(?:[01]|[A-Za-z0-9]+(?:\[\d+\]|\[\?\])?)")
+FIELD_NAME_RE = re.compile(r"([A-Za-z0-9]+)(?:\[\d+\]|\[\?\])?")
+VM_TOKEN_RE = re.compile(r"vm\[[^\]]*\]")
+
+
+def expected_encoding_length(instr_name):
+    return 16 if instr_name.lower().startswith(("c_", "c.", "cm_", "cm.")) else 32
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_yaml_match(yaml_match):
+    """(fixed mask, fixed value) of a YAML match string (MSB first, '-' for variable bits)."""
+    mask = 0
+    value = 0
+    for ch in yaml_match:
+        mask <<= 1
+        value <<= 1
+        if ch in "01":
+            mask |= 1
+            value |= ch == "1"
+    return mask, value
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_json_encoding(json_encoding_str, length):
+    """
+    Compile an LLVM encoding string of `length` bits.
+
+    Returns (tokens, fixed mask, fixed value, {field name: mask of its bits}),
+    where tokens[b] is the token of bit b and fixed bits are the fields "0"
+    and "1"; returns None when the string does not have `length` tokens.
+    """
+    tokens = JSON_TOKEN_RE.findall(json_encoding_str)
+    if len(tokens) != length:
+        return None
+    tokens.reverse()
+    mask = 0
+    value = 0
+    fields = {}
+    for b, token in enumerate(tokens):
+        if VM_TOKEN_RE.match(token):
+            token = tokens[b] = "vm"
+        if token in ("0", "1"):
+            mask |= 1 << b
+            value |= (token == "1") << b
+        name = FIELD_NAME_RE.match(token).group(1)
+        fields[name] = fields.get(name, 0) | 1 << b
+    return tuple(tokens), mask, value, fields
+
+
+def _bits(mask):
+    """Set bit positions of mask, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
 def compare_yaml_json_encoding(
     instr_name, yaml_match, yaml_vars, json_encoding_str, repo_dir, allow_refinement=False
 ):
@@ -155,12 +242,11 @@ def compare_yaml_json_encoding(
     if not json_encoding_str:
         return ["No JSON encoding available for comparison."]
 
-    expected_length = 16 if instr_name.lower().startswith(("c_", "c.", "cm_", "cm.")) else 32
+    expected_length = expected_encoding_length(instr_name)
 
-    yaml_pattern_str = yaml_match.replace("-", ".")
-    if len(yaml_pattern_str) != expected_length:
+    if len(yaml_match) != expected_length:
         return [
-            f"YAML match pattern length is {len(yaml_pattern_str)}, expected {expected_length}. Cannot compare properly."
+            f"YAML match pattern length is {len(yaml_match)}, expected {expected_length}. Cannot compare properly."
         ]
 
     yaml_var_positions = {}
@@ -176,49 +262,32 @@ def compare_yaml_json_encoding(
         if ranges:
             yaml_var_positions[var["name"]] = ranges
 
-    tokens = re.findall(r"(?:[01]|[A-Za-z0-9]+(?:\[\d+\]|\[\?\])?)", json_encoding_str)
-    json_bits = []
-    bit_index = expected_length - 1
-    for t in tokens:
-        json_bits.append((bit_index, t))
-        bit_index -= 1
-
-    if bit_index != -1:
+    compiled = compile_json_encoding(json_encoding_str, expected_length)
+    if compiled is None:
+        tokens = JSON_TOKEN_RE.findall(json_encoding_str)
         return [
-            f"JSON encoding does not appear to be {expected_length} bits. Ends at bit {bit_index + 1}."
+            f"JSON encoding does not appear to be {expected_length} bits. Ends at bit {expected_length - len(tokens)}."
         ]
+    tokens, json_fixed, json_value, json_fields = compiled
+    yaml_fixed, yaml_value = compile_yaml_match(yaml_match)
 
-    normalized_json_bits = []
-    for pos, tt in json_bits:
-        if re.match(r"vm\[[^\]]*\]", tt):
-            tt = "vm"
-        normalized_json_bits.append((pos, tt))
-    json_bits = normalized_json_bits
+    # Fixed in YAML but a field in JSON (a refinement), fixed in both with other
+    # values, and a YAML variable bit that JSON fixes
+    refined = yaml_fixed & ~json_fixed
+    mismatched = yaml_fixed & json_fixed & (yaml_value ^ json_value)
+    unfixed = ~yaml_fixed & json_fixed
 
     differences = []
-
-    for b in range(expected_length):
-        yaml_bit = yaml_pattern_str[expected_length - 1 - b]
-        token = [tt for (pos, tt) in json_bits if pos == b]
-        if not token:
-            differences.append(f"Bit {b}: No corresponding JSON bit found.")
-            continue
-        json_bit_str = token[0]
-
-        if yaml_bit in ["0", "1"]:
-            if json_bit_str not in ["0", "1"]:
-                if not allow_refinement:
-                    differences.append(
-                        f"Bit {b}: YAML expects fixed bit '{yaml_bit}' but JSON has '{json_bit_str}'"
-                    )
-                # If allow_refinement is True, we allow Fixed YAML vs Variable JSON (refinement).
-            elif json_bit_str != yaml_bit:
-                differences.append(
-                    f"Bit {b}: YAML expects '{yaml_bit}' but JSON has '{json_bit_str}'"
-                )
+    for b in _bits((0 if allow_refinement else refined) | mismatched | unfixed):
+        yaml_bit = yaml_match[expected_length - 1 - b]
+        if refined >> b & 1:
+            differences.append(
+                f"Bit {b}: YAML expects fixed bit '{yaml_bit}' but JSON has '{tokens[b]}'"
+            )
+        elif mismatched >> b & 1:
+            differences.append(f"Bit {b}: YAML expects '{yaml_bit}' but JSON has '{tokens[b]}'")
         else:
-            if json_bit_str in ["0", "1"]:
-                differences.append(f"Bit {b}: YAML variable bit but JSON is fixed '{json_bit_str}'")
+            differences.append(f"Bit {b}: YAML variable bit but JSON is fixed '{tokens[b]}'")
 
     for var_name, ranges in yaml_var_positions.items():
         for high, low in ranges:
@@ -228,17 +297,8 @@ def compare_yaml_json_encoding(
                 )
                 continue
 
-            json_var_fields = []
-            for bb in range(low, high + 1):
-                token = [tt for (pos, tt) in json_bits if pos == bb]
-                if token:
-                    json_var_fields.append(token[0])
-                else:
-                    json_var_fields.append("?")
-
-            field_names = set(
-                re.findall(r"([A-Za-z0-9]+)(?:\[\d+\]|\[\?\])?", " ".join(json_var_fields))
-            )
+            span = ((1 << (high - low + 1)) - 1) << low if high >= low else 0
+            field_names = {name for name, bits in json_fields.items() if bits & span}
             if len(field_names) == 0:
                 differences.append(
                     f"Variable {var_name}: No corresponding field found in JSON bits {high}-{low}"
@@ -251,27 +311,550 @@ def compare_yaml_json_encoding(
     return differences
 
 
-def get_yaml_instructions(repo_directory):
-    """Recursively find all YAML files in the repository and load their encodings."""
-    global yaml_instructions, REPO_DIRECTORY
-    REPO_DIRECTORY = repo_directory
-    yaml_instructions = {}
+def compare_encodings(comparisons, repo_dir=None):
+    """
+    Compare many instructions at once.
 
+    `comparisons` yields dicts with name, yaml_match, yaml_vars,
+    json_encoding and optionally allow_refinement, such as the plans of
+    plan_check; returns {name: differences}. Repeated YAML match and JSON
+    encoding strings are compiled once.
+    """
+    return {
+        c["name"]: compare_yaml_json_encoding(
+            c["name"],
+            c.get("yaml_match"),
+            c.get("yaml_vars"),
+            c.get("json_encoding"),
+            repo_dir,
+            allow_refinement=c.get("allow_refinement", False),
+        )
+        for c in comparisons
+    }
+
+
+def scan_yaml_tree(repo_directory):
+    """Sorted (relative path, size, mtime_ns) of every YAML file under repo_directory."""
+    entries = []
     for root, _, files in os.walk(repo_directory):
         for file in files:
             if file.endswith(".yaml"):
-                instr_name = os.path.splitext(file)[0]
-                relative_path = os.path.relpath(root, repo_directory)
-                yaml_instructions[instr_name.lower()] = relative_path
-
-    instructions_with_encodings = {}
-    for instr_name_lower, path in yaml_instructions.items():
-        yaml_match, yaml_vars, hints = load_yaml_encoding(instr_name_lower)
-        instructions_with_encodings[instr_name_lower] = {
-            "category": path,
+                path = os.path.join(root, file)
+                st = os.stat(path)
+                entries.append((os.path.relpath(path, repo_directory), st.st_size, st.st_mtime_ns))
+    entries.sort()
+    return entries
+
+
+def tree_fingerprint(entries):
+    """Hash of the file list, sizes and modification times of a scanned tree (and of this module)."""
+    digest = hashlib.sha256(SOURCE_HASH.encode())
+    for rel, size, mtime in entries:
+        digest.update(f"{rel}\0{size}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_yaml_encodings(paths):
+    """read_yaml_encoding of several files (one task of the process pool)."""
+    return [read_yaml_encoding(p) for p in paths]
+
+
+def build_encoding_index(repo_directory, entries, workers=None):
+    """
+    Parse the encoding of every instruction in one pass, in parallel.
+
+    Returns {lowercase instruction name: {category, yaml_match, yaml_vars, hints}};
+    a name found in several directories keeps the last one in path order.
+    """
+    paths = [os.path.join(repo_directory, rel) for rel, _size, _mtime in entries]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(paths) > 64:
+        chunks = [paths[i :: workers * 4] for i in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = {}
+            for chunk, results in zip(chunks, pool.map(_read_yaml_encodings, chunks), strict=True):
+                parsed.update(zip(chunk, results, strict=True))
+        encodings = [parsed[p] for p in paths]
+    else:
+        encodings = _read_yaml_encodings(paths)
+
+    index = {}
+    for (rel, _size, _mtime), (yaml_match, yaml_vars, hints) in zip(
+        entries, encodings, strict=True
+    ):
+        category, file = os.path.split(rel)
+        index[os.path.splitext(file)[0].lower()] = {
+            "category": category or ".",
             "yaml_match": yaml_match,
             "yaml_vars": yaml_vars,
             "hints": hints,
         }
+    return index
+
+
+@contextlib.contextmanager
+def atomic_write(path):
+    """
+    Text file to write path through: a temporary file in the same directory
+    that replaces path when the block succeeds, so readers never see a
+    partial file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            yield f
+        # mkstemp creates the file with mode 0600; give it the mode a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_encoding_index(repo_directory, cache_directory=None, workers=None):
+    """
+    Encoding index of repo_directory, reused from the cache while the tree is unchanged.
 
+    The cache file holds the tree fingerprint and the index as JSON; it is
+    rebuilt (and rewritten) whenever a file is added, removed or modified.
+    """
+    entries = scan_yaml_tree(repo_directory)
+    fingerprint = tree_fingerprint(entries)
+    cache_directory = cache_directory or get_cache_directory()
+    cache_path = os.path.join(cache_directory, "encoding_index.json")
+
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            return cached["instructions"]
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    index = build_encoding_index(repo_directory, entries, workers)
+    try:
+        with atomic_write(cache_path) as f:
+            json.dump({"fingerprint": fingerprint, "instructions": index}, f)
+    except OSError as e:
+        # A read-only checkout only costs a rescan next time
+        print(f"Warning: Could not write encoding index cache {cache_path}: {e!s}")
+    return index
+
+
+def get_yaml_instructions(repo_directory):
+    """Find all instruction YAML files under repo_directory and load their encodings."""
+    global yaml_instructions, REPO_DIRECTORY
+    REPO_DIRECTORY = repo_directory
+
+    instructions_with_encodings = load_encoding_index(repo_directory)
+    yaml_instructions = {
+        name: data["category"] for name, data in instructions_with_encodings.items()
+    }
     return instructions_with_encodings
+
+
+def llvm_encoding_string(inst_bits):
+    """Encoding string (MSB first) of the Inst bits of an LLVM TableGen record."""
+    encoding_bits = []
+    for bit in inst_bits or []:
+        if isinstance(bit, dict):
+            encoding_bits.append(f"{bit.get('var', '?')}[{bit.get('index', '?')}]")
+        else:
+            encoding_bits.append(str(bit))
+    encoding_bits.reverse()
+    return "".join(encoding_bits)
+
+
+def llvm_mnemonic(asm_string):
+    """Normalized mnemonic of an AsmString: its first word, lowercase."""
+    words = asm_string.lower().split()
+    return words[0] if words else ""
+
+
+def _llvm_record(value):
+    """(mnemonic, encoding) of a real instruction record, else None."""
+    if not isinstance(value, dict):
+        return None
+    if value.get("isPseudo", "") == 1 or value.get("isCodeGenOnly", "") == 1:
+        return None
+    mnemonic = llvm_mnemonic(value.get("AsmString", "") or "")
+    if not mnemonic:
+        return None
+    try:
+        return mnemonic, llvm_encoding_string(value.get("Inst", []))
+    except Exception:
+        return mnemonic, ""
+
+
+def extract_llvm_instructions(json_path):
+    """
+    [def name, mnemonic, encoding] of the RVInstCommon records of riscv.json,
+    in RVInstCommon order, skipping pseudo and codegen-only records.
+
+    With ijson the file is streamed one top-level record at a time, so only
+    the kept fields are held in memory; otherwise it is loaded whole.
+    """
+    records = {}
+    rv_instructions = []
+    if ijson is not None:
+        with open(json_path, "rb") as f:
+            for name, value in ijson.kvitems(f, ""):
+                if name == "!instanceof":
+                    rv_instructions = value.get("RVInstCommon", [])
+                    continue
+                record = _llvm_record(value)
+                if record is not None:
+                    records[name] = record
+    else:
+        with open(json_path) as f:
+            json_data = json.load(f)
+        rv_instructions = json_data.get("!instanceof", {}).get("RVInstCommon", [])
+        for name in rv_instructions:
+            record = _llvm_record(json_data.get(name))
+            if record is not None:
+                records[name] = record
+        del json_data
+
+    return [[name, *records[name]] for name in rv_instructions if name in records]
+
+
+class LLVMInstructions:
+    """RISC-V instruction records of riscv.json indexed by normalized mnemonic."""
+
+    def __init__(self, records):
+        self.encodings = {}
+        self.by_mnemonic = {}
+        for name, mnemonic, encoding in records:
+            self.encodings[name] = encoding
+            # As in a scan of RVInstCommon, the first record of a mnemonic wins
+            self.by_mnemonic.setdefault(mnemonic, name)
+
+    def __len__(self):
+        return len(self.encodings)
+
+    def find(self, instr_name):
+        """Def name of the instruction with this mnemonic, or None."""
+        return self.by_mnemonic.get(instr_name.lower().strip())
+
+    def encoding(self, def_name):
+        return self.encodings.get(def_name, "")
+
+
+def load_llvm_instructions(json_path, cache_directory=None):
+    """
+    LLVMInstructions of riscv.json, extracted once into a compact cache.
+
+    The cache holds only [def name, mnemonic, encoding] per instruction and is
+    reused while riscv.json keeps its path, size and modification time.
+    """
+    st = os.stat(json_path)
+    source = {"path": os.path.abspath(json_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    cache_directory = cache_directory or get_cache_directory()
+    cache_path = os.path.join(cache_directory, "llvm_instructions.json")
+
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get("version") == SOURCE_HASH and cached.get("source") == source:
+            return LLVMInstructions(cached["instructions"])
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    records = extract_llvm_instructions(json_path)
+    try:
+        with atomic_write(cache_path) as f:
+            json.dump({"version": SOURCE_HASH, "source": source, "instructions": records}, f)
+    except OSError as e:
+        print(f"Warning: Could not write LLVM instruction cache {cache_path}: {e!s}")
+    return LLVMInstructions(records)
+
+
+# Instructions whose LLVM encoding deliberately differs from the ISA spec
+CORNER_CASES = frozenset({"fence.i", "c.nop", "fcvtmod.w.d", "fence", "fence.tso"})
+
+
+def has_aqrl_variables(yaml_vars):
+    """Check if instruction has aq/rl variables."""
+    if not yaml_vars:
+        return False
+    return any(var.get("name") in ["aq", "rl"] for var in yaml_vars)
+
+
+def build_hint_map(encoding_index):
+    """Map of hint instructions to their parent instructions."""
+    hint_map = {}
+    for parent_name, data in encoding_index.items():
+        for hint in data.get("hints") or []:
+            ref = hint.get("$ref", "")
+            if ref:
+                # Extract instruction name from ref (e.g., inst/Zicfilp/lpad.yaml# -> lpad)
+                hint_name = os.path.splitext(os.path.basename(ref.split("#")[0]))[0]
+                hint_map[hint_name.lower()] = parent_name
+    return hint_map
+
+
+def plan_check(instr_name, yaml_data, llvm_instructions, hint_map):
+    """
+    The check of one instruction as a plain dict.
+
+    Either a skipped result (outcome "skipped" and its message), or a
+    comparison with everything check_instruction needs: the YAML match and
+    variables, the matching LLVM record and its encoding.
+    """
+    plan = {"name": instr_name, "json_key": None}
+
+    # Skip if the instruction has aq/rl variables
+    if has_aqrl_variables(yaml_data.get("yaml_vars", [])):
+        return {
+            **plan,
+            "outcome": "skipped",
+            "message": f"Skipping instruction {instr_name} due to aq/rl variables",
+        }
+
+    if not yaml_data.get("yaml_match"):
+        return {
+            **plan,
+            "outcome": "skipped",
+            "message": f"Instruction {instr_name} has no YAML match pattern",
+        }
+
+    if instr_name in CORNER_CASES:
+        return {
+            **plan,
+            "outcome": "skipped",
+            "message": f"Instruction {instr_name} is a corner case and implementation should not follow ISA spec",
+        }
+
+    json_key = llvm_instructions.find(instr_name)
+    allow_refinement = False
+    if not json_key:
+        # A hint is checked against its parent instruction, which may refine it
+        parent_name = hint_map.get(instr_name.lower())
+        if parent_name:
+            json_key = llvm_instructions.find(parent_name)
+            allow_refinement = bool(json_key)
+
+    if not json_key:
+        return {
+            **plan,
+            "outcome": "skipped",
+            "message": f"No matching JSON instruction found for {instr_name}",
+        }
+
+    return {
+        **plan,
+        "json_key": json_key,
+        "yaml_match": yaml_data["yaml_match"],
+        "yaml_vars": yaml_data.get("yaml_vars", []),
+        "json_encoding": llvm_instructions.encoding(json_key),
+        "allow_refinement": allow_refinement,
+    }
+
+
+def check_instruction(plan, differences):
+    """
+    Result of a planned check: {name, outcome, message, json_key, differences}.
+
+    `differences` are those compare_encodings found for the plan; a skipped
+    plan has none.
+    """
+    if "outcome" in plan:
+        return {**plan, "differences": []}
+
+    instr_name = plan["name"]
+    result = {"name": instr_name, "json_key": plan["json_key"], "differences": differences}
+
+    if not differences or differences == ["No YAML match field available for comparison."]:
+        return {**result, "outcome": "passed", "message": ""}
+
+    error_msg = f"\nEncoding mismatch for instruction: {instr_name}\n"
+    error_msg += f"name : {instr_name}\n"
+    error_msg += f"JSON key: {plan['json_key']}\n"
+    error_msg += f"YAML match: {plan['yaml_match']}\n"
+    error_msg += f"JSON encoding: {plan['json_encoding']}\n"
+    error_msg += "Differences:\n"
+    for diff in differences:
+        error_msg += f"  - {diff}\n"
+    return {**result, "outcome": "failed", "message": error_msg}
+
+
+def _check_instructions(plans):
+    """
+    Check several plans with one compare_encodings batch (one task of the
+    process pool). Plans depend on nothing else, so they can be checked in
+    any process.
+    """
+    differences = compare_encodings(plan for plan in plans if "outcome" not in plan)
+    return [check_instruction(plan, differences.get(plan["name"], [])) for plan in plans]
+
+
+def check_all(encoding_index, llvm_instructions, workers=None):
+    """
+    Check every instruction of an encoding index against riscv.json.
+
+    Plans are built here and checked in a process pool when there are
+    several workers; returns the results in instruction name order.
+    """
+    hint_map = build_hint_map(encoding_index)
+    plans = [
+        plan_check(name, encoding_index[name], llvm_instructions, hint_map)
+        for name in sorted(encoding_index)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(plans) > 64:
+        chunks = [plans[i : i + 64] for i in range(0, len(plans), 64)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [r for results in pool.map(_check_instructions, chunks) for r in results]
+    return _check_instructions(plans)
+
+
+def check_fingerprint(repo_directory, json_path):
+    """Hash of everything the checked results depend on: inputs and the rules of this module."""
+    st = os.stat(json_path)
+    digest = hashlib.sha256(SOURCE_HASH.encode())
+    digest.update(tree_fingerprint(scan_yaml_tree(repo_directory)).encode())
+    digest.update(f"{os.path.abspath(json_path)}\0{st.st_size}\0{st.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def write_check_results(path, fingerprint, results):
+    """
+    Write results as a table CheckResults can map: a header line with the
+    fingerprint, then one "name<TAB>result JSON" line per instruction.
+    """
+    with atomic_write(path) as f:
+        f.write(json.dumps({"fingerprint": fingerprint, "count": len(results)}) + "\n")
+        for result in results:
+            f.write(f"{result['name']}\t{json.dumps(result)}\n")
+
+
+class CheckResults:
+    """
+    Read-only, memory-mapped table of checked results.
+
+    Only line offsets are indexed when the file is opened; a result is
+    decoded when it is looked up. Processes mapping the same file (pytest-xdist
+    workers) share its pages.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n")
+        self.header = json.loads(self._map[:header_end])
+        self._offsets = {}
+        pos = header_end + 1
+        while pos < len(self._map):
+            end = self._map.find(b"\n", pos)
+            tab = self._map.find(b"\t", pos, end)
+            self._offsets[self._map[pos:tab].decode()] = (tab + 1, end)
+            pos = end + 1
+
+    @property
+    def fingerprint(self):
+        return self.header.get("fingerprint")
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __contains__(self, name):
+        return name in self._offsets
+
+    def __getitem__(self, name):
+        start, end = self._offsets[name]
+        return json.loads(self._map[start:end])
+
+    def names(self):
+        return list(self._offsets)
+
+    def results(self):
+        return [self[name] for name in self._offsets]
+
+    def close(self):
+        self._map.close()
+
+
+@contextlib.contextmanager
+def cache_lock(cache_directory, name):
+    """Exclusive lock between processes (e.g. pytest-xdist workers) building one cache file."""
+    os.makedirs(cache_directory, exist_ok=True)
+    with open(os.path.join(cache_directory, f".{name}.lock"), "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _open_check_results(path, fingerprint):
+    """CheckResults at path if it has this fingerprint, else None."""
+    try:
+        table = CheckResults(path)
+    except (OSError, ValueError):
+        return None
+    if table.fingerprint == fingerprint:
+        return table
+    table.close()
+    return None
+
+
+def load_check_results(repo_directory, json_path, cache_directory=None, workers=None):
+    """
+    CheckResults of repo_directory against riscv.json, checked once per change.
+
+    The table is kept in the cache directory and reused while its
+    fingerprint matches; otherwise every instruction is checked again, by
+    one process at a time: the others wait and then map its table.
+    """
+    fingerprint = check_fingerprint(repo_directory, json_path)
+    cache_directory = cache_directory or get_cache_directory()
+    path = os.path.join(cache_directory, "check_results.tsv")
+
+    table = _open_check_results(path, fingerprint)
+    if table is not None:
+        return table
+
+    with cache_lock(cache_directory, "check_results"):
+        # Built by another process while this one waited for the lock
+        table = _open_check_results(path, fingerprint)
+        if table is not None:
+            return table
+        encoding_index = load_encoding_index(repo_directory, cache_directory, workers)
+        llvm_instructions = load_llvm_instructions(json_path, cache_directory)
+        results = check_all(encoding_index, llvm_instructions, workers)
+        write_check_results(path, fingerprint, results)
+    return CheckResults(path)
+
+
+def summarize_results(results):
+    """Count of results per outcome."""
+    summary = {"total": len(results), "passed": 0, "failed": 0, "skipped": 0}
+    for result in results:
+        summary[result["outcome"]] += 1
+    return summary
+
+
+def results_to_junit(results, suite_name="auto-inst.encoding"):
+    """JUnit XML (one testcase per instruction) of checked results."""
+    summary = summarize_results(results)
+    suite = ET.Element(
+        "testsuite",
+        name=suite_name,
+        tests=str(summary["total"]),
+        failures=str(summary["failed"]),
+        skipped=str(summary["skipped"]),
+        errors="0",
+    )
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname=suite_name, name=result["name"])
+        if result["outcome"] == "failed":
+            failure = ET.SubElement(
+                case, "failure", message=f"Encoding mismatch for instruction: {result['name']}"
+            )
+            failure.text = result["message"]
+        elif result["outcome"] == "skipped":
+            ET.SubElement(case, "skipped", message=result["message"])
+    ET.indent(suite)
+    return ET.tostring(suite, encoding="unicode", xml_declaration=True)